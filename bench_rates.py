@@ -0,0 +1,167 @@
+"""Testy wydajności pobierania kursów na lokalnym serwerze zastępczym (stub_server.py).
+
+Mierzy opóźnienie pojedynczego zapytania, przepustowość zapytań o wiele walut, zużycie
+pamięci przy długich zakresach dat oraz czas zimnego startu aplikacji (import i okno Tk).
+Wyniki można zapisać do pliku JSON i porównać z poprzednim przebiegiem (--baseline),
+aby wychwycić regresje przed wdrożeniem.
+
+Przykład: python bench_rates.py --latency 0.05 --error-rate 0.02 --output wyniki.json
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from rates_core import RateClient, CURRENCIES, SOURCES
+from resilience import ResiliencePolicy
+from stub_server import StubServer, stub_client_options
+
+
+def make_client(servers, args):
+    policy = ResiliencePolicy(rate=args.rate_limit, burst=max(1, int(args.rate_limit))) if args.rate_limit else None
+    return RateClient(cache_path=":memory:", resilience=policy, **stub_client_options(*servers))
+
+
+def bench_single_query(servers, args):
+    """Opóźnienie pojedynczego zapytania (zimna pamięć podręczna: nowy klient przy każdym powtórzeniu)."""
+    samples = []
+    for _ in range(args.repeat):
+        client = make_client(servers, args)
+        started = time.perf_counter()
+        result = client.load_rates("USD", "NBP", "2024-01-01", "2024-03-31")
+        samples.append(time.perf_counter() - started)
+        client.close()
+        if any(result.errors()):
+            print("Uwaga: zapytanie zakończone błędem", file=sys.stderr)
+    samples.sort()
+    return {"median_ms": round(statistics.median(samples) * 1000, 2),
+            "p95_ms": round(samples[int(0.95 * (len(samples) - 1))] * 1000, 2)}
+
+
+def bench_throughput(servers, args):
+    """Przepustowość: wszystkie waluty i źródła dla rocznego zakresu, zapytania równoległe."""
+    client = make_client(servers, args)
+    queries = [(currency, source) for currency in CURRENCIES for source in SOURCES]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        results = list(pool.map(lambda query: client.load_rates(*query, "2024-01-01", "2024-12-31"), queries))
+    elapsed = time.perf_counter() - started
+    client.close()
+    records = sum(1 for result in results for _ in result.records())
+    return {"queries": len(queries), "seconds": round(elapsed, 3),
+            "queries_per_s": round(len(queries) / elapsed, 2), "records_per_s": round(records / elapsed, 1)}
+
+
+def bench_memory(servers, args):
+    """Szczytowe zużycie pamięci (tracemalloc) dla długiego zakresu jednej waluty."""
+    client = make_client(servers, args)
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = client.load_rates("USD", "NBP", f"{2024 - args.years + 1}-01-01", "2024-12-31")
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    client.close()
+    return {"years": args.years, "records": sum(1 for _ in result.records()),
+            "seconds": round(elapsed, 3), "peak_mb": round(peak / 2 ** 20, 2)}
+
+
+# Zimny start w osobnym procesie: import modułu aplikacji, utworzenie okna i pierwsze narysowanie
+STARTUP_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import project
+imported = time.perf_counter()
+result = {"import_s": imported - started, "app_s": None}
+try:
+    root = project.tk.Tk()
+except project.tk.TclError:
+    pass  # Brak ekranu - mierzony jest tylko import
+else:
+    project.CurrencyApp(root, cache_path=":memory:")
+    root.update()
+    result["app_s"] = time.perf_counter() - imported
+    root.destroy()
+result["matplotlib"] = "matplotlib" in sys.modules
+print(json.dumps(result))
+"""
+
+
+def bench_startup(servers, args):
+    """Czas zimnego startu: import project oraz CurrencyApp(root) (każde powtórzenie w nowym procesie)."""
+    runs = []
+    for _ in range(args.repeat):
+        output = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT], capture_output=True, text=True, check=True)
+        runs.append(json.loads(output.stdout))
+    if any(run["matplotlib"] for run in runs):
+        print("Uwaga: matplotlib wczytany podczas startu aplikacji", file=sys.stderr)
+    results = {"import_ms": round(statistics.median(run["import_s"] for run in runs) * 1000, 2)}
+    if all(run["app_s"] is not None for run in runs):
+        results["app_ms"] = round(statistics.median(run["app_s"] for run in runs) * 1000, 2)
+        results["total_ms"] = round(statistics.median(run["import_s"] + run["app_s"] for run in runs) * 1000, 2)
+    else:
+        print("Uwaga: brak ekranu - zmierzono tylko import modułu", file=sys.stderr)
+    return results
+
+
+BENCHMARKS = {"single_query": bench_single_query, "throughput": bench_throughput, "memory": bench_memory,
+              "startup": bench_startup}
+
+
+def compare(results, baseline, tolerance):
+    """Zwraca opisy regresji: czasy dłuższe lub pamięć większa o więcej niż tolerance (ułamek)."""
+    regressions = []
+    for name, metrics in results.items():
+        for key, value in metrics.items():
+            previous = baseline.get(name, {}).get(key)
+            if previous is None or not key.endswith(("_ms", "seconds", "_mb")):
+                continue
+            if value > previous * (1 + tolerance):
+                regressions.append(f"{name}.{key}: {previous} -> {value}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Testy wydajności pobierania kursów na lokalnym serwerze zastępczym.")
+    parser.add_argument("--latency", type=float, default=0.02, help="opóźnienie odpowiedzi serwera w sekundach")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="odsetek odpowiedzi 503 (0-1)")
+    parser.add_argument("--payload-size", type=int, default=0, help="dodatkowe bajty w każdym rekordzie")
+    parser.add_argument("--repeat", type=int, default=10, help="liczba powtórzeń pomiaru opóźnienia")
+    parser.add_argument("--workers", type=int, default=8, help="liczba równoległych zapytań w teście przepustowości")
+    parser.add_argument("--years", type=int, default=25, help="długość zakresu w teście pamięci (lata)")
+    parser.add_argument("--rate-limit", type=float, help="limit zapytań na sekundę na host (domyślnie jak w aplikacji)")
+    parser.add_argument("--only", choices=sorted(BENCHMARKS), action="append", help="uruchom tylko wybrane testy")
+    parser.add_argument("--output", "-o", help="zapisz wyniki do pliku JSON")
+    parser.add_argument("--baseline", help="plik JSON z poprzednimi wynikami do porównania")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="dopuszczalne pogorszenie względem --baseline")
+    args = parser.parse_args(argv)
+
+    options = {"latency": args.latency, "error_rate": args.error_rate, "payload_size": args.payload_size, "seed": 0}
+    servers = [StubServer(**options).start() for _ in range(3)]
+    results = {}
+    try:
+        for name in args.only or BENCHMARKS:
+            results[name] = BENCHMARKS[name](servers, args)
+            print(f"{name}: {json.dumps(results[name])}")
+    finally:
+        for server in servers:
+            server.stop()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f"Regresja: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""Testy wydajności filter_and_group: ścieżka ogólna (kolumna obiektów date) i posortowana datetime64.
+
+Dane godzinowe są wczytywane z pliku CSV (domyślnie temperatura.csv) i opcjonalnie powielane
+na kolejne lata (--years), aby sprawdzić, jak czas zapytania zależy od rozmiaru danych.
+Obie ścieżki są uruchamiane dla tych samych zakresów, a ich wyniki porównywane.
+
+Przykład: python bench_weather.py --years 50 --repeat 20 --output wyniki.json
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from bench_rates import compare
+from weather_data import load_station, filter_and_group
+
+HOURS_PER_YEAR = 365 * 24
+
+
+def make_frames(path, years):
+    """Ramka z kolumną obiektów date (jak dotąd w small_task_3) oraz ta sama z kolumną datetime64."""
+    data = load_station(path)
+    values = np.asarray(data["medium"])
+    timestamps = np.asarray(data.timestamps)
+    if years:
+        rows = years * HOURS_PER_YEAR
+        timestamps = timestamps[0] + np.arange(rows).astype("timedelta64[h]")
+        values = np.resize(values, rows)
+    fast = pd.DataFrame({"date": timestamps.astype("datetime64[D]"), "value": values})
+    slow = pd.DataFrame({"date": fast["date"].dt.date, "value": values})
+    return slow, fast
+
+
+def measure(function, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        samples.append(time.perf_counter() - started)
+    return result, round(statistics.median(samples) * 1000, 3)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Testy wydajności filter_and_group.")
+    parser.add_argument("--file", default="temperatura.csv", help="plik CSV z danymi godzinowymi")
+    parser.add_argument("--years", type=int, default=0, help="powiel dane do podanej liczby lat (0 - bez zmian)")
+    parser.add_argument("--days", type=int, default=30, help="długość zakresu zapytania w dniach")
+    parser.add_argument("--repeat", type=int, default=10, help="liczba powtórzeń pomiaru")
+    parser.add_argument("--output", "-o", help="zapisz wyniki do pliku JSON")
+    parser.add_argument("--baseline", help="plik JSON z poprzednimi wynikami do porównania")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="dopuszczalne pogorszenie względem --baseline")
+    args = parser.parse_args(argv)
+
+    slow, fast = make_frames(args.file, args.years)
+    middle = fast["date"].iloc[len(fast) // 2]
+    date_from, date_to = middle.date(), (middle + pd.Timedelta(days=args.days - 1)).date()
+    expected, slow_ms = measure(lambda: filter_and_group(slow, date_from, date_to), args.repeat)
+    actual, fast_ms = measure(lambda: filter_and_group(fast, date_from, date_to), args.repeat)
+    if actual["date"].dt.date.tolist() != expected["date"].tolist() or \
+            not np.allclose(actual["value"], expected["value"], equal_nan=True):
+        print("Błąd: wyniki obu ścieżek się różnią", file=sys.stderr)
+        return 1
+
+    results = {"filter_and_group": {"rows": len(fast), "days": len(actual), "object_dates_ms": slow_ms,
+                                    "sorted_datetime64_ms": fast_ms, "speedup": round(slow_ms / fast_ms, 1)}}
+    print(f"filter_and_group: {json.dumps(results['filter_and_group'])}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f"Regresja: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""Kursy krzyżowe walut wyliczane wektorowo z szeregów NBP (PLN) i EBC (EUR).
+
+Dla każdego dnia powstaje macierz N x N: matrix[d, i, j] to liczba jednostek waluty j
+za jedną jednostkę waluty i. Porównanie macierzy z obu źródeł daje szereg rozbieżności
+NBP-EBC dla wspólnych walut i dni.
+"""
+import argparse
+import csv
+import sys
+
+import numpy as np
+
+from rate_cache import DEFAULT_CACHE_PATH
+
+
+def align(series_by_currency):
+    """Układa szeregi na wspólnej osi dat: zwraca (daty, waluty, wartości[dzień, waluta]) z NaN dla braków."""
+    currencies = list(series_by_currency)
+    non_empty = [series.dates for series in series_by_currency.values() if len(series)]
+    dates = np.unique(np.concatenate(non_empty)) if non_empty else np.array([], dtype="datetime64[D]")
+    values = np.full((len(dates), len(currencies)), np.nan)
+    for column, series in enumerate(series_by_currency.values()):
+        values[np.searchsorted(dates, series.dates), column] = series["mid"]
+    return dates, currencies, values
+
+
+class CrossRates:
+    """Kursy walut względem waluty bazowej (quotes[dzień, waluta] = wartość 1 jednostki w walucie bazowej).
+
+    Waluta bazowa jest dołączana jako pierwsza kolumna z kursem 1.
+    """
+
+    def __init__(self, base, dates, currencies, quotes):
+        self.base = base
+        self.dates = np.asarray(dates, dtype="datetime64[D]")
+        self.currencies = [base] + [currency for currency in currencies if currency != base]
+        quotes = np.asarray(quotes, dtype=np.float64)
+        keep = [index for index, currency in enumerate(currencies) if currency != base]
+        self.quotes = np.hstack([np.ones((len(self.dates), 1)), quotes[:, keep]])
+
+    @classmethod
+    def from_nbp(cls, series_by_currency):
+        """Kursy średnie NBP (tabela A) - PLN za jednostkę waluty."""
+        dates, currencies, values = align(series_by_currency)
+        return cls("PLN", dates, currencies, values)
+
+    @classmethod
+    def from_ecb(cls, series_by_currency):
+        """Kursy EBC podawane jako jednostki waluty za 1 EUR - odwracane na EUR za jednostkę waluty."""
+        dates, currencies, values = align(series_by_currency)
+        return cls("EUR", dates, currencies, 1.0 / values)
+
+    def matrix(self, day=None):
+        """Macierze kursów krzyżowych [dzień, i, j] (albo [i, j] dla jednego dnia RRRR-MM-DD)."""
+        quotes = self.quotes if day is None else self.quotes[self._day_index(day)]
+        return quotes[..., :, None] / quotes[..., None, :]
+
+    def rate(self, currency, quote):
+        """Szereg kursu pary currency/quote (jednostki quote za 1 currency) na osi self.dates."""
+        i, j = self.currencies.index(currency), self.currencies.index(quote)
+        return self.quotes[:, i] / self.quotes[:, j]
+
+    def _day_index(self, day):
+        index = np.searchsorted(self.dates, np.datetime64(day, "D"))
+        if index == len(self.dates) or self.dates[index] != np.datetime64(day, "D"):
+            raise KeyError(f"brak kursów z dnia {day}")
+        return index
+
+    def restrict(self, dates, currencies):
+        """Macierze ograniczone do podanych dni i walut (np. wspólnych dla dwóch źródeł)."""
+        rows = np.searchsorted(self.dates, dates)
+        columns = [self.currencies.index(currency) for currency in currencies]
+        quotes = self.quotes[np.ix_(rows, columns)]
+        return quotes[:, :, None] / quotes[:, None, :]
+
+
+def discrepancy(nbp, ecb):
+    """Rozbieżność NBP-EBC: (daty, waluty, względna różnica macierzy [dzień, i, j]) dla wspólnych dni i walut.
+
+    Wartość 0.001 oznacza, że kurs krzyżowy wyliczony z NBP jest o 0,1% wyższy niż z EBC.
+    """
+    dates = np.intersect1d(nbp.dates, ecb.dates)
+    currencies = [currency for currency in nbp.currencies if currency in ecb.currencies]
+    return dates, currencies, nbp.restrict(dates, currencies) / ecb.restrict(dates, currencies) - 1.0
+
+
+def load_cross_rates(client, start_date, end_date, currencies=None):
+    """Pobiera (przez pamięć podręczną klienta) kursy wszystkich walut i zwraca (CrossRates NBP, CrossRates EBC, błędy).
+
+    NBP: jedno zapytanie o tabele zbiorcze A na fragment zakresu; EBC: zapytania równoległe dla kolejnych walut.
+    Błędy to lista (część, waluta, komunikat) jak RateResult.errors() - waluty z błędem są pomijane w macierzach.
+    """
+    currencies = list(currencies or client.currencies)
+    ecb_currencies = [currency for currency in currencies if currency != "EUR"]
+    futures = {currency: client.executor.submit(client.get_ecb_rates, currency, start_date, end_date, columnar=True)
+               for currency in ecb_currencies}
+    errors = []
+    nbp_series = {}
+    for currency, (data, error, _) in client.get_nbp_rates_bulk("A", start_date, end_date, currencies, columnar=True).items():
+        if error:
+            errors.append(("NBP A", currency, error))
+        else:
+            nbp_series[currency] = data["series"]
+    ecb_series = {}
+    for currency, future in futures.items():
+        data, error = future.result()
+        if error:
+            errors.append(("EBC", currency, error))
+        else:
+            ecb_series[currency] = data["series"]
+    return CrossRates.from_nbp(nbp_series), CrossRates.from_ecb(ecb_series), errors
+
+
+def write_matrix_csv(dates, currencies, matrices, output):
+    """Zapisuje macierze [dzień, i, j] w układzie wierszowym: data, waluta, kolumna dla każdej waluty."""
+    writer = csv.writer(output)
+    writer.writerow(["date", "currency"] + currencies)
+    for day, matrix in zip(dates.astype(str).tolist(), matrices):
+        for currency, row in zip(currencies, matrix.tolist()):
+            writer.writerow([day, currency] + ["" if value != value else f"{value:.6g}" for value in row])
+
+
+def main(argv=None):
+    from rates_cli import parse_range, parse_list
+    from rates_core import RateClient, CURRENCIES
+
+    parser = argparse.ArgumentParser(description="Macierze kursów krzyżowych (NBP, EBC) i rozbieżności NBP-EBC jako CSV.")
+    parser.add_argument("range", type=parse_range, help="zakres dat RRRR-MM-DD:RRRR-MM-DD")
+    parser.add_argument("--currencies", type=parse_list, default=CURRENCIES, help="waluty oddzielone przecinkami")
+    parser.add_argument("--source", choices=["NBP", "EBC", "rozbieznosc"], default="NBP",
+                        help="macierze z NBP, z EBC albo względna rozbieżność NBP-EBC")
+    parser.add_argument("--output", "-o", help="plik wynikowy (domyślnie: standardowe wyjście)")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH, help="plik pamięci podręcznej SQLite")
+    args = parser.parse_args(argv)
+
+    client = RateClient(cache_path=args.cache, currencies=args.currencies)
+    try:
+        nbp, ecb, errors = load_cross_rates(client, *args.range)
+    finally:
+        client.close()
+    for part, currency, error in errors:
+        print(f"{part} {currency}: {error}", file=sys.stderr)
+    if args.source == "NBP":
+        dates, currencies, matrices = nbp.dates, nbp.currencies, nbp.matrix()
+    elif args.source == "EBC":
+        dates, currencies, matrices = ecb.dates, ecb.currencies, ecb.matrix()
+    else:
+        dates, currencies, matrices = discrepancy(nbp, ecb)
+    output = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    try:
+        write_matrix_csv(dates, currencies, matrices, output)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
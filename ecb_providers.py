@@ -0,0 +1,168 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import requests
+
+from json_stream import iter_object_items, is_large, response_chunks
+
+
+class EcbProvider:
+    """Dostawca kursów EBC - buduje adresy zapytań i sprawdza poprawność odpowiedzi."""
+
+    name = None
+    base_url = None
+
+    def __init__(self, base_url=None):
+        if base_url:
+            self.base_url = base_url
+
+    def url(self, currency, start_date=None, end_date=None):
+        raise NotImplementedError
+
+    def decode(self, response, start_date=None, end_date=None):
+        """Dekoduje odpowiedź; duże odpowiedzi z zakresem dat są dekodowane strumieniowo (tylko pole "rates")."""
+        if start_date and end_date and is_large(response):
+            return {"rates": dict(iter_object_items(response_chunks(response), "rates", required=True))}
+        return response.json()
+
+    def parse(self, data, currency, start_date=None, end_date=None):
+        """Zwraca dane w formacie frankfurter.app lub zgłasza ValueError dla niepoprawnej odpowiedzi."""
+        if not isinstance(data, dict) or not isinstance(data.get("rates"), dict):
+            raise ValueError("niepoprawna odpowiedź API")
+        if not (start_date and end_date) and currency not in data["rates"]:
+            raise ValueError(f"brak kursu {currency} w odpowiedzi API")
+        return data
+
+
+class FrankfurterProvider(EcbProvider):
+    name = "frankfurter.app"
+    base_url = "https://api.frankfurter.app"
+
+    def url(self, currency, start_date=None, end_date=None):
+        if start_date and end_date:
+            return f"{self.base_url}/{start_date}..{end_date}?to={currency}"
+        return f"{self.base_url}/latest?to={currency}"
+
+
+class ExchangeRateHostProvider(EcbProvider):
+    name = "exchangerate.host"
+    base_url = "https://api.exchangerate.host"
+
+    def url(self, currency, start_date=None, end_date=None):
+        if start_date and end_date:
+            return f"{self.base_url}/timeseries?start_date={start_date}&end_date={end_date}&base=EUR&symbols={currency}"
+        return f"{self.base_url}/latest?base=EUR&symbols={currency}"
+
+
+class ProviderStats:
+    """Statystyki dostawcy: liczba zapytań i błędów oraz wygładzony czas odpowiedzi."""
+
+    def __init__(self, smoothing=0.3):
+        self.smoothing = smoothing
+        self.requests = 0
+        self.errors = 0
+        self.consecutive_errors = 0
+        self.latency = None
+
+    def record(self, latency, ok):
+        self.requests += 1
+        if ok:
+            self.consecutive_errors = 0
+            if self.latency is None:
+                self.latency = latency
+            else:
+                self.latency += self.smoothing * (latency - self.latency)
+        else:
+            self.errors += 1
+            self.consecutive_errors += 1
+
+    def as_dict(self):
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "latency_ms": None if self.latency is None else round(self.latency * 1000, 1),
+        }
+
+
+class HedgedFetcher:
+    """Równoległe ("hedged") odpytywanie dostawców EBC.
+
+    Zapytanie trafia najpierw do najszybszego sprawnego dostawcy. Jeśli nie odpowie on
+    w czasie hedge_delay (albo zwróci błąd), uruchamiane jest zapytanie do kolejnego;
+    wygrywa pierwsza poprawna odpowiedź. Każdy dostawca ma osobną pulę wątków (max_workers),
+    więc wolne zapytania do jednego dostawcy nie blokują zapytań zapasowych do pozostałych.
+    """
+
+    def __init__(self, http, providers=None, hedge_delay=0.5, max_workers=4, metrics=None):
+        self.http = http
+        self.metrics = metrics
+        self.providers = providers or [FrankfurterProvider(), ExchangeRateHostProvider()]
+        self.hedge_delay = hedge_delay
+        self.stats = {provider.name: ProviderStats() for provider in self.providers}
+        self.lock = threading.Lock()
+        self.executors = {provider.name: ThreadPoolExecutor(max_workers=max_workers) for provider in self.providers}
+
+    def ordered_providers(self):
+        """Dostawcy w kolejności: sprawni przed zawodnymi, potem według czasu odpowiedzi."""
+        with self.lock:
+            def priority(item):
+                index, provider = item
+                stats = self.stats[provider.name]
+                latency = stats.latency if stats.latency is not None else float("inf")
+                return (stats.consecutive_errors > 0, latency, index)
+            return [provider for _, provider in sorted(enumerate(self.providers), key=priority)]
+
+    def _request(self, provider, currency, start_date, end_date):
+        started = time.perf_counter()
+        try:
+            url = provider.url(currency, start_date, end_date)
+            # Zakresy dat mogą obejmować wiele lat - odpowiedź jest wtedy czytana strumieniowo
+            response = self.http.get(url, stream=True) if start_date and end_date else self.http.get(url)
+            try:
+                response.raise_for_status()
+                if self.metrics is None:
+                    data = provider.parse(provider.decode(response, start_date, end_date), currency, start_date, end_date)
+                else:
+                    with self.metrics.timer("decode"):
+                        data = provider.parse(provider.decode(response, start_date, end_date), currency, start_date, end_date)
+            finally:
+                response.close()
+        except (requests.RequestException, ValueError):
+            with self.lock:
+                self.stats[provider.name].record(time.perf_counter() - started, ok=False)
+            raise
+        with self.lock:
+            self.stats[provider.name].record(time.perf_counter() - started, ok=True)
+        return data
+
+    def fetch(self, currency, start_date=None, end_date=None):
+        """Zwraca (dane, błąd) z pierwszej poprawnej odpowiedzi spośród dostawców."""
+        waiting = self.ordered_providers()
+        running = {}
+        errors = []
+        while waiting or running:
+            if waiting:
+                provider = waiting.pop(0)
+                future = self.executors[provider.name].submit(self._request, provider, currency, start_date, end_date)
+                running[future] = provider
+            # Czekamy na odpowiedź najdłużej hedge_delay, zanim uruchomimy kolejnego dostawcę
+            done, _ = wait(running, timeout=self.hedge_delay if waiting else None, return_when=FIRST_COMPLETED)
+            for future in done:
+                provider = running.pop(future)
+                try:
+                    return future.result(), None
+                except (requests.RequestException, ValueError) as e:
+                    errors.append((provider, e))
+        # Kolejność komunikatów zgodna z kolejnością dostawców
+        errors.sort(key=lambda item: self.providers.index(item[0]))
+        details = " i ".join(f"{e} ({provider.name})" for provider, e in errors)
+        return None, f"Błąd podczas pobierania danych z EBC: {details}"
+
+    def stats_snapshot(self):
+        with self.lock:
+            return {name: stats.as_dict() for name, stats in self.stats.items()}
+
+    def close(self):
+        for executor in self.executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,103 @@
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Domyślne limity czasu: (nawiązanie połączenia, odczyt odpowiedzi) w sekundach
+DEFAULT_TIMEOUT = (3.05, 10)
+DEFAULT_POOL_SIZE = 10
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """Adapter HTTP z domyślnym limitem czasu dla każdego żądania."""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, **kwargs):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+class SessionPool:
+    """Współdzielona pula sesji HTTP - jedna sesja (keep-alive) na host.
+
+    Kolejne żądania do tego samego hosta wykorzystują otwarte połączenia TCP/TLS
+    zamiast nawiązywać je od nowa. Z podaną polityką (resilience.ResiliencePolicy)
+    każdy host ma też własny limit zapytań, ponawianie i bezpiecznik.
+    """
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_TIMEOUT, resilience=None, metrics=None):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.resilience = resilience
+        # Opcjonalne pomiary (metrics.Metrics): czasy odpowiedzi w histogramie osobnym dla każdego hosta
+        self.metrics = metrics
+        self.sessions = {}
+        self.guards = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def host(url):
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def session(self, url):
+        """Zwraca (tworząc przy pierwszym użyciu) sesję dla hosta z podanego adresu URL."""
+        key = self.host(url)
+        with self.lock:
+            session = self.sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                adapter = TimeoutHTTPAdapter(
+                    timeout=self.timeout, pool_connections=1, pool_maxsize=self.pool_size
+                )
+                session.mount(key, adapter)
+                self.sessions[key] = session
+            return session
+
+    def guard(self, url):
+        """Zwraca ochronę zapytań (HostGuard) dla hosta lub None, jeśli pula działa bez polityki."""
+        if self.resilience is None:
+            return None
+        key = self.host(url)
+        with self.lock:
+            guard = self.guards.get(key)
+            if guard is None:
+                guard = self.guards[key] = self.resilience.guard()
+            return guard
+
+    def circuit_open(self, url):
+        """Czy zapytania do hosta są chwilowo wstrzymane przez bezpiecznik."""
+        guard = self.guard(url)
+        return guard is not None and guard.breaker.is_open()
+
+    def get(self, url, **kwargs):
+        if self.metrics is None:
+            return self._get(url, **kwargs)
+        started = time.perf_counter()
+        try:
+            return self._get(url, **kwargs)
+        except requests.RequestException:
+            self.metrics.count("http.errors")
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            self.metrics.record("http", elapsed)
+            self.metrics.observe(urlsplit(url).netloc, elapsed)
+
+    def _get(self, url, **kwargs):
+        guard = self.guard(url)
+        if guard is None:
+            return self.session(url).get(url, **kwargs)
+        return guard.call(lambda: self.session(url).get(url, **kwargs))
+
+    def close(self):
+        with self.lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions.clear()
@@ -0,0 +1,137 @@
+"""Strumieniowe dekodowanie dużych odpowiedzi JSON (bez dodatkowych zależności).
+
+Zamiast wczytywać całą odpowiedź i budować pełne drzewo obiektów (response.json()), kolejne
+elementy tablicy lub pary obiektu są dekodowane w miarę napływania fragmentów odpowiedzi.
+W pamięci pozostaje tylko bieżący fragment bufora i zwrócone już elementy.
+"""
+import codecs
+import json
+
+# Odpowiedzi większe niż ten rozmiar (lub o nieznanym rozmiarze) są dekodowane strumieniowo
+STREAM_THRESHOLD = 64 * 1024
+CHUNK_SIZE = 16 * 1024
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+class _Reader:
+    """Bufor tekstu uzupełniany kolejnymi fragmentami bajtów (UTF-8)."""
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """Dokłada kolejny fragment; zwraca False, gdy odpowiedź się skończyła."""
+        if self.eof:
+            return False
+        if self.pos:
+            self.text, self.pos = self.text[self.pos:], 0
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            self.text += self.decoder.decode(b"", final=True)
+            self.eof = True
+            return False
+        self.text += self.decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        return True
+
+    def peek(self):
+        """Zwraca pierwszy znak różny od białego (bez przesuwania pozycji)."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                raise ValueError("nieoczekiwany koniec danych JSON")
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"niepoprawny JSON: oczekiwano {char!r} na pozycji {self.pos}")
+        self.pos += 1
+
+    def value(self):
+        """Dekoduje jedną wartość JSON, dobierając kolejne fragmenty, dopóki wartość nie jest kompletna."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            # Liczba (lub true/false/null) na końcu bufora mogła zostać ucięta - potrzebny jest znak, który ją kończy
+            if end == len(self.text) and not isinstance(value, (dict, list, str)) and not self.eof and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def _find_key(reader, key):
+    """Przechodzi po obiekcie najwyższego poziomu do wartości pod kluczem key (pomijając wcześniejsze pola)."""
+    reader.expect("{")
+    while reader.peek() != "}":
+        name = reader.value()
+        reader.expect(":")
+        if name == key:
+            return True
+        reader.value()
+        if reader.peek() == ",":
+            reader.pos += 1
+    return False
+
+
+def _items(reader, open_char, close_char, pairs):
+    reader.expect(open_char)
+    while reader.peek() != close_char:
+        if pairs:
+            name = reader.value()
+            reader.expect(":")
+            yield name, reader.value()
+        else:
+            yield reader.value()
+        if reader.peek() == ",":
+            reader.pos += 1
+
+
+def iter_array(chunks, key=None, required=False):
+    """Zwraca kolejne elementy tablicy najwyższego poziomu (key=None) albo tablicy pod kluczem key.
+
+    Brak klucza oznacza pusty wynik, a przy required=True - ValueError.
+    """
+    reader = _Reader(chunks)
+    if key is not None and not _find_key(reader, key):
+        if required:
+            raise ValueError(f"brak klucza {key!r} w odpowiedzi JSON")
+        return
+    yield from _items(reader, "[", "]", pairs=False)
+
+
+def iter_object_items(chunks, key, required=False):
+    """Zwraca kolejne pary (nazwa, wartość) obiektu pod kluczem key obiektu najwyższego poziomu.
+
+    Brak klucza oznacza pusty wynik, a przy required=True - ValueError.
+    """
+    reader = _Reader(chunks)
+    if not _find_key(reader, key):
+        if required:
+            raise ValueError(f"brak klucza {key!r} w odpowiedzi JSON")
+        return
+    yield from _items(reader, "{", "}", pairs=True)
+
+
+def is_large(response, threshold=STREAM_THRESHOLD):
+    """Czy odpowiedź warto dekodować strumieniowo (duża lub o nieznanej długości - transfer chunked)."""
+    length = response.headers.get("Content-Length")
+    try:
+        return length is None or int(length) > threshold
+    except (TypeError, ValueError):
+        return True
+
+
+def response_chunks(response):
+    return response.iter_content(chunk_size=CHUNK_SIZE)
@@ -0,0 +1,136 @@
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+# Górne granice przedziałów histogramu czasu odpowiedzi (ms); ostatni przedział jest otwarty
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+logger = logging.getLogger("kursy_walut.metrics")
+
+
+class StageTimer:
+    """Statystyki jednego etapu: liczba pomiarów, łączny, minimalny i maksymalny czas."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def record(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 2),
+            "avg_ms": round(self.total / self.count * 1000, 2) if self.count else None,
+            "min_ms": None if self.min is None else round(self.min * 1000, 2),
+            "max_ms": None if self.max is None else round(self.max * 1000, 2),
+        }
+
+
+class Histogram:
+    """Histogram czasów odpowiedzi w stałych przedziałach (LATENCY_BUCKETS_MS)."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.timer = StageTimer()
+
+    def record(self, seconds):
+        milliseconds = seconds * 1000
+        index = next((i for i, bound in enumerate(self.buckets) if milliseconds <= bound), len(self.buckets))
+        self.counts[index] += 1
+        self.timer.record(seconds)
+
+    def quantile(self, q):
+        """Przybliżony kwantyl (górna granica przedziału) w ms."""
+        target = q * self.timer.count
+        seen = 0
+        for bound, count in zip(self.buckets + (None,), self.counts):
+            seen += count
+            if count and seen >= target:
+                return bound if bound is not None else round(self.timer.max * 1000, 2)
+        return None
+
+    def as_dict(self):
+        labels = [f"<={bound}ms" for bound in self.buckets] + [f">{self.buckets[-1]}ms"]
+        return dict(self.timer.as_dict(), p50_ms=self.quantile(0.5), p95_ms=self.quantile(0.95),
+                    buckets=dict(zip(labels, self.counts)))
+
+
+class Metrics:
+    """Lekkie, bezpieczne wątkowo pomiary: czasy etapów, liczniki i histogramy czasów odpowiedzi.
+
+    Etapy mierzy się przez `with metrics.timer("etap"):`, zdarzenia zlicza count(), a czasy
+    zapytań do dostawców zapisuje observe(). Wyniki można wyeksportować do pliku JSON lub logu.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stages = {}
+        self.counters = {}
+        self.histograms = {}
+        self.started = time.time()
+
+    @contextmanager
+    def timer(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - started)
+
+    def record(self, stage, seconds):
+        with self.lock:
+            self.stages.setdefault(stage, StageTimer()).record(seconds)
+
+    def count(self, name, value=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name, seconds):
+        with self.lock:
+            self.histograms.setdefault(name, Histogram()).record(seconds)
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "since": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+                "stages": {name: timer.as_dict() for name, timer in sorted(self.stages.items())},
+                "counters": dict(sorted(self.counters.items())),
+                "latency": {name: histogram.as_dict() for name, histogram in sorted(self.histograms.items())},
+            }
+
+    def cache_hit_ratio(self):
+        with self.lock:
+            hits, misses = self.counters.get("cache.hit", 0), self.counters.get("cache.miss", 0)
+        return hits / (hits + misses) if hits + misses else None
+
+    def summary(self):
+        """Krótki opis do paska stanu, np. "zapytanie: 120 ms | sieć: 3 × 35 ms | cache: 75%"."""
+        snapshot = self.snapshot()
+        parts = []
+        labels = {"query": "zapytanie", "http": "sieć", "decode": "JSON", "render.text": "tekst", "render.chart": "wykres"}
+        for stage, label in labels.items():
+            timer = snapshot["stages"].get(stage)
+            if timer:
+                parts.append(f"{label}: {timer['count']} × {timer['avg_ms']:.0f} ms")
+        ratio = self.cache_hit_ratio()
+        if ratio is not None:
+            parts.append(f"cache: {ratio:.0%}")
+        return " | ".join(parts)
+
+    def export(self, path):
+        """Zapisuje migawkę pomiarów do pliku JSON."""
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.snapshot(), file, ensure_ascii=False, indent=2)
+
+    def log(self, level=logging.INFO):
+        logger.log(level, "metryki: %s", json.dumps(self.snapshot(), ensure_ascii=False))
@@ -0,0 +1,151 @@
+"""Pobieranie kursów z wyprzedzeniem: po publikacji tabel NBP i EBC zapisuje je w pamięci podręcznej.
+
+Dzięki temu pierwsze zapytanie o kurs aktualny (CurrencyApp lub rates_cli) nie wymaga sieci.
+Harmonogram można uruchomić w aplikacji (CurrencyApp(prefetch=True), project.py --prefetch)
+albo samodzielnie: python prefetch.py [--once].
+"""
+import argparse
+import logging
+import random
+import sys
+import threading
+from datetime import timedelta
+
+from publication import PUBLICATION_TIMES, publication_time, next_publication, now_warsaw
+from rate_cache import DEFAULT_CACHE_PATH
+from rates_core import RateClient, SOURCES
+
+logger = logging.getLogger("kursy_walut.prefetch")
+
+# Po tylu godzinach od planowanej publikacji przestajemy czekać na tabelę (święto, dzień bez notowań)
+GIVE_UP_AFTER = timedelta(hours=8)
+
+
+class PrefetchScheduler:
+    """Wątek w tle, który po każdej planowanej publikacji pobiera nowe tabele do pamięci podręcznej klienta.
+
+    Dopóki tabela się nie pojawi, kolejne próby są ponawiane z wykładniczo rosnącym odstępem
+    (backoff, max_backoff - sekundy, z losowym rozrzutem).
+    """
+
+    def __init__(self, client, currencies=None, sources=SOURCES, backoff=60.0, max_backoff=1800.0,
+                 clock=now_warsaw, rng=random.random):
+        self.client = client
+        self.currencies = list(currencies or client.currencies)
+        self.tasks = [(source, table) for source, table in PUBLICATION_TIMES if source in sources]
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.clock = clock
+        self.rng = rng
+        # Dzień, dla którego tabela (źródło, tabela) została już pobrana lub pominięta
+        self.done = {}
+        self._stop = threading.Event()
+        self.thread = None
+
+    def warm(self):
+        """Uzupełnia pamięć podręczną o dane potrzebne w trybie aktualnym (tylko brakujące dni)."""
+        for source, table in self.tasks:
+            if source == "NBP":
+                self.client.get_nbp_rates_bulk(table, currencies=self.currencies)
+            else:
+                for currency in self.currencies:
+                    if currency != "EUR":
+                        self.client.get_ecb_rates(currency)
+
+    def fetch_published(self, source, table, day):
+        """Pobiera tabelę z podanego dnia; zwraca True, jeśli została już opublikowana."""
+        if source == "NBP":
+            results = self.client.get_nbp_rates_bulk(table, day, day, currencies=self.currencies)
+            published = any(data for data, _, _ in results.values())
+            if published:
+                self.client.get_nbp_rates_bulk(table, currencies=self.currencies)
+            return published
+        results = [self.client.get_ecb_rates(currency) for currency in self.currencies if currency != "EUR"]
+        return all(data and data["date"] >= day for data, _ in results)
+
+    def next_task(self):
+        """Zwraca (moment, źródło, tabela) najbliższej publikacji, która nie została jeszcze pobrana."""
+        now = self.clock()
+        candidates = []
+        for source, table in self.tasks:
+            published = publication_time(source, table, now.date())
+            if published and published <= now and self.done.get((source, table)) != now.date():
+                candidates.append((published, source, table))
+            else:
+                candidates.append((next_publication(source, table, now + timedelta(seconds=1)), source, table))
+        return min(candidates)
+
+    def delay(self, attempt):
+        return min(self.max_backoff, self.backoff * 2 ** attempt) * (0.5 + self.rng() / 2)
+
+    def run_task(self, published, source, table):
+        """Pobiera tabelę, ponawiając próby z backoffem, dopóki się nie pojawi albo nie minie GIVE_UP_AFTER."""
+        day = published.date()
+        attempt = 0
+        while not self._stop.is_set():
+            try:
+                if self.fetch_published(source, table, day.isoformat()):
+                    logger.info("pobrano tabelę %s %s z %s", source, table, day)
+                    break
+            except Exception:
+                logger.exception("błąd pobierania tabeli %s %s", source, table)
+            wait = self.delay(attempt)
+            if self.clock() + timedelta(seconds=wait) > published + GIVE_UP_AFTER:
+                logger.info("brak tabeli %s %s z %s - pominięto", source, table, day)
+                break
+            attempt += 1
+            self._stop.wait(wait)
+        self.done[(source, table)] = day
+
+    def run(self):
+        try:
+            self.warm()
+        except Exception:
+            logger.exception("błąd wstępnego pobierania kursów")
+        while not self._stop.is_set():
+            published, source, table = self.next_task()
+            wait = (published - self.clock()).total_seconds()
+            if wait > 0:
+                self._stop.wait(wait)
+                continue
+            self.run_task(published, source, table)
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name="prefetch", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self.thread is not None:
+            self.thread.join()
+
+
+def main(argv=None):
+    from rates_cli import parse_list
+    from rates_core import CURRENCIES
+
+    parser = argparse.ArgumentParser(description="Pobiera kursy NBP i EBC do pamięci podręcznej po ich publikacji.")
+    parser.add_argument("--currencies", type=parse_list, default=CURRENCIES, help="waluty oddzielone przecinkami")
+    parser.add_argument("--sources", type=parse_list, default=SOURCES, help="źródła: NBP, EBC (domyślnie: oba)")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH, help="plik pamięci podręcznej SQLite")
+    parser.add_argument("--once", action="store_true", help="tylko uzupełnij pamięć podręczną i zakończ")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    client = RateClient(cache_path=args.cache, currencies=args.currencies)
+    scheduler = PrefetchScheduler(client, sources=args.sources)
+    try:
+        if args.once:
+            scheduler.warm()
+        else:
+            scheduler.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        client.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
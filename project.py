@@ -1,36 +1,82 @@
-import requests
+import argparse
+import queue
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import tkinter as tk
-from tkinter import ttk, messagebox
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.dates as mdates
-from matplotlib.figure import Figure
+from tkinter import ttk, messagebox, filedialog
+from rates_core import RateClient, RateResult, SOURCES, format_rates, format_bulk_rates
+from rate_store import result_entries, export_series
+
+# Powyżej tej liczby punktów wykres jest rysowany bez znaczników
+MARKER_MAX_POINTS = 100
+
+def downsample_minmax(x, y, buckets):
+    """Zmniejsza liczbę punktów linii, zachowując minimum i maksimum w każdym z `buckets` przedziałów.
+    
+    Kształt wykresu (w tym skrajne wartości) pozostaje taki sam przy rozdzielczości rzędu piksela.
+    """
+    x, y = np.asarray(x), np.asarray(y)
+    if len(x) <= 2 * buckets:
+        return x, y
+    edges = np.linspace(0, len(x), buckets + 1).astype(int)
+    indices = []
+    for start, end in zip(edges[:-1], edges[1:]):
+        segment = y[start:end]
+        low, high = start + int(np.argmin(segment)), start + int(np.argmax(segment))
+        indices.extend(sorted({low, high}))
+    indices = np.array(indices)
+    return x[indices], y[indices]
 
 class CurrencyApp:
-    def __init__(self, root):
+    def __init__(self, root, client=None, status_bar=False, metrics_path=None, prefetch=False, **client_options):
         self.root = root
         self.root.title("Kursy Walut")
         self.root.geometry("1000x700")
         
+        # Pobieranie, pamięć podręczna i formatowanie kursów - wspólny rdzeń z wierszem poleceń
+        self.client = client or RateClient(**client_options)
+        
         # Dostępne waluty (na podstawie API NBP i EBC)
-        self.currencies = ["USD", "EUR", "GBP", "CHF", "JPY", "AUD", "CAD"]
-        self.sources = ["NBP", "EBC"]
+        self.currencies = self.client.currencies
+        self.sources = SOURCES
+        
+        # Pomiary (wspólne z klientem): czasy etapów, opóźnienia dostawców, trafienia pamięci podręcznej
+        self.metrics = self.client.metrics
+        self.metrics_path = metrics_path
+        self.status_bar = status_bar
+        
+        # Opcjonalne pobieranie nowych tabel w tle po ich publikacji (kurs aktualny bez czekania na sieć)
+        self.prefetcher = None
+        if prefetch:
+            from prefetch import PrefetchScheduler
+            self.prefetcher = PrefetchScheduler(self.client).start()
         
         # Domyślne daty
         self.default_end_date = datetime.now().strftime("%Y-%m-%d")
         self.default_start_date = (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d")
         
+        # Pobieranie w tle: wyniki trafiają do kolejki odczytywanej w pętli Tk przez after()
+        self.executor = ThreadPoolExecutor(max_workers=4)
+        self.results_queue = queue.Queue()
+        self.poll_interval = 50
+        self.query_id = 0
+        self.current_result = None
+        self._query_started = None
+        self._pending = {}
+        self._polling = False
+        
         # GUI Elements
         self.create_widgets()
         
-        # Matplotlib Figure
-        self.figure = Figure(figsize=(6, 4), dpi=100)
-        self.ax = self.figure.add_subplot(111)
-        self.canvas = FigureCanvasTkAgg(self.figure, master=self.root)
-        self.canvas_widget = self.canvas.get_tk_widget()
-        # Domyślnie wykres ukryty
-        self.canvas_widget.pack_forget()
+        # Opcjonalny pasek stanu z podsumowaniem pomiarów
+        self.status_var = tk.StringVar()
+        if status_bar:
+            ttk.Label(self.root, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W).pack(side=tk.BOTTOM, fill=tk.X)
+        
+        # Wykres (matplotlib) jest tworzony dopiero przy pierwszym użyciu - patrz ensure_chart()
+        self._figure = None
     
     def create_widgets(self):
         # Ramka na wybór waluty, źródła i danych archiwalnych
@@ -43,6 +89,8 @@ class CurrencyApp:
         self.currency_combobox = ttk.Combobox(self.input_frame, values=self.currencies, textvariable=self.currency_var, font=("Arial", 10))
         self.currency_combobox.pack(fill=tk.X, pady=5)
         self.currency_combobox.set(self.currencies[0])
+        self.all_currencies_var = tk.BooleanVar()
+        tk.Checkbutton(self.input_frame, text="Wszystkie waluty (tabele zbiorcze NBP)", variable=self.all_currencies_var, font=("Arial", 10)).pack(anchor="w")
         
         # Źródło danych
         tk.Label(self.input_frame, text="Wybierz źródło danych:", font=("Arial", 12)).pack(anchor="w")
@@ -78,11 +126,18 @@ class CurrencyApp:
         self.button_frame.pack(pady=10)
         tk.Button(self.button_frame, text="Pobierz kursy", command=self.fetch_rates, font=("Arial", 12), bg="#4CAF50", fg="white").pack(side=tk.LEFT, padx=5)
         tk.Button(self.button_frame, text="Wyczyść wyniki", command=self.clear_results, font=("Arial", 12), bg="#f44336", fg="white").pack(side=tk.LEFT, padx=5)
+        tk.Button(self.button_frame, text="Eksportuj", command=self.export_store, font=("Arial", 12)).pack(side=tk.LEFT, padx=5)
+        tk.Button(self.button_frame, text="Importuj", command=self.import_store, font=("Arial", 12)).pack(side=tk.LEFT, padx=5)
         
         # Obszar wyników tekstowych
         tk.Label(self.root, text="Wyniki:", font=("Arial", 12)).pack(anchor="w", padx=10)
-        self.result_text = tk.Text(self.root, height=5, width=70, font=("Arial", 10))
-        self.result_text.pack(pady=10, padx=10)
+        self.result_frame = tk.Frame(self.root)
+        self.result_frame.pack(pady=10, padx=10)
+        self.result_text = tk.Text(self.result_frame, height=5, width=70, font=("Arial", 10), undo=False)
+        result_scrollbar = tk.Scrollbar(self.result_frame, command=self.result_text.yview)
+        self.result_text.configure(yscrollcommand=result_scrollbar.set)
+        result_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.result_text.pack(side=tk.LEFT)
     
     def toggle_date_fields(self):
         """Pokazuje/ukrywa pola dat i wykres w zależności od wyboru danych archiwalnych."""
@@ -90,157 +145,118 @@ class CurrencyApp:
             self.date_frame.pack(pady=5, fill=tk.X)
         else:
             self.date_frame.pack_forget()
-            self.canvas_widget.pack_forget()
+            self.hide_chart()
     
-    def get_nbp_rates(self, currency, table, start_date=None, end_date=None, retry_days=0):
-        """Pobiera kursy walut z API NBP dla podanej waluty, tabeli (A lub C) i zakresu dat."""
-        try:
-            if start_date and end_date:
-                url = f"https://api.nbp.pl/api/exchangerates/rates/{table}/{currency}/{start_date}/{end_date}/?format=json"
-            else:
-                # Zawsze zaczynaj od poprzedniego dnia w trybie aktualnym
-                retry_days = max(1, retry_days)
-                current_date = (datetime.now() - timedelta(days=retry_days)).strftime("%Y-%m-%d")
-                url = f"https://api.nbp.pl/api/exchangerates/rates/{table}/{currency}/{current_date}/?format=json"
-            
-            response = requests.get(url)
-            if response.status_code == 404:
-                if not start_date and retry_days < 5:
-                    return self.get_nbp_rates(currency, table, retry_days=retry_days + 1)
-                error_msg = "Brak danych dla podanego zakresu lub waluty." if start_date else f"Brak danych dla podanego zakresu lub waluty (po {retry_days} prób)."
-                return None, error_msg, None
-            response.raise_for_status()
-            data = response.json()
-            effective_date = current_date if not start_date else None
-            return data, None, effective_date
-        except requests.RequestException as e:
-            return None, f"Błąd podczas pobierania danych z NBP: {e}", None
+    def ensure_chart(self):
+        """Tworzy wykres przy pierwszym użyciu - import matplotlib nie spowalnia uruchomienia aplikacji."""
+        if self._figure is not None:
+            return
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        import matplotlib.dates as mdates
+        
+        self._figure = Figure(figsize=(6, 4), dpi=100)
+        self._ax = self._figure.add_subplot(111)
+        self._canvas = FigureCanvasTkAgg(self._figure, master=self.root)
+        self._canvas_widget = self._canvas.get_tk_widget()
+        # Stałe elementy wykresu - kolejne zapytania tylko podmieniają dane linii
+        self.ax.xaxis_date()
+        self.ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d"))
+        self.ax.xaxis.set_major_locator(mdates.AutoDateLocator(maxticks=10))
+        self.figure.autofmt_xdate(rotation=45)
+        self.ax.set_xlabel("Data")
+        self.ax.set_ylabel("Kurs")
+        self.ax.grid(True)
+        self.rate_line, = self.ax.plot([], [])
+        self.chart_message = self.ax.text(0.5, 0.5, "", ha="center", va="center", transform=self.ax.transAxes)
+        self.chart_legend = None
     
-    def get_ecb_rates(self, currency, start_date=None, end_date=None):
-        """Pobiera kursy walut z API opartego na danych EBC (pierwszeństwo: frankfurter.app, zapasowe: exchangerate.host)."""
-        try:
-            base_url = "https://api.frankfurter.app"
-            if start_date and end_date:
-                url = f"{base_url}/{start_date}..{end_date}?to={currency}"
-            else:
-                url = f"{base_url}/latest?to={currency}"
-            
-            response = requests.get(url)
-            response.raise_for_status()
-            data = response.json()
-            return data, None
-        except requests.RequestException as e:
-            try:
-                base_url = "https://api.exchangerate.host"
-                if start_date and end_date:
-                    url = f"{base_url}/timeseries?start_date={start_date}&end_date={end_date}&base=EUR&symbols={currency}"
-                else:
-                    url = f"{base_url}/latest?base=EUR&symbols={currency}"
-                
-                response = requests.get(url)
-                response.raise_for_status()
-                data = response.json()
-                return data, None
-            except requests.RequestException as e2:
-                return None, f"Błąd podczas pobierania danych z EBC: {e} (frankfurter.app) i {e2} (exchangerate.host)"
+    @property
+    def figure(self):
+        self.ensure_chart()
+        return self._figure
     
-    def plot_rates(self, currency, source, start_date, end_date):
+    @property
+    def ax(self):
+        self.ensure_chart()
+        return self._ax
+    
+    @property
+    def canvas(self):
+        self.ensure_chart()
+        return self._canvas
+    
+    @property
+    def canvas_widget(self):
+        self.ensure_chart()
+        return self._canvas_widget
+    
+    def hide_chart(self):
+        """Ukrywa wykres (o ile został już utworzony)."""
+        if self._figure is not None:
+            self._canvas_widget.pack_forget()
+    
+    def _show_chart(self, message=""):
+        """Ustawia komunikat na wykresie, odświeża płótno i pokazuje wykres."""
+        self.chart_message.set_text(message)
+        if message:
+            self.rate_line.set_data([], [])
+            self.ax.set_title("")
+            if self.chart_legend:
+                self.chart_legend.set_visible(False)
+        with self.metrics.timer("render.chart"):
+            self.canvas.draw()
+        # Pokaz wykres poniżej pola tekstowego
+        self.canvas_widget.pack(pady=20, padx=10, fill=tk.BOTH, expand=True)
+    
+    def plot_rates(self, currency, source, start_date, end_date, result=None):
         """Rysuje wykres kursów średnich walut dla danych archiwalnych."""
-        self.ax.clear()  # Czyści poprzedni wykres
-        
-        dates = []
+        if result is None:
+            result = self.client.load_rates(currency, source, start_date, end_date, tables=("A",))
         
         if source == "NBP":
-            # Pobieranie danych z NBP (tylko kurs średni)
-            data_a, error_a, _ = self.get_nbp_rates(currency, "A", start_date, end_date)
+            # Dane z NBP (tylko kurs średni)
+            _, error_a, _ = result.tables["A"]
             if error_a:
-                self.ax.text(0.5, 0.5, error_a, ha="center", va="center")
-                self.canvas.draw()
-                self.canvas_widget.pack(pady=20, padx=10, fill=tk.BOTH, expand=True)
+                self._show_chart(error_a)
                 return
-            dates = [datetime.strptime(rate["effectiveDate"], "%Y-%m-%d") for rate in data_a["rates"]]
-            nbp_mid = [rate["mid"] for rate in data_a["rates"]]
-            if nbp_mid:
-                self.ax.plot(dates, nbp_mid, label="NBP Średni (PLN)", marker="o")
+            series = result.series("A")
+            label, marker = "NBP Średni (PLN)", "o"
         
         elif source == "EBC":
-            # Pobieranie danych z EBC
-            data, error = self.get_ecb_rates(currency, start_date, end_date)
+            # Dane z EBC
+            _, error = result.ecb
             if error:
-                self.ax.text(0.5, 0.5, error, ha="center", va="center")
-                self.canvas.draw()
-                self.canvas_widget.pack(pady=20, padx=10, fill=tk.BOTH, expand=True)
+                self._show_chart(error)
                 return
-            dates = [datetime.strptime(date, "%Y-%m-%d") for date in data["rates"].keys()]
-            ecb_rates = [data["rates"][date][currency] for date in data["rates"].keys()]
-            if ecb_rates:
-                self.ax.plot(dates, ecb_rates, label="EBC (EUR)", marker="d")
+            series = result.series("EBC")
+            label, marker = "EBC (EUR)", "d"
         
-        # Formatowanie osi
-        if dates:
-            self.ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d"))
-            self.ax.xaxis.set_major_locator(mdates.AutoDateLocator(maxticks=10))
-            self.figure.autofmt_xdate(rotation=45)
-            self.ax.set_xlabel("Data")
-            self.ax.set_ylabel("Kurs")
-            self.ax.set_title(f"Kurs średni waluty {currency} ({source})")
-            self.ax.legend()
-            self.ax.grid(True)
-        else:
-            self.ax.text(0.5, 0.5, "Brak danych do wyświetlenia", ha="center", va="center")
+        if not len(series):
+            self._show_chart("Brak danych do wyświetlenia")
+            return
         
-        self.canvas.draw()
-        # Pokaz wykres poniżej pola tekstowego
-        self.canvas_widget.pack(pady=20, padx=10, fill=tk.BOTH, expand=True)
+        # Długie zakresy: najwyżej dwa punkty (min i max) na piksel szerokości osi
+        import matplotlib.dates as mdates
+        x, y = downsample_minmax(mdates.date2num(series.dates), series["mid"], max(int(self.ax.bbox.width), 1))
+        self.rate_line.set_data(x, y)
+        self.rate_line.set_label(label)
+        self.rate_line.set_marker(marker if len(x) <= MARKER_MAX_POINTS else "")
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.ax.set_title(f"Kurs średni waluty {currency} ({source})")
+        self.chart_legend = self.ax.legend()
+        self._show_chart()
     
-    def display_rates(self, currency, source, start_date=None, end_date=None):
+    def display_rates(self, currency, source, start_date=None, end_date=None, result=None):
         """Wyświetla kursy walut w polu tekstowym."""
-        self.result_text.delete(1.0, tk.END)
-        self.result_text.insert(tk.END, f"Kursy dla waluty {currency} (źródło: {source})\n\n")
-        
-        if source == "NBP":
-            # Tabela A (kurs średni)
-            data_a, error_a, effective_date = self.get_nbp_rates(currency, "A", start_date, end_date)
-            if error_a:
-                self.result_text.insert(tk.END, f"NBP Tabela A: {error_a}\n")
-            else:
-                self.result_text.insert(tk.END, "NBP Tabela A (kurs średni):\n")
-                if start_date and end_date:
-                    for rate in data_a["rates"]:
-                        self.result_text.insert(tk.END, f"Data: {rate['effectiveDate']}, Kurs średni: {rate['mid']} PLN\n")
-                else:
-                    date_str = effective_date or data_a["rates"][0]["effectiveDate"]
-                    self.result_text.insert(tk.END, f"Data: {date_str}, Kurs średni: {data_a['rates'][0]['mid']} PLN\n")
-                    if effective_date:
-                        self.result_text.insert(tk.END, f"Uwaga: Pobrano kurs z {effective_date} zamiast bieżącego dnia.\n")
-            
-            # Tabela C (kursy kupna i sprzedaży)
-            data_c, error_c, effective_date_c = self.get_nbp_rates(currency, "C", start_date, end_date)
-            if error_c:
-                self.result_text.insert(tk.END, f"NBP Tabela C: {error_c}\n")
-            else:
-                self.result_text.insert(tk.END, "\nNBP Tabela C (kursy kupna/sprzedaży):\n")
-                if start_date and end_date:
-                    for rate in data_c["rates"]:
-                        self.result_text.insert(tk.END, f"Data: {rate['effectiveDate']}, Kupno: {rate['bid']} PLN, Sprzedaż: {rate['ask']} PLN\n")
-                else:
-                    date_str = effective_date_c or data_c["rates"][0]["effectiveDate"]
-                    self.result_text.insert(tk.END, f"Data: {date_str}, Kupno: {data_c['rates'][0]['bid']} PLN, Sprzedaż: {data_c['rates'][0]['ask']} PLN\n")
-                    if effective_date_c:
-                        self.result_text.insert(tk.END, f"Uwaga: Pobrano kurs z {effective_date_c} zamiast bieżącego dnia.\n")
-        
-        elif source == "EBC":
-            data, error = self.get_ecb_rates(currency, start_date, end_date)
-            if error:
-                self.result_text.insert(tk.END, f"EBC: {error}\n")
-                self.result_text.insert(tk.END, "Uwaga: API EBC może być niedostępne. Spróbuj źródła NBP lub innego zakresu dat.\n")
-            else:
-                self.result_text.insert(tk.END, "EBC (kurs względem EUR):\n")
-                if start_date and end_date:
-                    for date, rates in data["rates"].items():
-                        self.result_text.insert(tk.END, f"Data: {date}, Kurs: {rates[currency]} EUR\n")
-                else:
-                    self.result_text.insert(tk.END, f"Data: {data['date']}, Kurs: {data['rates'][currency]} EUR\n")
+        if result is None:
+            result = self.client.load_rates(currency, source, start_date, end_date)
+        lines = format_bulk_rates(result) if result.bulk else format_rates(result)
+        # Jedno wstawienie całego tekstu zamiast osobnego insert() dla każdego wiersza
+        with self.metrics.timer("render.text"):
+            self.result_text.delete(1.0, tk.END)
+            self.result_text.insert(tk.END, "".join(lines))
     
     def fetch_rates(self):
         """Pobiera i wyświetla kursy na podstawie danych wprowadzonych przez użytkownika."""
@@ -253,6 +269,10 @@ class CurrencyApp:
         if not source or source not in self.sources:
             messagebox.showerror("Błąd", "Wybierz poprawne źródło danych!")
             return
+        bulk = self.all_currencies_var.get()
+        if bulk and source != "NBP":
+            messagebox.showerror("Błąd", "Kursy wszystkich walut są dostępne tylko dla źródła NBP!")
+            return
         
         if self.historical_var.get():
             start_date = self.start_date_entry.get()
@@ -271,19 +291,127 @@ class CurrencyApp:
                 return
         else:
             start_date = end_date = None
-            self.canvas_widget.pack_forget()  # Ukryj wykres dla danych aktualnych
+            self.hide_chart()  # Ukryj wykres dla danych aktualnych
+        if bulk:
+            self.hide_chart()  # Wykres dotyczy pojedynczej waluty
         
-        self.display_rates(currency, source, start_date, end_date)
-        if self.historical_var.get():
-            self.plot_rates(currency, source, start_date, end_date)
+        # Jedno pobranie na akcję użytkownika - wynik współdzielą tekst i wykres
+        self.start_query(currency, source, start_date, end_date, bulk=bulk)
+    
+    def start_query(self, currency, source, start_date=None, end_date=None, bulk=False):
+        """Uruchamia pobieranie kursów w tle; wyniki są wyświetlane w miarę napływania kolejnych tabel."""
+        self.cancel_query()
+        query_id = self.query_id
+        self._query_started = time.perf_counter()
+        self.current_result = RateResult(currency, source, start_date, end_date, bulk=bulk)
+        if bulk:
+            tasks = {table: (self.client.get_nbp_rates_bulk, table, start_date, end_date) for table in ("A", "C")}
+        elif source == "NBP":
+            tasks = {table: (self.client.get_nbp_rates, currency, table, start_date, end_date) for table in ("A", "C")}
+        else:
+            tasks = {"EBC": (self.client.get_ecb_rates, currency, start_date, end_date)}
+        for part, (func, *args) in tasks.items():
+            # Kursy w postaci kolumnowej (RateSeries) - bez list rekordów z odpowiedzi
+            future = self.executor.submit(func, *args, columnar=True)
+            self._pending[part] = future
+            future.add_done_callback(lambda future, part=part: self._on_part_done(query_id, part, future, bulk))
+        self.display_rates(currency, source, start_date, end_date, result=self.current_result)
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_interval, self._poll_results)
+    
+    def cancel_query(self):
+        """Anuluje bieżące zapytanie - wyniki, które jeszcze napłyną, zostaną pominięte."""
+        self.query_id += 1
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+    
+    def _on_part_done(self, query_id, part, future, bulk=False):
+        """Wywoływana w wątku roboczym - przekazuje wynik do pętli Tk przez kolejkę."""
+        if future.cancelled():
+            return
+        try:
+            value = future.result()
+        except Exception as e:
+            error = f"Błąd podczas przetwarzania danych: {e}"
+            if bulk:
+                value = {currency: (None, error, None) for currency in self.currencies}
+            else:
+                value = (None, error) if part == "EBC" else (None, error, None)
+        self.results_queue.put((query_id, part, value))
+    
+    def _poll_results(self):
+        """Odbiera wyniki z wątków roboczych i odświeża widok (wywoływana przez after())."""
+        while True:
+            try:
+                query_id, part, value = self.results_queue.get_nowait()
+            except queue.Empty:
+                break
+            if query_id != self.query_id:
+                continue  # Wynik zapytania zastąpionego nowszym
+            self._pending.pop(part, None)
+            result = self.current_result
+            if part == "EBC":
+                result.ecb = value
+            else:
+                result.tables[part] = value
+            self.display_rates(result.currency, result.source, result.start_date, result.end_date, result=result)
+            if result.start_date and result.end_date and part in ("A", "EBC") and not result.bulk:
+                self.plot_rates(result.currency, result.source, result.start_date, result.end_date, result=result)
+            if not self._pending:
+                self._query_finished()
+        if self._pending:
+            self.root.after(self.poll_interval, self._poll_results)
+        else:
+            self._polling = False
+    
+    def _query_finished(self):
+        """Zapisuje czas całego zapytania, odświeża pasek stanu i eksportuje pomiary."""
+        self.metrics.record("query", time.perf_counter() - self._query_started)
+        if self.status_bar:
+            self.status_var.set(self.metrics.summary())
+        if self.metrics_path:
+            self.metrics.export(self.metrics_path)
+    
+    def export_store(self):
+        """Zapisuje szeregi ostatniego zapytania do wybranego katalogu (tablice NumPy)."""
+        entries = result_entries(self.current_result) if self.current_result is not None else []
+        if not entries:
+            messagebox.showerror("Błąd", "Brak pobranych kursów do zapisania!")
+            return
+        directory = filedialog.askdirectory(title="Katalog eksportu")
+        if directory:
+            export_series(directory, entries)
+            messagebox.showinfo("Eksport", f"Zapisano szeregów: {len(entries)}")
+    
+    def import_store(self):
+        """Wczytuje zapisane szeregi do pamięci podręcznej - zapytania o te zakresy nie wymagają sieci."""
+        directory = filedialog.askdirectory(title="Katalog z zapisanymi kursami")
+        if not directory:
+            return
+        try:
+            count = self.client.import_store(directory)
+        except (OSError, ValueError, KeyError) as e:
+            messagebox.showerror("Błąd", f"Nie udało się wczytać danych: {e}")
+            return
+        messagebox.showinfo("Import", f"Wczytano szeregów: {count}")
     
     def clear_results(self):
         """Czyści pole wyników i ukrywa wykres."""
+        self.cancel_query()
         self.result_text.delete(1.0, tk.END)
-        self.ax.clear()
-        self.canvas_widget.pack_forget()
+        if self._figure is not None:
+            self.rate_line.set_data([], [])
+            self.chart_message.set_text("")
+        self.hide_chart()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Kursy walut NBP i EBC.")
+    parser.add_argument("--status-bar", action="store_true", help="pokaż pasek stanu z pomiarami czasu")
+    parser.add_argument("--metrics", help="zapisuj pomiary do pliku JSON po każdym zapytaniu")
+    parser.add_argument("--prefetch", action="store_true", help="pobieraj nowe tabele NBP i EBC w tle po ich publikacji")
+    args = parser.parse_args()
     root = tk.Tk()
-    app = CurrencyApp(root)
+    app = CurrencyApp(root, status_bar=args.status_bar, metrics_path=args.metrics, prefetch=args.prefetch)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,51 @@
+from datetime import datetime, time, timedelta
+
+try:
+    from zoneinfo import ZoneInfo
+    WARSAW = ZoneInfo("Europe/Warsaw")
+except Exception:  # Brak bazy stref czasowych (np. Windows bez pakietu tzdata) - czas lokalny
+    WARSAW = None
+
+# Godziny publikacji (czas warszawski, dni robocze) z zapasem na opóźnienia:
+# NBP tabela C ok. 8:15, tabela A ok. 12:15, kursy referencyjne EBC ok. 16:00
+PUBLICATION_TIMES = {
+    ("NBP", "C"): time(8, 15),
+    ("NBP", "A"): time(12, 15),
+    ("EBC", ""): time(16, 15),
+}
+
+
+def now_warsaw():
+    return datetime.now(WARSAW).replace(tzinfo=None) if WARSAW else datetime.now()
+
+
+def publication_time(source, table, day):
+    """Planowany moment publikacji tabeli w podanym dniu (datetime) lub None dla weekendu."""
+    if day.weekday() >= 5:
+        return None
+    return datetime.combine(day, PUBLICATION_TIMES[(source, table)])
+
+
+def latest_publication(source, table, now=None):
+    """Data (RRRR-MM-DD) ostatniej tabeli, która według harmonogramu powinna być już opublikowana.
+
+    Święta nie są uwzględniane - w takie dni tabela po prostu się nie pojawi.
+    """
+    now = now or now_warsaw()
+    day = now.date()
+    while True:
+        published = publication_time(source, table, day)
+        if published and published <= now:
+            return day.isoformat()
+        day -= timedelta(days=1)
+
+
+def next_publication(source, table, now=None):
+    """Najbliższy (nie wcześniejszy niż now) planowany moment publikacji tabeli."""
+    now = now or now_warsaw()
+    day = now.date()
+    while True:
+        published = publication_time(source, table, day)
+        if published and published >= now:
+            return published
+        day += timedelta(days=1)
@@ -0,0 +1,144 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import date, timedelta
+
+from rate_series import RateSeries, RATE_FIELDS
+
+# Domyślna lokalizacja pamięci podręcznej kursów
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "kursy_walut", "rates.sqlite3")
+
+
+class RateCache:
+    """Trwała pamięć podręczna kursów walut (SQLite).
+
+    Kursy są zapisywane pod kluczem (źródło, tabela, waluta, data), a osobna tabela
+    pokrycia pamięta, które zakresy dat zostały już pobrane - także dni bez notowań
+    (weekendy, święta), dzięki czemu zapytanie o zakres pobiera z sieci tylko luki.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS rates ("
+                "source TEXT, tbl TEXT, currency TEXT, date TEXT, record TEXT, "
+                "PRIMARY KEY (source, tbl, currency, date))"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS coverage ("
+                "source TEXT, tbl TEXT, currency TEXT, start TEXT, end TEXT)"
+            )
+
+    def _intervals(self, source, table, currency):
+        rows = self.conn.execute(
+            "SELECT start, end FROM coverage WHERE source=? AND tbl=? AND currency=? ORDER BY start",
+            (source, table, currency),
+        )
+        return [(date.fromisoformat(start), date.fromisoformat(end)) for start, end in rows]
+
+    def missing_ranges(self, source, table, currency, start_date, end_date):
+        """Zwraca listę zakresów (start, koniec) w formacie RRRR-MM-DD, których brakuje w pamięci."""
+        start, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+        with self.lock:
+            intervals = self._intervals(source, table, currency)
+        missing = []
+        cursor = start
+        for covered_start, covered_end in intervals:
+            if covered_end < cursor:
+                continue
+            if covered_start > end:
+                break
+            if covered_start > cursor:
+                missing.append((cursor, covered_start - timedelta(days=1)))
+            cursor = max(cursor, covered_end + timedelta(days=1))
+            if cursor > end:
+                break
+        if cursor <= end:
+            missing.append((cursor, end))
+        return [(gap_start.isoformat(), gap_end.isoformat()) for gap_start, gap_end in missing]
+
+    def store(self, source, table, currency, start_date, end_date, records):
+        """Zapisuje kursy (słownik data -> rekord) i oznacza zakres jako pobrany.
+
+        Dzisiejsze i przyszłe dni nie są oznaczane jako pokryte, dopóki nie pojawi się
+        dla nich notowanie - tabela mogła jeszcze nie zostać opublikowana.
+        """
+        last_final = date.today() - timedelta(days=1)
+        if records:
+            last_final = max(last_final, date.fromisoformat(max(records)))
+        start = date.fromisoformat(start_date)
+        end = min(date.fromisoformat(end_date), last_final)
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO rates VALUES (?, ?, ?, ?, ?)",
+                [(source, table, currency, day, json.dumps(record)) for day, record in records.items()],
+            )
+            if start > end:
+                return
+            # Scalanie nachodzących lub sąsiadujących zakresów pokrycia
+            merged = []
+            for covered_start, covered_end in sorted(self._intervals(source, table, currency) + [(start, end)]):
+                if merged and covered_start <= merged[-1][1] + timedelta(days=1):
+                    merged[-1] = (merged[-1][0], max(merged[-1][1], covered_end))
+                else:
+                    merged.append((covered_start, covered_end))
+            self.conn.execute(
+                "DELETE FROM coverage WHERE source=? AND tbl=? AND currency=?", (source, table, currency)
+            )
+            self.conn.executemany(
+                "INSERT INTO coverage VALUES (?, ?, ?, ?, ?)",
+                [(source, table, currency, s.isoformat(), e.isoformat()) for s, e in merged],
+            )
+
+    def load(self, source, table, currency, start_date, end_date):
+        """Zwraca posortowaną listę par (data, rekord) z podanego zakresu."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT date, record FROM rates WHERE source=? AND tbl=? AND currency=? "
+                "AND date BETWEEN ? AND ? ORDER BY date",
+                (source, table, currency, start_date, end_date),
+            ).fetchall()
+        return [(day, json.loads(record)) for day, record in rows]
+
+    def load_series(self, source, table, currency, start_date, end_date):
+        """Zwraca kursy z zakresu jako RateSeries - wiersze trafiają prosto do kolumn, bez listy rekordów."""
+        dates, columns = [], None
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT date, record FROM rates WHERE source=? AND tbl=? AND currency=? "
+                "AND date BETWEEN ? AND ? ORDER BY date",
+                (source, table, currency, start_date, end_date),
+            )
+            for day, record in rows:
+                value = json.loads(record)
+                if columns is None:
+                    # Rekord NBP: pola mid lub bid/ask; rekord EBC: sam kurs (kolumna "mid")
+                    fields = [field for field in RATE_FIELDS if field in value] if isinstance(value, dict) else None
+                    columns = {field: [] for field in fields or ["mid"]}
+                dates.append(day)
+                if isinstance(value, dict):
+                    for field, values in columns.items():
+                        values.append(value.get(field))
+                else:
+                    columns["mid"].append(value)
+        return RateSeries(dates, columns or {})
+
+    def latest(self, source, table, currency, end_date):
+        """Zwraca ostatnią zapisaną parę (data, rekord) nie późniejszą niż end_date lub None."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT date, record FROM rates WHERE source=? AND tbl=? AND currency=? AND date <= ? "
+                "ORDER BY date DESC LIMIT 1",
+                (source, table, currency, end_date),
+            ).fetchone()
+        return None if row is None else (row[0], json.loads(row[1]))
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,55 @@
+import numpy as np
+
+# Kolumny kursów NBP (tabela A: mid, tabela C: bid/ask); kurs EBC trafia do kolumny "mid"
+RATE_FIELDS = ("mid", "bid", "ask")
+
+
+class RateSeries:
+    """Szereg kursów w układzie kolumnowym: daty (datetime64[D]) i kolumny kursów (float64).
+
+    Odpowiedzi API są parsowane raz, przy tworzeniu szeregu; widok tekstowy, wykres i eksport
+    korzystają z tablic zamiast list słowników. Brakujące wartości są zapisywane jako NaN.
+    """
+
+    __slots__ = ("dates", "columns")
+
+    def __init__(self, dates, columns):
+        self.dates = np.asarray(dates, dtype="datetime64[D]")
+        self.columns = {name: np.asarray(values, dtype=np.float64) for name, values in columns.items()}
+
+    @classmethod
+    def from_nbp(cls, rates):
+        """Tworzy szereg z listy rekordów NBP ({"effectiveDate", "mid"} lub {"effectiveDate", "bid", "ask"})."""
+        fields = [field for field in RATE_FIELDS if rates and field in rates[0]]
+        dates = np.array([rate["effectiveDate"] for rate in rates], dtype="datetime64[D]")
+        return cls(dates, {field: np.array([rate.get(field) for rate in rates], dtype=np.float64) for field in fields})
+
+    @classmethod
+    def from_ecb(cls, daily, currency):
+        """Tworzy szereg z odpowiedzi EBC w postaci {data: {waluta: kurs}}."""
+        dates = np.array(list(daily), dtype="datetime64[D]")
+        return cls(dates, {"mid": np.array([rates.get(currency) for rates in daily.values()], dtype=np.float64)})
+
+    def __len__(self):
+        return len(self.dates)
+
+    def __getitem__(self, field):
+        return self.columns[field]
+
+    def __contains__(self, field):
+        return field in self.columns
+
+    def slice(self, start_date=None, end_date=None):
+        """Zwraca fragment szeregu z zakresu dat (włącznie); daty muszą być posortowane rosnąco."""
+        start = 0 if start_date is None else np.searchsorted(self.dates, np.datetime64(start_date, "D"), "left")
+        end = len(self.dates) if end_date is None else np.searchsorted(self.dates, np.datetime64(end_date, "D"), "right")
+        return RateSeries(self.dates[start:end], {name: values[start:end] for name, values in self.columns.items()})
+
+    def rows(self, *fields):
+        """Zwraca krotki (data RRRR-MM-DD, wartości podanych kolumn) jako typy Pythona - do wyświetlania i eksportu."""
+        fields = fields or tuple(self.columns)
+        return zip(self.dates.astype(str).tolist(), *(self.columns[field].tolist() for field in fields))
+
+    @property
+    def nbytes(self):
+        return self.dates.nbytes + sum(values.nbytes for values in self.columns.values())
@@ -0,0 +1,101 @@
+"""Kolumnowy zapis i odczyt pobranych szeregów kursów.
+
+Katalog zawiera plik manifest.json oraz, dla każdego szeregu, tablice NumPy (.npy):
+daty (datetime64[D]) i kolumny kursów (float64). Odczyt z mmap_mode="r" nie kopiuje danych -
+lata notowań wszystkich walut otwierają się natychmiast, także w innych programach
+(np.load). Opcjonalnie (jeśli zainstalowano pyarrow) ten sam zestaw można zapisać jako Parquet.
+"""
+import json
+import os
+
+import numpy as np
+
+from rate_series import RateSeries
+
+MANIFEST = "manifest.json"
+FORMAT_VERSION = 1
+
+
+def _stem(source, table, currency):
+    return f"{source}-{table}-{currency}"
+
+
+def result_entries(result):
+    """Szeregi z wyniku zapytania (RateResult) jako wpisy do zapisu."""
+    if result.source == "EBC":
+        parts = [("EBC", result.currency)]
+    else:
+        parts = [(table, currency) for table, value in result.tables.items()
+                 for currency in (value if result.bulk else [result.currency])]
+    entries = []
+    for part, currency in parts:
+        series = result.series(part, currency)
+        if series is None or not len(series):
+            continue
+        entries.append({
+            "source": result.source, "table": "" if part == "EBC" else part, "currency": currency,
+            # Zakres pobranych dni - w trybie aktualnym tylko dni obecne w szeregu
+            "start_date": result.start_date or str(series.dates[0]),
+            "end_date": result.end_date or str(series.dates[-1]),
+            "series": series,
+        })
+    return entries
+
+
+def export_series(directory, entries):
+    """Zapisuje szeregi do katalogu (.npy + manifest.json); istniejące wpisy o tym samym kluczu są zastępowane."""
+    os.makedirs(directory, exist_ok=True)
+    manifest = {"version": FORMAT_VERSION, "series": []}
+    manifest_path = os.path.join(directory, MANIFEST)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as file:
+            manifest = json.load(file)
+    index = {_stem(item["source"], item["table"], item["currency"]): item for item in manifest["series"]}
+    for entry in entries:
+        series = entry["series"]
+        stem = _stem(entry["source"], entry["table"], entry["currency"])
+        np.save(os.path.join(directory, f"{stem}.dates.npy"), series.dates)
+        for field, values in series.columns.items():
+            np.save(os.path.join(directory, f"{stem}.{field}.npy"), values)
+        index[stem] = {key: entry[key] for key in ("source", "table", "currency", "start_date", "end_date")}
+        index[stem].update(fields=list(series.columns), rows=len(series))
+    manifest["series"] = list(index.values())
+    with open(manifest_path, "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2)
+    return len(entries)
+
+
+def load_series(directory, mmap=True):
+    """Wczytuje wpisy zapisane przez export_series; tablice są mapowane z dysku (bez kopiowania), gdy mmap=True."""
+    with open(os.path.join(directory, MANIFEST), encoding="utf-8") as file:
+        manifest = json.load(file)
+    if manifest.get("version") != FORMAT_VERSION:
+        raise ValueError(f"nieobsługiwana wersja formatu: {manifest.get('version')}")
+    mode = "r" if mmap else None
+    entries = []
+    for item in manifest["series"]:
+        stem = _stem(item["source"], item["table"], item["currency"])
+        dates = np.load(os.path.join(directory, f"{stem}.dates.npy"), mmap_mode=mode)
+        columns = {field: np.load(os.path.join(directory, f"{stem}.{field}.npy"), mmap_mode=mode)
+                   for field in item["fields"]}
+        entries.append(dict(item, series=RateSeries(dates, columns)))
+    return entries
+
+
+def export_parquet(path, entries):
+    """Zapisuje szeregi jako jeden plik Parquet (kolumny: source, table, currency, date, mid, bid, ask); wymaga pyarrow."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Zapis Parquet wymaga pakietu pyarrow (pip install pyarrow).") from None
+    columns = {name: [] for name in ("source", "table", "currency", "date", "mid", "bid", "ask")}
+    for entry in entries:
+        series = entry["series"]
+        for key in ("source", "table", "currency"):
+            columns[key].append(np.full(len(series), entry[key], dtype=object))
+        columns["date"].append(series.dates)
+        for field in ("mid", "bid", "ask"):
+            columns[field].append(series.columns.get(field, np.full(len(series), np.nan)))
+    table = pa.table({name: np.concatenate(parts) if parts else [] for name, parts in columns.items()})
+    pq.write_table(table, path)
@@ -0,0 +1,127 @@
+import argparse
+import csv
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from rate_cache import DEFAULT_CACHE_PATH
+from rates_core import RateClient, CURRENCIES, SOURCES, RECORD_FIELDS
+from rate_store import result_entries, export_series, export_parquet
+
+
+def parse_range(value):
+    """Zamienia zakres "RRRR-MM-DD:RRRR-MM-DD" na parę dat."""
+    try:
+        start_date, end_date = value.split(":")
+        if datetime.strptime(end_date, "%Y-%m-%d") < datetime.strptime(start_date, "%Y-%m-%d"):
+            raise argparse.ArgumentTypeError("data końcowa nie może być wcześniejsza niż data początkowa")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"nieprawidłowy zakres dat: {value} (oczekiwano RRRR-MM-DD:RRRR-MM-DD)")
+    return start_date, end_date
+
+
+def parse_list(value):
+    return [item.strip().upper() for item in value.split(",") if item.strip()]
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Pobiera kursy walut z NBP i EBC i zapisuje je jako JSON Lines lub CSV.")
+    parser.add_argument("--currencies", type=parse_list, default=CURRENCIES,
+                        help="waluty oddzielone przecinkami (domyślnie: %(default)s)")
+    parser.add_argument("--sources", type=parse_list, default=SOURCES,
+                        help="źródła oddzielone przecinkami: NBP, EBC (domyślnie: oba)")
+    parser.add_argument("--tables", type=parse_list, default=["A", "C"], help="tabele NBP (domyślnie: A,C)")
+    parser.add_argument("--range", dest="ranges", type=parse_range, action="append", default=[],
+                        help="zakres dat RRRR-MM-DD:RRRR-MM-DD (można podać wielokrotnie); bez zakresu - kursy aktualne")
+    parser.add_argument("--bulk", action="store_true",
+                        help="NBP: pobieraj całe tabele (/tables) - jedno zapytanie na tabelę dla wszystkich walut")
+    parser.add_argument("--format", choices=["jsonl", "csv", "npy", "parquet"], default="jsonl",
+                        help="format wyjścia; npy - katalog tablic NumPy (mapowanych z dysku), parquet - wymaga pyarrow")
+    parser.add_argument("--output", "-o", help="plik wynikowy (domyślnie: standardowe wyjście); dla npy - katalog")
+    parser.add_argument("--import-store", metavar="KATALOG",
+                        help="przed pobieraniem wczytaj szeregi zapisane w formacie npy (zapytania o te zakresy bez sieci)")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH, help="plik pamięci podręcznej SQLite")
+    parser.add_argument("--workers", type=int, default=4, help="liczba równoległych zapytań")
+    parser.add_argument("--metrics", help="zapisz pomiary (czasy etapów, opóźnienia dostawców, trafienia cache) do pliku JSON")
+    return parser
+
+
+def iter_queries(args):
+    """Zwraca zapytania (waluta, źródło, data_od, data_do, tryb_zbiorczy) wynikające z argumentów."""
+    for source in args.sources:
+        for start_date, end_date in args.ranges or [(None, None)]:
+            if source == "NBP" and args.bulk:
+                yield None, source, start_date, end_date, True
+                continue
+            for currency in args.currencies:
+                # EBC podaje kursy względem EUR - brak kursu EUR/EUR
+                if source == "EBC" and currency == "EUR":
+                    continue
+                yield currency, source, start_date, end_date, False
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    unknown = [source for source in args.sources if source not in SOURCES]
+    if unknown:
+        print(f"Nieznane źródło danych: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    columnar = args.format in ("npy", "parquet")
+    if columnar and not args.output:
+        print(f"Format {args.format} wymaga podania --output", file=sys.stderr)
+        return 2
+
+    client = RateClient(cache_path=args.cache, currencies=args.currencies)
+    output = sys.stdout
+    entries = []
+    failed = False
+
+    def run(query):
+        currency, source, start_date, end_date, bulk = query
+        return client.load_rates(currency, source, start_date, end_date, tables=args.tables,
+                                 bulk=bulk, currencies=args.currencies)
+
+    try:
+        if args.import_store:
+            client.import_store(args.import_store)
+        if args.output and not columnar:
+            output = open(args.output, "w", newline="", encoding="utf-8")
+        if columnar:
+            write = None
+        elif args.format == "csv":
+            writer = csv.DictWriter(output, fieldnames=RECORD_FIELDS)
+            writer.writeheader()
+            write = writer.writerow
+        else:
+            write = lambda record: output.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        # Zapytania wykonywane równolegle, wyniki zapisywane strumieniowo w kolejności zapytań
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            for result in pool.map(run, iter_queries(args)):
+                if columnar:
+                    entries.extend(result_entries(result))
+                else:
+                    for record in result.records():
+                        write(record)
+                    output.flush()
+                for part, currency, error in result.errors():
+                    failed = True
+                    print(f"{part} {currency}: {error}", file=sys.stderr)
+        if args.format == "npy":
+            export_series(args.output, entries)
+        elif args.format == "parquet":
+            export_parquet(args.output, entries)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        if args.metrics:
+            client.metrics.export(args.metrics)
+        client.metrics.log()
+        client.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
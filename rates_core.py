@@ -0,0 +1,550 @@
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from rate_cache import RateCache, DEFAULT_CACHE_PATH
+from http_pool import SessionPool, DEFAULT_POOL_SIZE, DEFAULT_TIMEOUT
+from ecb_providers import HedgedFetcher
+from resilience import ResiliencePolicy
+from metrics import Metrics
+from rate_series import RateSeries
+from publication import latest_publication
+from json_stream import iter_array, is_large, response_chunks
+
+# Dostępne waluty (na podstawie API NBP i EBC) i źródła danych
+CURRENCIES = ["USD", "EUR", "GBP", "CHF", "JPY", "AUD", "CAD"]
+SOURCES = ["NBP", "EBC"]
+# Pola płaskiego rekordu kursu (eksport JSON Lines/CSV); kurs EBC trafia do pola "mid"
+RECORD_FIELDS = ["source", "table", "currency", "date", "mid", "bid", "ask"]
+
+NBP_API_URL = "https://api.nbp.pl/api/exchangerates"
+# Maksymalna długość zakresu dat w jednym zapytaniu do API NBP
+NBP_MAX_RANGE_DAYS = 93
+# Liczba dni wstecz przeszukiwanych w trybie aktualnym (weekendy i święta bez notowań)
+NBP_LOOKBACK_DAYS = 5
+# Dopisek do danych podanych z pamięci podręcznej, gdy serwis jest niedostępny (otwarty bezpiecznik)
+STALE_NOTE = "Uwaga: serwis niedostępny - dane z pamięci podręcznej (mogą być nieaktualne lub niepełne).\n"
+
+
+def split_range(start_date, end_date, max_days=None):
+    """Dzieli zakres dat (RRRR-MM-DD) na kolejne fragmenty o długości co najwyżej max_days dni."""
+    if max_days is None:
+        return [(start_date, end_date)]
+    start = datetime.strptime(start_date, "%Y-%m-%d")
+    end = datetime.strptime(end_date, "%Y-%m-%d")
+    chunks = []
+    while start <= end:
+        chunk_end = min(start + timedelta(days=max_days - 1), end)
+        chunks.append((start.strftime("%Y-%m-%d"), chunk_end.strftime("%Y-%m-%d")))
+        start = chunk_end + timedelta(days=1)
+    return chunks
+
+
+def to_series(data, part, currency):
+    """Zastępuje listę rekordów w danych (klucz "rates") szeregiem RateSeries (klucz "series") i zwraca szereg.
+
+    Po konwersji dane nie przechowują już słowników z odpowiedzi - tylko tablice kolumnowe.
+    """
+    if "series" not in data:
+        rates = data.pop("rates")
+        if part != "EBC":
+            data["series"] = RateSeries.from_nbp(rates)
+        elif "date" in data:
+            data["series"] = RateSeries.from_ecb({data["date"]: rates}, currency)
+        else:
+            data["series"] = RateSeries.from_ecb(rates, currency)
+    return data["series"]
+
+
+class RateResult:
+    """Wynik jednego zapytania o kursy - współdzielony przez widok tekstowy, wykres i innych odbiorców."""
+    def __init__(self, currency, source, start_date=None, end_date=None, bulk=False):
+        self.currency = currency
+        self.source = source
+        self.start_date = start_date
+        self.end_date = end_date
+        # Tryb zbiorczy: wszystkie waluty z tabel NBP
+        self.bulk = bulk
+        # Tabele NBP: "A"/"C" -> (dane, błąd, data_efektywna), w trybie zbiorczym: waluta -> (dane, błąd, data_efektywna)
+        self.tables = {}
+        # EBC: (dane, błąd)
+        self.ecb = None
+
+    def series(self, part="A", currency=None):
+        """Zwraca kursy części wyniku ("A", "C" lub "EBC") jako RateSeries albo None, jeśli brak danych.
+
+        Dane pobrane z columnar=True zawierają gotowy szereg; lista rekordów (klucz "rates") jest parsowana
+        przy pierwszym użyciu i zastępowana szeregiem - tekst, wykres i eksport dostają ten sam szereg.
+        """
+        currency = currency or self.currency
+        if part == "EBC":
+            data = (self.ecb or (None, None))[0]
+        else:
+            value = self.tables.get(part)
+            if value and self.bulk:
+                value = value.get(currency)
+            data = value[0] if value else None
+        if not data:
+            return None
+        return to_series(data, part, currency)
+
+    def records(self):
+        """Zwraca płaskie rekordy kursów (pola RECORD_FIELDS), np. do eksportu JSON Lines/CSV."""
+        if self.source == "EBC":
+            parts = [("EBC", self.currency)]
+        else:
+            parts = [(table, currency) for table, value in self.tables.items()
+                     for currency in (value if self.bulk else [self.currency])]
+        for part, currency in parts:
+            series = self.series(part, currency)
+            if series is None:
+                continue
+            fields = [field for field in ("mid", "bid", "ask") if field in series]
+            for day, *values in series.rows(*fields):
+                record = {"source": self.source, "table": "" if part == "EBC" else part, "currency": currency,
+                          "date": day, "mid": None, "bid": None, "ask": None}
+                # NaN (brak wartości w odpowiedzi) jest eksportowany jako pusta wartość
+                record.update((field, None if value != value else value) for field, value in zip(fields, values))
+                yield record
+
+    def errors(self):
+        """Zwraca komunikaty błędów w postaci (źródło/tabela, waluta, komunikat)."""
+        if self.source == "EBC":
+            if self.ecb and self.ecb[1]:
+                yield "EBC", self.currency, self.ecb[1]
+            return
+        for table, value in self.tables.items():
+            per_currency = value if self.bulk else {self.currency: value}
+            for currency, (_, error, _) in per_currency.items():
+                if error:
+                    yield f"NBP {table}", currency, error
+
+
+def format_rates(result):
+    """Zwraca wiersze tekstu z kursami jednej waluty."""
+    currency, source = result.currency, result.source
+    start_date, end_date = result.start_date, result.end_date
+    lines = [f"Kursy dla waluty {currency} (źródło: {source})\n\n"]
+
+    if source == "NBP":
+        # Tabela A (kurs średni)
+        data_a, error_a, effective_date = result.tables.get("A", (None, None, None))
+        if "A" not in result.tables:
+            lines.append("NBP Tabela A: pobieranie danych...\n")
+        elif error_a:
+            lines.append(f"NBP Tabela A: {error_a}\n")
+        else:
+            lines.append("NBP Tabela A (kurs średni):\n")
+            rows = result.series("A").rows("mid")
+            if start_date and end_date:
+                lines.extend(f"Data: {day}, Kurs średni: {mid} PLN\n" for day, mid in rows)
+            else:
+                day, mid = next(rows)
+                lines.append(f"Data: {effective_date or day}, Kurs średni: {mid} PLN\n")
+                if effective_date:
+                    lines.append(f"Uwaga: Pobrano kurs z {effective_date} zamiast bieżącego dnia.\n")
+            if data_a.get("stale"):
+                lines.append(STALE_NOTE)
+
+        # Tabela C (kursy kupna i sprzedaży)
+        data_c, error_c, effective_date_c = result.tables.get("C", (None, None, None))
+        if "C" not in result.tables:
+            lines.append("\nNBP Tabela C: pobieranie danych...\n")
+        elif error_c:
+            lines.append(f"NBP Tabela C: {error_c}\n")
+        else:
+            lines.append("\nNBP Tabela C (kursy kupna/sprzedaży):\n")
+            rows = result.series("C").rows("bid", "ask")
+            if start_date and end_date:
+                lines.extend(f"Data: {day}, Kupno: {bid} PLN, Sprzedaż: {ask} PLN\n" for day, bid, ask in rows)
+            else:
+                day, bid, ask = next(rows)
+                lines.append(f"Data: {effective_date_c or day}, Kupno: {bid} PLN, Sprzedaż: {ask} PLN\n")
+                if effective_date_c:
+                    lines.append(f"Uwaga: Pobrano kurs z {effective_date_c} zamiast bieżącego dnia.\n")
+            if data_c.get("stale"):
+                lines.append(STALE_NOTE)
+
+    elif source == "EBC":
+        data, error = result.ecb or (None, None)
+        if result.ecb is None:
+            lines.append("EBC: pobieranie danych...\n")
+        elif error:
+            lines.append(f"EBC: {error}\n")
+            lines.append("Uwaga: API EBC może być niedostępne. Spróbuj źródła NBP lub innego zakresu dat.\n")
+        else:
+            lines.append("EBC (kurs względem EUR):\n")
+            lines.extend(f"Data: {day}, Kurs: {rate} EUR\n" for day, rate in result.series("EBC").rows("mid"))
+            if data.get("stale"):
+                lines.append(STALE_NOTE)
+    return lines
+
+
+def format_bulk_rates(result):
+    """Zwraca wiersze tekstu z kursami wszystkich walut z tabel zbiorczych NBP."""
+    lines = ["Kursy wszystkich walut (źródło: NBP, tabele zbiorcze)\n"]
+    headers = {"A": "NBP Tabela A (kurs średni)", "C": "NBP Tabela C (kursy kupna/sprzedaży)"}
+    for table, header in headers.items():
+        if table not in result.tables:
+            lines.append(f"\n{header}: pobieranie danych...\n")
+            continue
+        lines.append(f"\n{header}:\n")
+        for currency, (data, error, _) in result.tables[table].items():
+            if error:
+                lines.append(f"{currency}: {error}\n")
+                continue
+            if data.get("stale"):
+                lines.append(f"{currency}: {STALE_NOTE}")
+            series = result.series(table, currency)
+            if table == "A":
+                lines.extend(f"{currency} - Data: {day}, Kurs średni: {mid} PLN\n" for day, mid in series.rows("mid"))
+            else:
+                lines.extend(f"{currency} - Data: {day}, Kupno: {bid} PLN, Sprzedaż: {ask} PLN\n"
+                             for day, bid, ask in series.rows("bid", "ask"))
+    return lines
+
+class RateClient:
+    """Klient kursów walut NBP i EBC bez zależności od interfejsu graficznego.
+
+    Łączy pamięć podręczną, pulę sesji HTTP, równoległe pobieranie fragmentów zakresów
+    i dostawców EBC; korzystają z niego zarówno CurrencyApp, jak i wiersz poleceń.
+    """
+    def __init__(self, cache_path=DEFAULT_CACHE_PATH, pool_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_TIMEOUT,
+                 chunk_workers=4, hedge_delay=0.5, currencies=None, resilience=None,
+                 nbp_url=NBP_API_URL, ecb_providers=None, metrics=None):
+        self.currencies = list(currencies or CURRENCIES)
+        # Pomiary: czasy etapów (sieć, dekodowanie JSON, pamięć podręczna), trafienia pamięci podręcznej
+        self.metrics = metrics or Metrics()
+        # Adres API NBP (np. lokalny serwer zastępczy w testach wydajności - patrz stub_server.py)
+        self.nbp_url = nbp_url
+        # Pamięć podręczna kursów (historyczne kursy nie zmieniają się)
+        self.cache = RateCache(cache_path)
+        # Data ostatniego notowania ustalona dla (tabela, waluta, dzień bieżący)
+        self._latest_dates = {}
+        # Współdzielone sesje HTTP (keep-alive) dla wszystkich zapytań do API; każdy host ma własny
+        # limit zapytań, ponawianie po błędach 5xx/429 i bezpiecznik
+        self.http = SessionPool(pool_size=pool_size, timeout=timeout, resilience=resilience or ResiliencePolicy(),
+                                metrics=self.metrics)
+        # Dostawcy kursów EBC odpytywani równolegle (hedging) z kolejnością według statystyk
+        self.ecb = HedgedFetcher(self.http, providers=ecb_providers, hedge_delay=hedge_delay, metrics=self.metrics)
+        # Równoległe pobieranie tabel A i C
+        self.executor = ThreadPoolExecutor(max_workers=4)
+        # Osobna, ograniczona pula na równoległe pobieranie fragmentów długich zakresów
+        self.chunk_executor = ThreadPoolExecutor(max_workers=chunk_workers)
+
+    def _cached_range(self, source, table, currency, start_date, end_date, download, max_days=None, columnar=False):
+        """Zwraca kursy z pamięci podręcznej, pobierając z sieci tylko brakujące dni.
+
+        Luki dłuższe niż max_days są dzielone na fragmenty pobierane równolegle. Wynik to lista par
+        (data, rekord) albo - gdy columnar=True - RateSeries zbudowany bezpośrednio z wierszy bazy.
+        """
+        chunks = [chunk for gap in self.cache.missing_ranges(source, table, currency, start_date, end_date)
+                  for chunk in split_range(*gap, max_days)]
+        self.metrics.count("cache.miss" if chunks else "cache.hit")
+        if len(chunks) == 1:
+            records = download(currency, table, *chunks[0])
+            self.cache.store(source, table, currency, *chunks[0], records)
+        elif chunks:
+            futures = [self.chunk_executor.submit(download, currency, table, *chunk) for chunk in chunks]
+            error = None
+            for chunk, future in zip(chunks, futures):
+                try:
+                    records = future.result()
+                except requests.RequestException as e:
+                    error = error or e
+                    continue
+                self.cache.store(source, table, currency, *chunk, records)
+            if error:
+                raise error
+        with self.metrics.timer("cache"):
+            if columnar:
+                return self.cache.load_series(source, table, currency, start_date, end_date)
+            return self.cache.load(source, table, currency, start_date, end_date)
+
+    def _cached_fallback(self, source, table, currency, start_date=None, end_date=None):
+        """Zwraca dane z pamięci podręcznej (oznaczone jako "stale") na czas niedostępności serwisu lub None."""
+        if start_date and end_date:
+            return self.cache.load(source, table, currency, start_date, end_date) or None
+        latest = self.cache.latest(source, table, currency, datetime.now().strftime("%Y-%m-%d"))
+        return [latest] if latest else None
+
+    def _stale_nbp(self, table, currency, start_date=None, end_date=None):
+        """Wynik get_nbp_rates z pamięci podręcznej, jeśli bezpiecznik NBP jest otwarty, w przeciwnym razie None."""
+        if not self.http.circuit_open(self.nbp_url):
+            return None
+        rates = self._cached_fallback("NBP", table, currency, start_date, end_date)
+        if not rates:
+            return None
+        data = {"table": table, "code": currency, "rates": [rate for _, rate in rates], "stale": True}
+        return data, None, None if start_date and end_date else rates[-1][0]
+
+    @staticmethod
+    def _iter_json_array(response, key=None):
+        """Elementy tablicy z odpowiedzi (całej lub spod klucza key); duże odpowiedzi są dekodowane strumieniowo.
+
+        Niepoprawna odpowiedź (np. strona HTML albo JSON bez klucza key) zgłasza requests.RequestException,
+        tak jak response.json() - błąd trafia do komunikatu zamiast pustego wyniku w pamięci podręcznej.
+        """
+        try:
+            if is_large(response):
+                yield from iter_array(response_chunks(response), key, required=True)
+                return
+            data = response.json()
+            items = data[key] if key is not None else data
+        except (ValueError, KeyError, TypeError) as e:
+            raise requests.exceptions.InvalidJSONError(f"niepoprawna odpowiedź API: {e}", response=response) from e
+        if not isinstance(items, list):
+            raise requests.exceptions.InvalidJSONError("niepoprawna odpowiedź API: oczekiwano tablicy", response=response)
+        yield from items
+
+    @staticmethod
+    def _invalid_record(error, response):
+        """Błąd rekordu bez wymaganego pola (lub o złym typie) - zgłaszany jak niepoprawny JSON, nie jako KeyError."""
+        detail = f"brak pola {error}" if isinstance(error, KeyError) else error
+        return requests.exceptions.InvalidJSONError(f"niepoprawna odpowiedź API: {detail}", response=response)
+
+    def _download_nbp_range(self, currency, table, start_date, end_date):
+        """Pobiera kursy z API NBP i zwraca słownik data -> rekord (pusty przy 404)."""
+        if start_date == end_date:
+            url = f"{self.nbp_url}/rates/{table}/{currency}/{start_date}/?format=json"
+        else:
+            url = f"{self.nbp_url}/rates/{table}/{currency}/{start_date}/{end_date}/?format=json"
+        response = self.http.get(url, stream=True)
+        try:
+            if response.status_code == 404:
+                return {}
+            response.raise_for_status()
+            with self.metrics.timer("decode"):
+                try:
+                    return {rate["effectiveDate"]: rate for rate in self._iter_json_array(response, "rates")}
+                except (KeyError, TypeError) as e:
+                    raise self._invalid_record(e, response) from e
+        finally:
+            response.close()
+
+    def get_nbp_rates(self, currency, table, start_date=None, end_date=None, columnar=False):
+        """Pobiera kursy walut z API NBP dla podanej waluty, tabeli (A lub C) i zakresu dat.
+
+        columnar=True - dane zawierają kursy jako RateSeries (klucz "series") zamiast listy rekordów ("rates").
+        """
+        data, error, effective_date = self._get_nbp_rates(currency, table, start_date, end_date, columnar)
+        if data and columnar:
+            to_series(data, table, currency)
+        return data, error, effective_date
+
+    def _get_nbp_rates(self, currency, table, start_date, end_date, columnar):
+        try:
+            if start_date and end_date:
+                rates = self._cached_range("NBP", table, currency, start_date, end_date, self._download_nbp_range,
+                                           max_days=NBP_MAX_RANGE_DAYS, columnar=columnar)
+                if not len(rates):
+                    return None, "Brak danych dla podanego zakresu lub waluty.", None
+                if columnar:
+                    return {"table": table, "code": currency, "series": rates}, None, None
+                return {"table": table, "code": currency, "rates": [rate for _, rate in rates]}, None, None
+
+            # Tryb aktualny: ostatni kurs z kilku dni przed dniem bieżącym - jedno zapytanie o zakres
+            # zamiast cofania się dzień po dniu (weekendy, święta). Ustalona data jest zapamiętywana na cały dzień.
+            today = datetime.now().strftime("%Y-%m-%d")
+            effective_date = self._latest_dates.get((table, currency, today))
+            if effective_date:
+                self.metrics.count("cache.hit")
+                rates = self.cache.load("NBP", table, currency, effective_date, effective_date)
+            else:
+                lookback_start = (datetime.now() - timedelta(days=NBP_LOOKBACK_DAYS)).strftime("%Y-%m-%d")
+                lookback_end = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+                rates = self._cached_range("NBP", table, currency, lookback_start, lookback_end, self._download_nbp_range)
+            if not rates:
+                return None, f"Brak danych dla podanego zakresu lub waluty (z ostatnich {NBP_LOOKBACK_DAYS} dni).", None
+            effective_date, rate = rates[-1]
+            self._latest_dates[(table, currency, today)] = effective_date
+            return {"table": table, "code": currency, "rates": [rate]}, None, effective_date
+        except requests.RequestException as e:
+            stale = self._stale_nbp(table, currency, start_date, end_date)
+            if stale:
+                return stale
+            return None, f"Błąd podczas pobierania danych z NBP: {e}", None
+
+    def _download_nbp_tables(self, table, start_date, end_date):
+        """Pobiera całe tabele NBP (/tables) i zwraca słownik waluta -> {data: rekord}."""
+        if start_date == end_date:
+            url = f"{self.nbp_url}/tables/{table}/{start_date}/?format=json"
+        else:
+            url = f"{self.nbp_url}/tables/{table}/{start_date}/{end_date}/?format=json"
+        response = self.http.get(url, stream=True)
+        try:
+            if response.status_code == 404:
+                return {}
+            response.raise_for_status()
+            records = {}
+            with self.metrics.timer("decode"):
+                try:
+                    for day in self._iter_json_array(response):
+                        for rate in day["rates"]:
+                            record = {key: value for key, value in rate.items() if key not in ("currency", "code")}
+                            record.update(no=day["no"], effectiveDate=day["effectiveDate"])
+                            records.setdefault(rate["code"], {})[day["effectiveDate"]] = record
+                except (KeyError, TypeError, AttributeError) as e:
+                    raise self._invalid_record(e, response) from e
+            return records
+        finally:
+            response.close()
+
+    def get_nbp_rates_bulk(self, table, start_date=None, end_date=None, currencies=None, columnar=False):
+        """Pobiera kursy wszystkich walut z tabeli NBP - jedno zapytanie /tables na fragment zakresu.
+
+        Zwraca słownik waluta -> (dane, błąd, data_efektywna), jak get_nbp_rates dla pojedynczej waluty
+        (także parametr columnar). W trybie aktualnym zwracany jest ostatni kurs z NBP_LOOKBACK_DAYS dni
+        poprzedzających dzień bieżący.
+        """
+        results = self._get_nbp_rates_bulk(table, start_date, end_date, currencies, columnar)
+        if columnar:
+            for currency, (data, _, _) in results.items():
+                if data:
+                    to_series(data, table, currency)
+        return results
+
+    def _get_nbp_rates_bulk(self, table, start_date, end_date, currencies, columnar):
+        currencies = currencies or self.currencies
+        current = not (start_date and end_date)
+        if current:
+            start_date = (datetime.now() - timedelta(days=NBP_LOOKBACK_DAYS)).strftime("%Y-%m-%d")
+            end_date = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+        try:
+            gaps = [gap for currency in currencies
+                    for gap in self.cache.missing_ranges("NBP", table, currency, start_date, end_date)]
+            self.metrics.count("cache.miss" if gaps else "cache.hit")
+            if gaps:
+                chunks = split_range(min(start for start, _ in gaps), max(end for _, end in gaps), NBP_MAX_RANGE_DAYS)
+                futures = [self.chunk_executor.submit(self._download_nbp_tables, table, *chunk) for chunk in chunks]
+                for chunk, future in zip(chunks, futures):
+                    records = future.result()
+                    # Tabela zawiera wszystkie waluty - brak waluty w odpowiedzi też jest informacją
+                    for currency in set(currencies) | set(records):
+                        self.cache.store("NBP", table, currency, *chunk, records.get(currency, {}))
+        except requests.RequestException as e:
+            results = {}
+            for currency in currencies:
+                results[currency] = (self._stale_nbp(table, currency, *((None, None) if current else (start_date, end_date)))
+                                     or (None, f"Błąd podczas pobierania danych z NBP: {e}", None))
+            return results
+
+        results = {}
+        for currency in currencies:
+            if columnar and not current:
+                series = self.cache.load_series("NBP", table, currency, start_date, end_date)
+                results[currency] = (({"table": table, "code": currency, "series": series}, None, None) if len(series)
+                                     else (None, "Brak danych dla podanego zakresu lub waluty.", None))
+                continue
+            rates = [rate for _, rate in self.cache.load("NBP", table, currency, start_date, end_date)]
+            if not rates:
+                results[currency] = (None, "Brak danych dla podanego zakresu lub waluty.", None)
+            elif current:
+                results[currency] = ({"table": table, "code": currency, "rates": rates[-1:]}, None, rates[-1]["effectiveDate"])
+            else:
+                results[currency] = ({"table": table, "code": currency, "rates": rates}, None, None)
+        return results
+
+    def _download_ecb(self, currency, start_date=None, end_date=None):
+        """Pobiera kursy z API opartego na danych EBC (frankfurter.app i exchangerate.host, odpytywane równolegle z opóźnieniem)."""
+        return self.ecb.fetch(currency, start_date, end_date)
+
+    def _stale_ecb(self, currency, start_date=None, end_date=None):
+        """Wynik get_ecb_rates z pamięci podręcznej, jeśli bezpieczniki wszystkich dostawców są otwarte, w przeciwnym razie None."""
+        if not all(self.http.circuit_open(provider.base_url) for provider in self.ecb.providers):
+            return None
+        rates = self._cached_fallback("EBC", "", currency, start_date, end_date)
+        if not rates:
+            return None
+        if start_date and end_date:
+            return {"base": "EUR", "start_date": start_date, "end_date": end_date, "stale": True,
+                    "rates": {day: {currency: rate} for day, rate in rates}}, None
+        day, rate = rates[-1]
+        return {"base": "EUR", "date": day, "rates": {currency: rate}, "stale": True}, None
+
+    def get_ecb_rates(self, currency, start_date=None, end_date=None, columnar=False):
+        """Pobiera kursy walut z API opartego na danych EBC; zakresy dat są obsługiwane przez pamięć podręczną.
+
+        columnar=True - dane zawierają kursy jako RateSeries (klucz "series") zamiast słownika "rates".
+        """
+        data, error = self._get_ecb_rates(currency, start_date, end_date, columnar)
+        if data and columnar:
+            to_series(data, "EBC", currency)
+        return data, error
+
+    def _get_ecb_rates(self, currency, start_date, end_date, columnar):
+        if not (start_date and end_date):
+            # Kurs z ostatniej opublikowanej tabeli (np. zapisany przez prefetch.PrefetchScheduler) - bez sieci
+            latest = self.cache.latest("EBC", "", currency, datetime.now().strftime("%Y-%m-%d"))
+            if latest and latest[0] >= latest_publication("EBC", ""):
+                self.metrics.count("cache.hit")
+                return {"base": "EUR", "date": latest[0], "rates": {currency: latest[1]}}, None
+            data, error = self._download_ecb(currency)
+            if error:
+                return self._stale_ecb(currency) or (data, error)
+            self.cache.store("EBC", "", currency, data["date"], data["date"], {data["date"]: data["rates"][currency]})
+            return data, error
+
+        def download(currency, table, gap_start, gap_end):
+            data, error = self._download_ecb(currency, gap_start, gap_end)
+            if error:
+                raise requests.RequestException(error)
+            return {day: rates[currency] for day, rates in data.get("rates", {}).items() if currency in rates}
+
+        try:
+            rates = self._cached_range("EBC", "", currency, start_date, end_date, download, columnar=columnar)
+        except requests.RequestException as e:
+            return self._stale_ecb(currency, start_date, end_date) or (None, str(e))
+        if columnar:
+            return {"base": "EUR", "start_date": start_date, "end_date": end_date, "series": rates}, None
+        return {"base": "EUR", "start_date": start_date, "end_date": end_date,
+                "rates": {day: {currency: rate} for day, rate in rates}}, None
+
+    def load_rates(self, currency, source, start_date=None, end_date=None, tables=("A", "C"), bulk=False, currencies=None):
+        """Pobiera kursy raz dla całego zapytania; tabele NBP są pobierane równolegle.
+
+        W trybie zbiorczym (bulk) pobierane są wszystkie waluty z tabel NBP (parametr currency jest pomijany).
+        """
+        with self.metrics.timer("query"):
+            return self._load_rates(currency, source, start_date, end_date, tables, bulk, currencies)
+
+    def _load_rates(self, currency, source, start_date, end_date, tables, bulk, currencies):
+        # Wynik przechowuje kursy wyłącznie w postaci kolumnowej (RateSeries)
+        result = RateResult(currency, source, start_date, end_date, bulk=bulk)
+        if bulk:
+            futures = {table: self.executor.submit(self.get_nbp_rates_bulk, table, start_date, end_date, currencies,
+                                                   columnar=True) for table in tables}
+            for table, future in futures.items():
+                result.tables[table] = future.result()
+        elif source == "NBP":
+            futures = {table: self.executor.submit(self.get_nbp_rates, currency, table, start_date, end_date,
+                                                   columnar=True) for table in tables}
+            for table, future in futures.items():
+                result.tables[table] = future.result()
+        elif source == "EBC":
+            result.ecb = self.get_ecb_rates(currency, start_date, end_date, columnar=True)
+        return result
+
+    def import_store(self, directory):
+        """Wczytuje szeregi zapisane przez rate_store.export_series do pamięci podręcznej.
+
+        Zakresy z manifestu są oznaczane jako pobrane, więc kolejne zapytania o nie nie korzystają z sieci.
+        Zwraca liczbę zaimportowanych szeregów.
+        """
+        from rate_store import load_series
+        entries = load_series(directory)
+        for entry in entries:
+            series = entry["series"]
+            fields = list(series.columns)
+            if entry["source"] == "EBC":
+                records = {day: rate for day, rate in series.rows("mid")}
+            else:
+                records = {day: dict(zip(fields, values), effectiveDate=day) for day, *values in series.rows(*fields)}
+            self.cache.store(entry["source"], entry["table"], entry["currency"], entry["start_date"], entry["end_date"], records)
+        return len(entries)
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.chunk_executor.shutdown(wait=False, cancel_futures=True)
+        self.ecb.close()
+        self.http.close()
+        self.cache.close()
@@ -0,0 +1,171 @@
+import random
+import threading
+import time
+
+import requests
+
+# Kody odpowiedzi, po których zapytanie jest ponawiane (przeciążenie lub chwilowa awaria serwera)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class CircuitOpenError(requests.RequestException):
+    """Zapytanie odrzucone bez wysyłania - obwód dla hosta jest otwarty po serii błędów."""
+
+
+class TokenBucket:
+    """Ogranicznik liczby zapytań (token bucket): średnio rate zapytań na sekundę, chwilowo do capacity."""
+
+    def __init__(self, rate, capacity, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = capacity
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Pobiera jeden żeton, czekając, aż będzie dostępny."""
+        while True:
+            with self.lock:
+                now = self.clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            self.sleep(wait)
+
+
+class RetryPolicy:
+    """Ponawianie zapytań z wykładniczym czasem oczekiwania i losowym rozrzutem (full jitter)."""
+
+    def __init__(self, retries=3, backoff=0.5, max_backoff=8.0, statuses=RETRY_STATUSES, rng=random.random):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = statuses
+        self.rng = rng
+
+    def delay(self, attempt, retry_after=None):
+        """Czas oczekiwania przed ponowieniem numer attempt (od 0); nagłówek Retry-After jest respektowany."""
+        delay = self.rng() * min(self.max_backoff, self.backoff * 2 ** attempt)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_backoff))
+        return delay
+
+
+class CircuitBreaker:
+    """Bezpiecznik: po failure_threshold kolejnych błędach odrzuca zapytania przez reset_timeout sekund.
+
+    Po tym czasie przepuszcza jedno zapytanie próbne - sukces zamyka obwód, błąd otwiera go ponownie.
+    Jeśli wynik próby nie zostanie zgłoszony w ciągu reset_timeout, przepuszczana jest kolejna próba.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.lock = threading.Lock()
+
+    def is_open(self):
+        """Czy zapytania są obecnie odrzucane (bez zmiany stanu)."""
+        with self.lock:
+            if self.state == self.CLOSED:
+                return False
+            return self.clock() - self.opened_at < self.reset_timeout
+
+    def before_request(self):
+        """Zgłasza CircuitOpenError, jeśli zapytanie nie może zostać wysłane; zwraca True dla zapytania próbnego."""
+        with self.lock:
+            if self.state == self.CLOSED:
+                return False
+            if self.clock() - self.opened_at >= self.reset_timeout:
+                # opened_at liczy teraz czas trwania próby
+                self.state = self.HALF_OPEN
+                self.opened_at = self.clock()
+                return True
+            raise CircuitOpenError("usługa chwilowo niedostępna (zbyt wiele błędów), zapytanie wstrzymane")
+
+    def record_success(self):
+        with self.lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+
+
+class HostGuard:
+    """Ochrona zapytań do jednego hosta: limit zapytań, ponawianie i bezpiecznik."""
+
+    def __init__(self, bucket, retry, breaker, sleep=time.sleep):
+        self.bucket = bucket
+        self.retry = retry
+        self.breaker = breaker
+        self.sleep = sleep
+
+    def call(self, request):
+        """Wykonuje request() (zwracające odpowiedź HTTP) z ochroną; odpowiedź z błędem 5xx/429 jest zwracana po wyczerpaniu prób."""
+        attempt = 0
+        while True:
+            probe = self.breaker.before_request()
+            self.bucket.acquire()
+            try:
+                response = request()
+            except requests.RequestException:
+                self.breaker.record_failure()
+                raise
+            if response.status_code not in self.retry.statuses:
+                self.breaker.record_success()
+                return response
+            # Zapytanie próbne nie jest ponawiane - błąd od razu ponownie otwiera obwód
+            if probe or attempt >= self.retry.retries:
+                self.breaker.record_failure()
+                return response
+            delay = self.retry.delay(attempt, _retry_after(response))
+            response.close()  # Zwolnienie połączenia (odpowiedzi strumieniowe) przed ponowieniem
+            self.sleep(delay)
+            attempt += 1
+
+
+def _retry_after(response):
+    """Odczytuje nagłówek Retry-After (w sekundach) lub zwraca None."""
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class ResiliencePolicy:
+    """Ustawienia ochrony zapytań; tworzy osobny HostGuard dla każdego hosta."""
+
+    def __init__(self, rate=10.0, burst=20, retries=3, backoff=0.5, max_backoff=8.0,
+                 failure_threshold=5, reset_timeout=30.0, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.burst = burst
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.sleep = sleep
+
+    def guard(self):
+        return HostGuard(
+            TokenBucket(self.rate, self.burst, clock=self.clock, sleep=self.sleep),
+            RetryPolicy(self.retries, self.backoff, self.max_backoff),
+            CircuitBreaker(self.failure_threshold, self.reset_timeout, clock=self.clock),
+            sleep=self.sleep,
+        )
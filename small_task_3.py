@@ -4,23 +4,40 @@ from tkinter import ttk, messagebox
 from tkcalendar import DateEntry
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-
-#test function
-def filter_and_group(df, date_from, date_to):
-    df_filtered = df[(df["date"] >= date_from) & (df["date"] <= date_to)]
-    return df_filtered.groupby("date")["value"].mean().reset_index()
-
-# upload data
-df_temp = pd.read_csv("temperatura.csv", encoding="utf-8")
-df_rain = pd.read_csv("opady.csv", encoding="utf-8")
-
-df_temp["timestamp"] = pd.to_datetime(df_temp["timestamp"])
-df_temp["date"] = df_temp["timestamp"].dt.date
-df_temp["value"] = df_temp["medium"]
-
-df_rain["timestamp"] = pd.to_datetime(df_rain["timestamp"])
-df_rain["date"] = df_rain["timestamp"].dt.date
-df_rain["value"] = df_rain["high"]
+from weather_data import load_station, DailyIndex, filter_and_group  # filter_and_group - funkcja testowana
+
+# upload data (leniwie - dopiero przy pierwszym użyciu, z kolumnowej pamięci podręcznej)
+DATA_FILES = {
+    "Temperatura": ("temperatura.csv", "medium"),
+    "Osady": ("opady.csv", "high"),
+}
+_frames = {}
+_indexes = {}
+
+def load_frame(data_type):
+    """Zwraca DataFrame (timestamp, date, value) dla typu danych; plik jest wczytywany raz."""
+    if data_type not in _frames:
+        path, value_column = DATA_FILES[data_type]
+        df = load_station(path).frame(value_column)
+        df["date"] = df["timestamp"].dt.date
+        _frames[data_type] = df
+    return _frames[data_type]
+
+def load_index(data_type):
+    """Zwraca dzienny indeks agregatów (DailyIndex) dla typu danych; budowany raz, przy pierwszym użyciu."""
+    if data_type not in _indexes:
+        path, value_column = DATA_FILES[data_type]
+        data = load_station(path)
+        _indexes[data_type] = DailyIndex.build(data.timestamps, data[value_column])
+    return _indexes[data_type]
+
+def __getattr__(name):
+    # Zgodność wsteczna: df_temp i df_rain są tworzone przy pierwszym odwołaniu
+    if name == "df_temp":
+        return load_frame("Temperatura")
+    if name == "df_rain":
+        return load_frame("Osady")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # GUI
 root = tk.Tk()
@@ -64,20 +81,21 @@ def plot_data():
         return
 
     if selected_type.get() == "Temperatura":
-        df = df_temp.copy()
+        index = load_index("Temperatura")
         y_label = "Temperatura (°C)"
         filename = "srednia_temperatura"
     else:
-        df = df_rain.copy()
+        index = load_index("Osady")
         y_label = "Osady (mm)"
         filename = "srednie_opady"
 
-    df_filtered = df[(df["date"] >= date_from) & (df["date"] <= date_to)]
-    if df_filtered.empty:
+    # Średnie dzienne z indeksu - wyszukanie granic zakresu, bez przeglądania pomiarów godzinowych
+    days, means = index.daily_means(date_from, date_to)
+    if not len(days):
         messagebox.showwarning("Nie ma danych", "Nie ma danych w tym zakresie.")
         return
 
-    df_grouped = df_filtered.groupby("date")["value"].mean().reset_index()
+    df_grouped = pd.DataFrame({"date": days.astype(object), "value": means})
 
     fig, ax = plt.subplots(figsize=(10, 5))
     ax.plot(df_grouped["date"], df_grouped["value"], marker="o", linestyle="-", color="blue")
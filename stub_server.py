@@ -0,0 +1,215 @@
+"""Lokalny serwer zastępczy API kursów walut (NBP, frankfurter.app, exchangerate.host).
+
+Odpowiedzi mają kształt odpowiedzi prawdziwych API, a kursy są generowane deterministycznie
+dla dni roboczych. Opóźnienie, odsetek błędów i rozmiar odpowiedzi są konfigurowalne, co
+pozwala mierzyć zachowanie klienta (rates_core.RateClient) bez dostępu do sieci.
+"""
+import json
+import math
+import random
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+# Kursy bazowe w PLN (do generowania danych); kurs względem EUR wynika z kursu EUR w PLN
+BASE_RATES = {"USD": 3.95, "EUR": 4.30, "GBP": 5.05, "CHF": 4.45, "JPY": 0.027, "AUD": 2.60, "CAD": 2.90,
+              "HUF": 0.011, "CZK": 0.17, "NOK": 0.37, "SEK": 0.38, "DKK": 0.58}
+NAMES = {"USD": "dolar amerykański", "EUR": "euro", "GBP": "funt szterling", "CHF": "frank szwajcarski",
+         "JPY": "jen (Japonia)", "AUD": "dolar australijski", "CAD": "dolar kanadyjski", "HUF": "forint (Węgry)",
+         "CZK": "korona czeska", "NOK": "korona norweska", "SEK": "korona szwedzka", "DKK": "korona duńska"}
+# Limit długości zakresu w API NBP
+NBP_MAX_RANGE_DAYS = 93
+
+
+def mid_rate(currency, day):
+    """Deterministyczny kurs średni waluty w PLN dla podanego dnia."""
+    ordinal = day.toordinal()
+    return round(BASE_RATES[currency] * (1 + 0.05 * math.sin(ordinal / 30 + len(currency) + ord(currency[0]))), 4)
+
+
+def business_days(start, end):
+    day = start
+    while day <= end:
+        if day.weekday() < 5:
+            yield day
+        day += timedelta(days=1)
+
+
+def last_business_day(today=None):
+    day = today or date.today()
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return day
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Nagłówki i treść są wysyłane osobno - bez tego algorytm Nagle opóźnia odpowiedzi keep-alive o ~40 ms
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        server.count_request()
+        if server.latency:
+            time.sleep(server.latency)
+        if server.error_rate and server.rng() < server.error_rate:
+            return self.send_json(503, {"error": "Service Unavailable"})
+        parts = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        segments = [segment for segment in parts.path.split("/") if segment]
+        try:
+            if segments[:2] == ["api", "exchangerates"]:
+                status, payload = self.nbp(segments[2:])
+            else:
+                status, payload = self.ecb(segments, query)
+        except (ValueError, KeyError, IndexError):
+            status, payload = 400, {"error": "Bad Request"}
+        self.send_json(status, payload)
+
+    def pad(self, record):
+        if self.server.payload_size:
+            record["_pad"] = "x" * self.server.payload_size
+        return record
+
+    def nbp_range(self, args):
+        """Zakres dat z segmentów adresu NBP: brak (kurs aktualny), jedna data lub para dat."""
+        if not args:
+            day = last_business_day()
+            return day, day
+        start = date.fromisoformat(args[0])
+        end = date.fromisoformat(args[1]) if len(args) > 1 else start
+        if (end - start).days + 1 > NBP_MAX_RANGE_DAYS or end < start:
+            raise ValueError("przekroczony limit zakresu")
+        return start, end
+
+    def nbp_rate(self, table, currency, day):
+        mid = mid_rate(currency, day)
+        if table == "C":
+            return {"bid": round(mid * 0.99, 4), "ask": round(mid * 1.01, 4)}
+        return {"mid": mid}
+
+    def nbp(self, segments):
+        kind, table = segments[0], segments[1].upper()
+        if kind == "rates":
+            currency = segments[2].upper()
+            if currency not in BASE_RATES:
+                return 404, None
+            start, end = self.nbp_range(segments[3:])
+            rates = [self.pad({"no": f"{day.timetuple().tm_yday:03d}/{table}/NBP/{day.year}",
+                               "effectiveDate": day.isoformat(), **self.nbp_rate(table, currency, day)})
+                     for day in business_days(start, end)]
+            if not rates:
+                return 404, None
+            return 200, {"table": table, "currency": NAMES[currency], "code": currency, "rates": rates}
+        if kind == "tables":
+            start, end = self.nbp_range(segments[2:])
+            tables = [{"table": table, "no": f"{day.timetuple().tm_yday:03d}/{table}/NBP/{day.year}",
+                       "effectiveDate": day.isoformat(),
+                       "rates": [self.pad({"currency": NAMES[currency], "code": currency,
+                                           **self.nbp_rate(table, currency, day)}) for currency in BASE_RATES]}
+                      for day in business_days(start, end)]
+            if not tables:
+                return 404, None
+            return 200, tables
+        return 404, None
+
+    def ecb(self, segments, query):
+        symbols = (query.get("to") or query.get("symbols") or ",".join(BASE_RATES)).upper().split(",")
+        currencies = [currency for currency in symbols if currency in BASE_RATES and currency != "EUR"]
+
+        def rates(day):
+            return {currency: round(mid_rate("EUR", day) / mid_rate(currency, day), 4) for currency in currencies}
+
+        if segments == ["latest"]:
+            day = last_business_day()
+            return 200, {"amount": 1.0, "base": "EUR", "date": day.isoformat(), "rates": rates(day)}
+        if segments == ["timeseries"]:
+            start, end = date.fromisoformat(query["start_date"]), date.fromisoformat(query["end_date"])
+        elif len(segments) == 1 and ".." in segments[0]:
+            start, end = (date.fromisoformat(value) for value in segments[0].split(".."))
+        else:
+            return 404, None
+        return 200, {"amount": 1.0, "base": "EUR", "start_date": start.isoformat(), "end_date": end.isoformat(),
+                     "rates": {day.isoformat(): self.pad(rates(day)) for day in business_days(start, end)}}
+
+
+class StubServer(ThreadingHTTPServer):
+    """Serwer zastępczy uruchamiany w wątku w tle.
+
+    latency - opóźnienie każdej odpowiedzi w sekundach, error_rate - odsetek odpowiedzi 503,
+    payload_size - liczba dodatkowych bajtów w każdym rekordzie kursu.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, error_rate=0.0, payload_size=0, seed=None):
+        super().__init__((host, port), StubHandler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.payload_size = payload_size
+        self.rng = random.Random(seed).random
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count_request(self):
+        with self.lock:
+            self.requests += 1
+
+    def start(self):
+        self.thread = threading.Thread(target=self.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def stub_client_options(nbp, frankfurter, exchangerate):
+    """Argumenty RateClient kierujące zapytania do serwerów zastępczych."""
+    from ecb_providers import FrankfurterProvider, ExchangeRateHostProvider
+    return {
+        "nbp_url": f"{nbp.url}/api/exchangerates",
+        "ecb_providers": [FrankfurterProvider(frankfurter.url), ExchangeRateHostProvider(exchangerate.url)],
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Lokalny serwer zastępczy API NBP i EBC.")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0, help="opóźnienie odpowiedzi w sekundach")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="odsetek odpowiedzi 503 (0-1)")
+    parser.add_argument("--payload-size", type=int, default=0, help="dodatkowe bajty w każdym rekordzie")
+    args = parser.parse_args()
+    server = StubServer(port=args.port, latency=args.latency, error_rate=args.error_rate, payload_size=args.payload_size)
+    print(f"Serwer zastępczy: {server.url} (NBP: {server.url}/api/exchangerates)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
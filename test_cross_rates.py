@@ -0,0 +1,85 @@
+import io
+import unittest
+from contextlib import redirect_stdout, redirect_stderr
+from unittest.mock import patch
+import numpy as np
+import requests
+from rate_series import RateSeries
+from cross_rates import CrossRates, align, discrepancy, load_cross_rates, write_matrix_csv, main
+from rates_core import RateClient
+from stub_server import StubServer, stub_client_options
+
+class TestCrossRates(unittest.TestCase):
+    def setUp(self):
+        self.nbp = CrossRates.from_nbp({
+            "USD": RateSeries(["2025-06-02", "2025-06-03"], {"mid": [4.0, 3.8]}),
+            "EUR": RateSeries(["2025-06-02", "2025-06-03"], {"mid": [4.4, 4.4]}),
+            "GBP": RateSeries(["2025-06-03"], {"mid": [5.0]}),
+        })
+
+    def test_align_fills_missing_days(self):
+        dates, currencies, values = align({"A": RateSeries(["2025-06-03"], {"mid": [1.0]}),
+                                           "B": RateSeries(["2025-06-02", "2025-06-03"], {"mid": [2.0, 3.0]})})
+        self.assertEqual(dates.astype(str).tolist(), ["2025-06-02", "2025-06-03"])
+        self.assertTrue(np.isnan(values[0, 0]))
+        self.assertEqual(values[1].tolist(), [1.0, 3.0])
+
+    def test_matrix(self):
+        self.assertEqual(self.nbp.currencies, ["PLN", "USD", "EUR", "GBP"])
+        matrices = self.nbp.matrix()
+        self.assertEqual(matrices.shape, (2, 4, 4))
+        day = self.nbp.matrix("2025-06-03")
+        self.assertAlmostEqual(day[1, 0], 3.8)                # USD/PLN
+        self.assertAlmostEqual(day[2, 1], 4.4 / 3.8)          # EUR/USD
+        np.testing.assert_allclose(day * day.T, np.ones((4, 4)))
+        self.assertTrue(np.isnan(matrices[0, 3, 1]))          # brak GBP 2025-06-02
+        with self.assertRaises(KeyError):
+            self.nbp.matrix("2025-06-04")
+
+    def test_ecb_and_discrepancy(self):
+        ecb = CrossRates.from_ecb({"USD": RateSeries(["2025-06-03", "2025-06-04"], {"mid": [1.1, 1.2]})})
+        self.assertEqual(ecb.currencies, ["EUR", "USD"])
+        self.assertAlmostEqual(ecb.rate("EUR", "USD")[0], 1.1)
+        dates, currencies, diff = discrepancy(self.nbp, ecb)
+        self.assertEqual(dates.astype(str).tolist(), ["2025-06-03"])
+        self.assertEqual(currencies, ["USD", "EUR"])
+        # NBP: EUR/USD = 4.4/3.8, EBC: 1.1
+        self.assertAlmostEqual(diff[0, 1, 0], (4.4 / 3.8) / 1.1 - 1)
+
+    def test_write_csv(self):
+        output = io.StringIO()
+        ecb = CrossRates.from_ecb({"USD": RateSeries(["2025-06-03"], {"mid": [1.25]})})
+        write_matrix_csv(ecb.dates, ecb.currencies, ecb.matrix(), output)
+        self.assertEqual(output.getvalue().splitlines(), [
+            "date,currency,EUR,USD", "2025-06-03,EUR,1,1.25", "2025-06-03,USD,0.8,1"])
+
+class TestLoadCrossRates(unittest.TestCase):
+    def test_stub_sources_agree(self):
+        """Test na serwerze zastępczym - kursy EBC są tam wyliczane z kursów PLN, więc rozbieżność jest bliska zeru."""
+        servers = [StubServer(seed=0).start() for _ in range(3)]
+        client = RateClient(cache_path=":memory:", currencies=["USD", "EUR", "GBP"], **stub_client_options(*servers))
+        try:
+            nbp, ecb, errors = load_cross_rates(client, "2024-06-03", "2024-06-14")
+        finally:
+            client.close()
+            for server in servers:
+                server.stop()
+        self.assertEqual(errors, [])
+        self.assertEqual(nbp.matrix().shape, (10, 4, 4))
+        _, currencies, diff = discrepancy(nbp, ecb)
+        self.assertEqual(currencies, ["USD", "EUR", "GBP"])
+        self.assertLess(np.nanmax(np.abs(diff)), 1e-3)
+
+    @patch('requests.Session.get', side_effect=requests.ConnectionError("brak połączenia"))
+    def test_cli_reports_errors(self, mock_get):
+        """Test niedostępnych API - błędy na stderr i kod wyjścia różny od zera zamiast samego nagłówka."""
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            code = main(["2024-06-03:2024-06-14", "--currencies", "USD,EUR", "--cache", ":memory:"])
+        self.assertEqual(code, 1)
+        self.assertEqual(stdout.getvalue().splitlines(), ["date,currency,PLN"])
+        self.assertIn("NBP A USD: Błąd podczas pobierania danych z NBP", stderr.getvalue())
+        self.assertIn("EBC USD: Błąd podczas pobierania danych z EBC", stderr.getvalue())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+import requests
+from ecb_providers import HedgedFetcher, FrankfurterProvider, ExchangeRateHostProvider
+
+def ok_response(data):
+    return MagicMock(status_code=200, json=lambda: data)
+
+class TestHedgedFetcher(unittest.TestCase):
+    def setUp(self):
+        self.http = MagicMock()
+        self.fetcher = HedgedFetcher(self.http, hedge_delay=0.05)
+        self.addCleanup(self.fetcher.close)
+
+    def test_first_provider_success(self):
+        self.http.get.return_value = ok_response({"date": "2025-06-02", "rates": {"USD": 1.08}})
+        data, error = self.fetcher.fetch("USD")
+        self.assertIsNone(error)
+        self.assertEqual(data["rates"]["USD"], 1.08)
+        self.http.get.assert_called_once_with("https://api.frankfurter.app/latest?to=USD")
+
+    def test_invalid_payload_falls_back(self):
+        def get(url):
+            if "frankfurter" in url:
+                return ok_response({"success": False, "error": {"info": "brak klucza"}})
+            return ok_response({"date": "2025-06-02", "rates": {"USD": 1.09}})
+        self.http.get.side_effect = get
+        data, error = self.fetcher.fetch("USD")
+        self.assertIsNone(error)
+        self.assertEqual(data["rates"]["USD"], 1.09)
+
+    def test_slow_provider_is_hedged(self):
+        release = threading.Event()
+        def get(url):
+            if "frankfurter" in url:
+                release.wait(2)
+                return ok_response({"date": "2025-06-02", "rates": {"USD": 1.08}})
+            return ok_response({"date": "2025-06-02", "rates": {"USD": 1.09}})
+        self.http.get.side_effect = get
+        data, error = self.fetcher.fetch("USD")
+        release.set()
+        self.assertEqual(data["rates"]["USD"], 1.09)
+
+    def test_hedges_not_queued_behind_slow_requests(self):
+        """Test wielu równoległych zapytań przy wolnym dostawcy - zapytania zapasowe nie czekają na wolne wątki."""
+        release = threading.Event()
+        def get(url):
+            if "frankfurter" in url:
+                release.wait(5)
+                return ok_response({"date": "2025-06-02", "rates": {"USD": 1.08}})
+            return ok_response({"date": "2025-06-02", "rates": {"USD": 1.09}})
+        self.http.get.side_effect = get
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda _: self.fetcher.fetch("USD"), range(8)))
+        elapsed = time.perf_counter() - started
+        release.set()
+        self.assertEqual([data["rates"]["USD"] for data, _ in results], [1.09] * 8)
+        self.assertLess(elapsed, 2)
+
+    def test_all_fail(self):
+        self.http.get.side_effect = requests.RequestException("timeout")
+        data, error = self.fetcher.fetch("USD", "2025-06-01", "2025-06-05")
+        self.assertIsNone(data)
+        self.assertEqual(error, "Błąd podczas pobierania danych z EBC: timeout (frankfurter.app) i timeout (exchangerate.host)")
+
+    def test_failing_provider_is_tried_last(self):
+        def get(url):
+            if "frankfurter" in url:
+                raise requests.RequestException("błąd")
+            return ok_response({"date": "2025-06-02", "rates": {"USD": 1.09}})
+        self.http.get.side_effect = get
+        self.fetcher.fetch("USD")
+        self.assertIsInstance(self.fetcher.ordered_providers()[0], ExchangeRateHostProvider)
+        stats = self.fetcher.stats_snapshot()
+        self.assertEqual(stats["frankfurter.app"]["errors"], 1)
+        self.assertEqual(stats["exchangerate.host"]["requests"], 1)
+
+    def test_close_shuts_down_executors(self):
+        self.fetcher.close()
+        for executor in self.fetcher.executors.values():
+            with self.assertRaises(RuntimeError):
+                executor.submit(time.sleep, 0)
+
+    def test_provider_urls(self):
+        self.assertEqual(FrankfurterProvider().url("USD", "2025-06-01", "2025-06-05"),
+                         "https://api.frankfurter.app/2025-06-01..2025-06-05?to=USD")
+        self.assertEqual(ExchangeRateHostProvider().url("USD"),
+                         "https://api.exchangerate.host/latest?base=EUR&symbols=USD")
+
+if __name__ == "__main__":
+    unittest.main()
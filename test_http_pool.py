@@ -0,0 +1,35 @@
+import unittest
+from unittest.mock import patch
+from http_pool import SessionPool, TimeoutHTTPAdapter
+
+class TestSessionPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = SessionPool(pool_size=4, timeout=(1, 2))
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_one_session_per_host(self):
+        first = self.pool.session("https://api.nbp.pl/api/exchangerates/rates/A/USD/?format=json")
+        second = self.pool.session("https://api.nbp.pl/api/exchangerates/tables/A/?format=json")
+        other = self.pool.session("https://api.frankfurter.app/latest?to=USD")
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+
+    def test_adapter_configuration(self):
+        session = self.pool.session("https://api.nbp.pl/api/")
+        adapter = session.get_adapter("https://api.nbp.pl/api/")
+        self.assertIsInstance(adapter, TimeoutHTTPAdapter)
+        self.assertEqual(adapter.timeout, (1, 2))
+        self.assertEqual(adapter._pool_maxsize, 4)
+
+    @patch("requests.adapters.HTTPAdapter.send")
+    def test_default_timeout_applied(self, mock_send):
+        adapter = TimeoutHTTPAdapter(timeout=(1, 2))
+        adapter.send("request")
+        adapter.send("request", timeout=5)
+        self.assertEqual(mock_send.call_args_list[0].kwargs["timeout"], (1, 2))
+        self.assertEqual(mock_send.call_args_list[1].kwargs["timeout"], 5)
+
+if __name__ == "__main__":
+    unittest.main()
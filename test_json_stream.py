@@ -0,0 +1,66 @@
+import json
+import tracemalloc
+import unittest
+from unittest.mock import MagicMock
+from json_stream import iter_array, iter_object_items, is_large
+
+def split(text, size):
+    data = text.encode("utf-8")
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+class TestJsonStream(unittest.TestCase):
+    def setUp(self):
+        self.nbp = {"table": "A", "currency": "dolar amerykański", "code": "USD", "rates": [
+            {"no": "001/A/NBP/2025", "effectiveDate": "2025-01-02", "mid": 4.1012},
+            {"no": "002/A/NBP/2025", "effectiveDate": "2025-01-03", "mid": 4.12345678},
+        ]}
+
+    def test_array_under_key_any_chunking(self):
+        text = json.dumps(self.nbp, ensure_ascii=False, indent=1)
+        for size in (1, 2, 3, 7, 64, 10000):
+            self.assertEqual(list(iter_array(split(text, size), "rates")), self.nbp["rates"], size)
+
+    def test_top_level_array(self):
+        tables = [{"no": "001", "rates": [{"code": "USD", "mid": 4}]}, {"no": "002", "rates": []}]
+        self.assertEqual(list(iter_array(split(json.dumps(tables), 5))), tables)
+        self.assertEqual(list(iter_array([b"[]"])), [])
+
+    def test_object_items(self):
+        data = {"amount": 1.0, "base": "EUR", "rates": {"2025-01-02": {"USD": 1.035}, "2025-01-03": {"USD": 1.0299}}}
+        self.assertEqual(dict(iter_object_items(split(json.dumps(data), 4), "rates")), data["rates"])
+        self.assertEqual(list(iter_object_items([b'{"amount": 1.0}'], "rates")), [])
+
+    def test_required_key(self):
+        self.assertEqual(list(iter_array([b'{"status": "ok"}'], "rates")), [])
+        with self.assertRaises(ValueError):
+            list(iter_array([b'{"status": "ok"}'], "rates", required=True))
+        with self.assertRaises(ValueError):
+            list(iter_object_items([b'{"success": false}'], "rates", required=True))
+
+    def test_truncated_input(self):
+        with self.assertRaises(ValueError):
+            list(iter_array([b'{"rates": [{"mid": 4.1}, {"mid"'], "rates"))
+
+    def test_is_large(self):
+        self.assertTrue(is_large(MagicMock(headers={})))
+        self.assertFalse(is_large(MagicMock(headers={"Content-Length": "100"})))
+        self.assertTrue(is_large(MagicMock(headers={"Content-Length": "1000000"})))
+
+    def test_bounded_memory(self):
+        """Test pamięci - szczyt zależy od rozmiaru fragmentu, a nie całej odpowiedzi."""
+        def chunks():
+            yield b'{"table": "A", "rates": ['
+            record = b'{"no": "001/A/NBP/2025", "effectiveDate": "2025-01-02", "mid": 4.1012}'
+            for i in range(50000):
+                yield (b"," if i else b"") + record
+            yield b"]}"
+
+        tracemalloc.start()
+        count = sum(1 for _ in iter_array(chunks(), "rates"))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.assertEqual(count, 50000)
+        self.assertLess(peak, 1024 * 1024)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import json
+import os
+import tempfile
+import unittest
+from metrics import Metrics, Histogram
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.metrics = Metrics()
+
+    def test_stage_timer(self):
+        self.metrics.record("http", 0.010)
+        self.metrics.record("http", 0.030)
+        with self.metrics.timer("decode"):
+            pass
+        stages = self.metrics.snapshot()["stages"]
+        self.assertEqual(stages["http"]["count"], 2)
+        self.assertEqual(stages["http"]["avg_ms"], 20.0)
+        self.assertEqual(stages["http"]["max_ms"], 30.0)
+        self.assertEqual(stages["decode"]["count"], 1)
+
+    def test_histogram_buckets_and_quantiles(self):
+        histogram = Histogram(buckets=(10, 100))
+        for seconds in (0.005, 0.008, 0.050, 0.300):
+            histogram.record(seconds)
+        data = histogram.as_dict()
+        self.assertEqual(data["buckets"], {"<=10ms": 2, "<=100ms": 1, ">100ms": 1})
+        self.assertEqual(data["p50_ms"], 10)
+        self.assertEqual(data["p95_ms"], 300.0)
+
+    def test_summary_and_cache_ratio(self):
+        self.metrics.count("cache.hit", 3)
+        self.metrics.count("cache.miss")
+        self.metrics.record("query", 0.120)
+        self.assertEqual(self.metrics.cache_hit_ratio(), 0.75)
+        self.assertEqual(self.metrics.summary(), "zapytanie: 1 × 120 ms | cache: 75%")
+
+    def test_export(self):
+        self.metrics.observe("api.nbp.pl", 0.040)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "metryki.json")
+            self.metrics.export(path)
+            with open(path, encoding="utf-8") as file:
+                data = json.load(file)
+        self.assertEqual(data["latency"]["api.nbp.pl"]["count"], 1)
+
+if __name__ == "__main__":
+    unittest.main()
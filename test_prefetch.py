@@ -0,0 +1,59 @@
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock
+from publication import latest_publication, next_publication
+from prefetch import PrefetchScheduler
+from rates_core import RateClient
+from stub_server import StubServer, stub_client_options
+
+class TestPublication(unittest.TestCase):
+    def test_latest_publication(self):
+        monday_morning = datetime(2025, 6, 2, 10, 0)
+        self.assertEqual(latest_publication("NBP", "A", monday_morning), "2025-05-30")
+        self.assertEqual(latest_publication("NBP", "C", monday_morning), "2025-06-02")
+        self.assertEqual(latest_publication("EBC", "", datetime(2025, 6, 1, 18, 0)), "2025-05-30")
+
+    def test_next_publication(self):
+        self.assertEqual(next_publication("NBP", "A", datetime(2025, 5, 30, 13, 0)), datetime(2025, 6, 2, 12, 15))
+
+class TestPrefetchScheduler(unittest.TestCase):
+    def test_warm_makes_current_queries_offline(self):
+        """Test pamięci podręcznej po pobraniu z wyprzedzeniem - zapytania o kurs aktualny bez sieci."""
+        servers = [StubServer(seed=0).start() for _ in range(3)]
+        client = RateClient(cache_path=":memory:", currencies=["USD", "EUR"], **stub_client_options(*servers))
+        try:
+            PrefetchScheduler(client).warm()
+            requests_before = sum(server.requests for server in servers)
+            for table in ("A", "C"):
+                data, error, _ = client.get_nbp_rates("USD", table)
+                self.assertIsNone(error)
+            data, error = client.get_ecb_rates("USD")
+            self.assertIsNone(error)
+            self.assertEqual(sum(server.requests for server in servers), requests_before)
+        finally:
+            client.close()
+            for server in servers:
+                server.stop()
+
+    def test_run_task_backs_off_until_published(self):
+        scheduler = PrefetchScheduler(MagicMock(currencies=["USD"]), backoff=0.001, rng=lambda: 1.0,
+                                      clock=lambda: datetime(2025, 6, 2, 12, 30))
+        scheduler.fetch_published = MagicMock(side_effect=[False, False, True])
+        scheduler.run_task(datetime(2025, 6, 2, 12, 15), "NBP", "A")
+        self.assertEqual(scheduler.fetch_published.call_count, 3)
+        self.assertEqual(scheduler.delay(2), 0.004)
+        self.assertEqual(scheduler.done[("NBP", "A")], datetime(2025, 6, 2).date())
+
+        # Zadanie wykonane - następne jest publikacja tabeli C kolejnego dnia roboczego
+        scheduler.done[("NBP", "C")] = datetime(2025, 6, 2).date()
+        scheduler.tasks = [("NBP", "A"), ("NBP", "C")]
+        self.assertEqual(scheduler.next_task(), (datetime(2025, 6, 3, 8, 15), "NBP", "C"))
+
+    def test_run_task_gives_up_on_holiday(self):
+        scheduler = PrefetchScheduler(MagicMock(currencies=["USD"]), clock=lambda: datetime(2025, 6, 2, 21, 0))
+        scheduler.fetch_published = MagicMock(return_value=False)
+        scheduler.run_task(datetime(2025, 6, 2, 12, 15), "NBP", "A")
+        scheduler.fetch_published.assert_called_once()
+
+if __name__ == "__main__":
+    unittest.main()
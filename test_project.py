@@ -1,16 +1,27 @@
+import subprocess
+import sys
+import time
 import unittest
 from unittest.mock import patch, MagicMock
 import tkinter as tk
 from tkinter import TclError
 from datetime import datetime, timedelta
-import requests
-from project import CurrencyApp
+from project import CurrencyApp, RateResult, downsample_minmax
+
+def responses_by_table(**responses):
+    """Zwraca side_effect wybierający odpowiedź na podstawie tabeli NBP w adresie URL (tabele A i C są pobierane równolegle)."""
+    def side_effect(url, *args, **kwargs):
+        for table, response in responses.items():
+            if f"/rates/{table}/" in url:
+                return response
+        raise AssertionError(f"Nieoczekiwany adres URL: {url}")
+    return side_effect
 
 class TestCurrencyApp(unittest.TestCase):
     def setUp(self):
         """Inicjalizacja przed każdym testem."""
         self.root = tk.Tk()
-        self.app = CurrencyApp(self.root)
+        self.app = CurrencyApp(self.root, cache_path=":memory:")
         # Przygotowanie przykładowych danych
         self.currency = "USD"
         self.source = "NBP"
@@ -29,177 +40,15 @@ class TestCurrencyApp(unittest.TestCase):
         except (TclError, RuntimeError):
             pass
 
-    @patch('requests.get')
-    def test_get_nbp_rates_success_archival(self, mock_get):
-        """Test pobierania danych NBP dla trybu archiwalnego (sukces)."""
-        # Mock odpowiedzi API
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "table": "A",
-            "currency": "USD",
-            "rates": [
-                {"effectiveDate": "2025-06-01", "mid": 3.9500},
-                {"effectiveDate": "2025-06-02", "mid": 3.9600}
-            ]
-        }
-        mock_get.return_value = mock_response
-
-        # Wywołanie metody
-        data, error, effective_date = self.app.get_nbp_rates(self.currency, "A", self.start_date, self.end_date)
-
-        # Weryfikacja
-        self.assertIsNone(error)
-        self.assertIsNone(effective_date)  # Brak cofania dla trybu archiwalnego
-        self.assertEqual(data["rates"][0]["mid"], 3.9500)
-        mock_get.assert_called_once_with(
-            f"https://api.nbp.pl/api/exchangerates/rates/A/USD/2025-06-01/2025-06-05/?format=json"
-        )
-
-    @patch('requests.get')
-    def test_get_nbp_rates_current_skips_today(self, mock_get):
-        """Test pomijania bieżącego dnia i pobierania danych z poprzedniego dnia."""
-        # Mock odpowiedzi API dla poprzedniego dnia
-        mock_response = MagicMock(status_code=200, json=lambda: {
-            "table": "A",
-            "currency": "USD",
-            "rates": [{"effectiveDate": self.previous_date, "mid": 3.9400}]
-        })
-        mock_get.return_value = mock_response
-
-        # Wywołanie metody
-        data, error, effective_date = self.app.get_nbp_rates(self.currency, "A")
-
-        # Weryfikacja
-        self.assertIsNone(error)
-        self.assertEqual(effective_date, self.previous_date)
-        self.assertEqual(data["rates"][0]["mid"], 3.9400)
-        mock_get.assert_called_once_with(
-            f"https://api.nbp.pl/api/exchangerates/rates/A/USD/{self.previous_date}/?format=json"
-        )
-
-    @patch('requests.get')
-    def test_get_nbp_rates_current_retry_further(self, mock_get):
-        """Test cofania do wcześniejszego dnia, gdy poprzedni dzień niedostępny."""
-        # Mock odpowiedzi: 404 dla poprzedniego dnia, sukces dla dwa dni wstecz
-        previous_date_2 = (datetime.now() - timedelta(days=2)).strftime("%Y-%m-%d")
-        mock_response_404 = MagicMock(status_code=404)
-        mock_response_success = MagicMock(status_code=200, json=lambda: {
-            "table": "A",
-            "currency": "USD",
-            "rates": [{"effectiveDate": previous_date_2, "mid": 3.9300}]
-        })
-        mock_get.side_effect = [mock_response_404, mock_response_success]
-
-        # Wywołanie metody
-        data, error, effective_date = self.app.get_nbp_rates(self.currency, "A")
-
-        # Weryfikacja
-        self.assertIsNone(error)
-        self.assertEqual(effective_date, previous_date_2)
-        self.assertEqual(data["rates"][0]["mid"], 3.9300)
-        self.assertEqual(mock_get.call_count, 2)
-        mock_get.assert_called_with(
-            f"https://api.nbp.pl/api/exchangerates/rates/A/USD/{previous_date_2}/?format=json"
-        )
-
-    @patch('requests.get')
-    def test_get_nbp_rates_404_after_retries(self, mock_get):
-        """Test braku danych po 5 próbach cofania."""
-        # Mock 404 dla wszystkich prób
-        mock_response = MagicMock(status_code=404)
-        mock_get.return_value = mock_response
-
-        # Wywołanie metody
-        data, error, effective_date = self.app.get_nbp_rates(self.currency, "A")
-
-        # Weryfikacja
-        self.assertIsNone(data)
-        self.assertIsNone(effective_date)
-        self.assertEqual(error, "Brak danych dla podanego zakresu lub waluty (po 5 prób).")
-        self.assertEqual(mock_get.call_count, 5)  # Próbuje od dnia -1 do -5
-
-    @patch('requests.get')
-    def test_get_nbp_rates_network_error(self, mock_get):
-        """Test pobierania danych NBP przy błędzie sieciowym."""
-        # Mock wyjątku sieciowego
-        mock_get.side_effect = requests.RequestException("Błąd sieci")
-
-        # Wywołanie metody
-        data, error, effective_date = self.app.get_nbp_rates(self.currency, "A")
-
-        # Weryfikacja
-        self.assertIsNone(data)
-        self.assertIsNone(effective_date)
-        self.assertTrue(error.startswith("Błąd podczas pobierania danych z NBP:"))
-        mock_get.assert_called_once()
-
-    @patch('requests.get')
-    def test_get_ecb_rates_success(self, mock_get):
-        """Test pobierania danych EBC (frankfurter.app) dla trybu archiwalnego (sukces)."""
-        # Mock odpowiedzi API
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "rates": {
-                "2025-06-01": {"USD": 1.0800},
-                "2025-06-02": {"USD": 1.0850}
-            }
-        }
-        mock_get.return_value = mock_response
-
-        # Wywołanie metody
-        data, error = self.app.get_ecb_rates(self.currency, self.start_date, self.end_date)
-
-        # Weryfikacja
-        self.assertIsNone(error)
-        self.assertEqual(data["rates"]["2025-06-01"]["USD"], 1.0800)
-        mock_get.assert_called_once_with(
-            f"https://api.frankfurter.app/2025-06-01..2025-06-05?to=USD"
-        )
-
-    @patch('requests.get')
-    def test_get_ecb_rates_fallback_success(self, mock_get):
-        """Test pobierania danych EBC z zapasowego API (exchangerate.host) po błędzie."""
-        # Mock błędu dla frankfurter.app
-        mock_get.side_effect = [
-            requests.RequestException("Błąd frankfurter"),
-            MagicMock(status_code=200, json=lambda: {
-                "rates": {
-                    "2025-06-01": {"USD": 1.0800},
-                    "2025-06-02": {"USD": 1.0850}
-                }
-            })
-        ]
-
-        # Wywołanie metody
-        data, error = self.app.get_ecb_rates(self.currency, self.start_date, self.end_date)
-
-        # Weryfikacja
-        self.assertIsNone(error)
-        self.assertEqual(data["rates"]["2025-06-01"]["USD"], 1.0800)
-        mock_get.assert_called_with(
-            f"https://api.exchangerate.host/timeseries?start_date=2025-06-01&end_date=2025-06-05&base=EUR&symbols=USD"
-        )
-
-    @patch('requests.get')
-    def test_get_ecb_rates_both_fail(self, mock_get):
-        """Test pobierania danych EBC przy błędzie obu API."""
-        # Mock błędów dla obu API
-        mock_get.side_effect = [
-            requests.RequestException("Błąd frankfurter"),
-            requests.RequestException("Błąd exchangerate")
-        ]
-
-        # Wywołanie metody
-        data, error = self.app.get_ecb_rates(self.currency)
-
-        # Weryfikacja
-        self.assertIsNone(data)
-        self.assertTrue(error.startswith("Błąd podczas pobierania danych z EBC:"))
-        self.assertEqual(mock_get.call_count, 2)
+    def wait_for_query(self, timeout=5):
+        """Obsługuje pętlę zdarzeń Tk, dopóki zapytanie w tle nie zwróci wszystkich wyników."""
+        deadline = time.monotonic() + timeout
+        while self.app._pending and time.monotonic() < deadline:
+            self.root.update()
+            time.sleep(0.01)
+        self.root.update()
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_display_rates_nbp_success_current(self, mock_get):
         """Test wyświetlania kursów NBP w polu tekstowym dla danych bieżących (poprzedni dzień)."""
         # Mock odpowiedzi API dla tabel A i C (poprzedni dzień)
@@ -213,7 +62,7 @@ class TestCurrencyApp(unittest.TestCase):
             "currency": "USD",
             "rates": [{"effectiveDate": self.previous_date, "bid": 3.9100, "ask": 3.9700}]
         })
-        mock_get.side_effect = [mock_response_a, mock_response_c]
+        mock_get.side_effect = responses_by_table(A=mock_response_a, C=mock_response_c)
 
         # Wywołanie metody
         self.app.display_rates(self.currency, "NBP")
@@ -232,7 +81,7 @@ class TestCurrencyApp(unittest.TestCase):
         )
         self.assertEqual(text_content, expected)
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_display_rates_nbp_success_archival(self, mock_get):
         """Test wyświetlania kursów NBP w polu tekstowym dla danych archiwalnych (sukces)."""
         # Mock odpowiedzi API dla tabel A i C
@@ -246,7 +95,7 @@ class TestCurrencyApp(unittest.TestCase):
             "currency": "USD",
             "rates": [{"effectiveDate": "2025-06-01", "bid": 3.9200, "ask": 3.9800}]
         })
-        mock_get.side_effect = [mock_response_a, mock_response_c]
+        mock_get.side_effect = responses_by_table(A=mock_response_a, C=mock_response_c)
 
         # Wywołanie metody
         self.app.display_rates(self.currency, "NBP", self.start_date, self.end_date)
@@ -263,7 +112,7 @@ class TestCurrencyApp(unittest.TestCase):
         )
         self.assertEqual(text_content, expected)
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_display_rates_ecb_success(self, mock_get):
         """Test wyświetlania kursów EBC w polu tekstowym dla danych archiwalnych (sukces)."""
         # Mock odpowiedzi API
@@ -284,7 +133,20 @@ class TestCurrencyApp(unittest.TestCase):
         )
         self.assertEqual(text_content, expected)
 
-    @patch('requests.get')
+    def test_display_rates_single_batched_insert(self):
+        """Test wyświetlania długiej listy kursów jednym wstawieniem do pola tekstowego."""
+        result = RateResult(self.currency, "NBP", "2000-01-01", "2025-06-05")
+        rates = [{"effectiveDate": f"2000-01-{i % 28 + 1:02d}", "mid": 4.0} for i in range(10000)]
+        result.tables["A"] = ({"rates": rates}, None, None)
+        result.tables["C"] = (None, "Brak danych dla podanego zakresu lub waluty.", None)
+
+        with patch.object(self.app.result_text, 'insert', wraps=self.app.result_text.insert) as mock_insert:
+            self.app.display_rates(self.currency, "NBP", result=result)
+
+        mock_insert.assert_called_once()
+        self.assertEqual(int(self.app.result_text.index("end-1c").split(".")[0]), 10005)
+
+    @patch('requests.Session.get')
     def test_plot_rates_nbp_success(self, mock_get):
         """Test rysowania wykresu dla danych archiwalnych NBP (sukces)."""
         # Mock odpowiedzi API
@@ -307,7 +169,7 @@ class TestCurrencyApp(unittest.TestCase):
             self.assertTrue(mock_draw.called)
             self.assertTrue(self.app.canvas_widget.winfo_ismapped())  # Wykres widoczny
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_plot_rates_nbp_error(self, mock_get):
         """Test rysowania wykresu dla danych NBP przy błędzie."""
         # Mock błędu API
@@ -326,6 +188,35 @@ class TestCurrencyApp(unittest.TestCase):
             texts = [text.get_text() for text in self.app.ax.texts]
             self.assertIn("Brak danych dla podanego zakresu lub waluty.", texts)
 
+    def test_plot_rates_reuses_line_and_downsamples(self):
+        """Test aktualizacji istniejącej linii wykresu i redukcji punktów dla długiego zakresu."""
+        self.app.ensure_chart()
+        line = self.app.rate_line
+        result = RateResult(self.currency, "NBP", "2000-01-01", "2024-12-31")
+        start = datetime(2000, 1, 1)
+        rates = [{"effectiveDate": (start + timedelta(days=i)).strftime("%Y-%m-%d"), "mid": 4.0 + i % 7}
+                 for i in range(9000)]
+        result.tables["A"] = ({"rates": rates}, None, None)
+
+        with patch.object(self.app.canvas, 'draw'):
+            self.app.plot_rates(self.currency, "NBP", None, None, result=result)
+
+        self.assertIs(self.app.rate_line, line)
+        self.assertIn(line, self.app.ax.lines)
+        self.assertLessEqual(len(line.get_xdata()), 2 * int(self.app.ax.bbox.width))
+        self.assertEqual(max(line.get_ydata()), 10.0)
+        self.assertEqual(line.get_marker(), "")
+
+    def test_chart_created_on_first_use(self):
+        """Test tworzenia wykresu dopiero przy pierwszym użyciu."""
+        self.assertIsNone(self.app._figure)
+        self.app.clear_results()
+        self.assertIsNone(self.app._figure)
+
+        canvas = self.app.canvas
+        self.assertIsNotNone(self.app._figure)
+        self.assertIs(self.app.canvas, canvas)
+
     def test_toggle_date_fields_show(self):
         """Test pokazywania pól dat po zaznaczeniu danych archiwalnych."""
         # Zaznacz dane archiwalne
@@ -379,21 +270,18 @@ class TestCurrencyApp(unittest.TestCase):
         # Weryfikacja
         mock_showerror.assert_called_with("Błąd", "Nieprawidłowy format daty. Użyj RRRR-MM-DD!")
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     @patch('tkinter.messagebox.showerror')
     def test_fetch_rates_success(self, mock_showerror, mock_get):
         """Test poprawnego pobierania kursów w fetch_rates dla danych archiwalnych."""
-        # Mock dla NBP (tabela A, tabela C, plot_rates)
+        # Mock dla NBP (tabela A, tabela C) - wykres korzysta z tych samych danych
         mock_response_a = MagicMock(status_code=200, json=lambda: {
             "rates": [{"effectiveDate": "2025-06-01", "mid": 3.9500}]
         })
         mock_response_c = MagicMock(status_code=200, json=lambda: {
             "rates": [{"effectiveDate": "2025-06-01", "bid": 3.9200, "ask": 3.9800}]
         })
-        mock_response_plot = MagicMock(status_code=200, json=lambda: {
-            "rates": [{"effectiveDate": "2025-06-01", "mid": 3.9500}]
-        })
-        mock_get.side_effect = [mock_response_a, mock_response_c, mock_response_plot]
+        mock_get.side_effect = responses_by_table(A=mock_response_a, C=mock_response_c)
 
         # Ustaw poprawne dane
         self.app.historical_var.set(True)
@@ -408,13 +296,103 @@ class TestCurrencyApp(unittest.TestCase):
         with patch.object(self.app.canvas, 'draw'):
             # Wywołanie
             self.app.fetch_rates()
-            self.root.update()  # Aktualizuj GUI przed sprawdzeniem
+            self.wait_for_query()  # Pobieranie odbywa się w tle
 
         # Weryfikacja
         self.assertFalse(mock_showerror.called)
         text_content = self.app.result_text.get(1.0, tk.END).strip()
         self.assertIn("Kurs średni: 3.95 PLN", text_content)
         self.assertTrue(self.app.canvas_widget.winfo_ismapped())
+        self.assertEqual(mock_get.call_count, 2)  # Jedno pobranie tabel A i C na kliknięcie
+
+    @patch('requests.Session.get')
+    def test_start_query_superseded_results_ignored(self, mock_get):
+        """Test pomijania wyników zapytania zastąpionego nowszym kliknięciem."""
+        def side_effect(url, *args, **kwargs):
+            currency = url.rsplit("=", 1)[1]
+            return MagicMock(status_code=200, json=lambda: {
+                "date": "2025-06-02", "rates": {currency: 1.08 if currency == "USD" else 0.85}
+            })
+        mock_get.side_effect = side_effect
+
+        self.app.start_query("USD", "EBC")
+        self.app.start_query("GBP", "EBC")
+        self.wait_for_query()
+
+        text_content = self.app.result_text.get(1.0, tk.END).strip()
+        self.assertIn("Kursy dla waluty GBP (źródło: EBC)", text_content)
+        self.assertIn("Kurs: 0.85 EUR", text_content)
+        self.assertNotIn("USD", text_content)
+
+    @patch('requests.Session.get')
+    def test_status_bar_shows_metrics(self, mock_get):
+        """Test paska stanu - po zakończeniu zapytania pokazuje podsumowanie pomiarów."""
+        self.root.destroy()
+        self.root = tk.Tk()
+        self.app = CurrencyApp(self.root, status_bar=True, cache_path=":memory:")
+        mock_get.return_value = MagicMock(status_code=200, json=lambda: {"date": "2025-06-02", "rates": {"USD": 1.08}})
+
+        self.app.start_query("USD", "EBC")
+        self.wait_for_query()
+
+        status = self.app.status_var.get()
+        self.assertIn("zapytanie: 1 ×", status)
+        self.assertIn("tekst:", status)
+
+    @patch('requests.Session.get')
+    def test_start_query_shows_pending_parts(self, mock_get):
+        """Test wyświetlania informacji o pobieraniu, zanim napłyną dane."""
+        mock_get.return_value = MagicMock(status_code=404)
+
+        self.app.start_query(self.currency, "NBP", self.start_date, self.end_date)
+        text_content = self.app.result_text.get(1.0, tk.END)
+
+        self.assertIn("NBP Tabela A: pobieranie danych...", text_content)
+        self.wait_for_query()
+        self.assertNotIn("pobieranie danych", self.app.result_text.get(1.0, tk.END))
+
+class TestStartup(unittest.TestCase):
+    """Leniwe ładowanie matplotlib - czas zimnego startu mierzy bench_rates.py --only startup."""
+
+    def run_startup(self, code):
+        return subprocess.run([sys.executable, "-c", "import sys\n" + code], capture_output=True, text=True, check=True).stdout.split()
+
+    def test_import_does_not_load_matplotlib(self):
+        """Test importu modułu aplikacji - biblioteka wykresów nie jest wczytywana."""
+        output = self.run_startup("import project\nprint('matplotlib' in sys.modules)\n")
+        self.assertEqual(output, ["False"])
+
+    def test_app_start_does_not_load_matplotlib(self):
+        """Test zimnego startu CurrencyApp(root) - matplotlib dopiero przy pierwszym wykresie."""
+        code = (
+            "import project\n"
+            "try:\n"
+            "    root = project.tk.Tk()\n"
+            "except project.tk.TclError:\n"
+            "    print('brak-ekranu')\n"
+            "    sys.exit()\n"
+            "project.CurrencyApp(root, cache_path=':memory:')\n"
+            "root.update()\n"
+            "print('matplotlib' in sys.modules)\n"
+            "root.destroy()\n"
+        )
+        output = self.run_startup(code)
+        if output == ["brak-ekranu"]:
+            self.skipTest("Brak ekranu dla Tk")
+        self.assertEqual(output, ["False"])
+
+class TestDownsampleMinMax(unittest.TestCase):
+    def test_short_series_unchanged(self):
+        x, y = downsample_minmax([1, 2, 3], [4.0, 5.0, 6.0], 10)
+        self.assertListEqual(list(y), [4.0, 5.0, 6.0])
+
+    def test_keeps_extremes_in_order(self):
+        values = [float(i % 50) for i in range(10000)]
+        x, y = downsample_minmax(range(10000), values, 100)
+        self.assertLessEqual(len(x), 200)
+        self.assertEqual(max(y), 49.0)
+        self.assertEqual(min(y), 0.0)
+        self.assertTrue(all(a < b for a, b in zip(x, x[1:])))
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,69 @@
+import unittest
+from datetime import date, timedelta
+from rate_cache import RateCache
+
+class TestRateCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = RateCache(":memory:")
+
+    def tearDown(self):
+        self.cache.close()
+
+    def test_empty_cache_missing_whole_range(self):
+        missing = self.cache.missing_ranges("NBP", "A", "USD", "2025-06-01", "2025-06-05")
+        self.assertEqual(missing, [("2025-06-01", "2025-06-05")])
+
+    def test_store_and_load(self):
+        self.cache.store("NBP", "A", "USD", "2025-06-01", "2025-06-05", {
+            "2025-06-03": {"effectiveDate": "2025-06-03", "mid": 3.96},
+            "2025-06-02": {"effectiveDate": "2025-06-02", "mid": 3.95},
+        })
+        rates = self.cache.load("NBP", "A", "USD", "2025-06-01", "2025-06-05")
+        self.assertEqual([day for day, _ in rates], ["2025-06-02", "2025-06-03"])
+        self.assertEqual(rates[1][1]["mid"], 3.96)
+        self.assertEqual(self.cache.missing_ranges("NBP", "A", "USD", "2025-06-01", "2025-06-05"), [])
+
+    def test_load_series(self):
+        """Test odczytu kolumnowego - tabela C (bid/ask) i kursy EBC zapisane jako liczby."""
+        self.cache.store("NBP", "C", "USD", "2025-06-01", "2025-06-05", {
+            "2025-06-03": {"effectiveDate": "2025-06-03", "bid": 3.91, "ask": 3.97},
+            "2025-06-02": {"effectiveDate": "2025-06-02", "bid": 3.90, "ask": 3.96},
+        })
+        self.cache.store("EBC", "", "USD", "2025-06-01", "2025-06-05", {"2025-06-02": 1.14})
+        series = self.cache.load_series("NBP", "C", "USD", "2025-06-01", "2025-06-05")
+        self.assertEqual(list(series.rows()), [("2025-06-02", 3.90, 3.96), ("2025-06-03", 3.91, 3.97)])
+        self.assertEqual(list(self.cache.load_series("EBC", "", "USD", "2025-06-01", "2025-06-05").rows()),
+                         [("2025-06-02", 1.14)])
+        self.assertEqual(len(self.cache.load_series("NBP", "A", "USD", "2025-06-01", "2025-06-05")), 0)
+
+    def test_only_gaps_are_missing(self):
+        self.cache.store("NBP", "A", "USD", "2025-06-03", "2025-06-04", {})
+        self.cache.store("NBP", "A", "USD", "2025-06-07", "2025-06-08", {})
+        missing = self.cache.missing_ranges("NBP", "A", "USD", "2025-06-01", "2025-06-10")
+        self.assertEqual(missing, [
+            ("2025-06-01", "2025-06-02"),
+            ("2025-06-05", "2025-06-06"),
+            ("2025-06-09", "2025-06-10"),
+        ])
+
+    def test_adjacent_ranges_are_merged(self):
+        self.cache.store("NBP", "C", "EUR", "2025-06-01", "2025-06-03", {})
+        self.cache.store("NBP", "C", "EUR", "2025-06-04", "2025-06-06", {})
+        self.assertEqual(self.cache._intervals("NBP", "C", "EUR"), [(date(2025, 6, 1), date(2025, 6, 6))])
+
+    def test_keys_are_separate(self):
+        self.cache.store("NBP", "A", "USD", "2025-06-01", "2025-06-05", {})
+        self.assertEqual(self.cache.missing_ranges("NBP", "C", "USD", "2025-06-01", "2025-06-05"),
+                         [("2025-06-01", "2025-06-05")])
+        self.assertEqual(self.cache.missing_ranges("EBC", "", "USD", "2025-06-01", "2025-06-05"),
+                         [("2025-06-01", "2025-06-05")])
+
+    def test_today_not_covered_without_rates(self):
+        today = date.today()
+        start = (today - timedelta(days=2)).isoformat()
+        self.cache.store("NBP", "A", "USD", start, today.isoformat(), {})
+        self.assertEqual(self.cache.missing_ranges("NBP", "A", "USD", start, today.isoformat()),
+                         [(today.isoformat(), today.isoformat())])
+
+if __name__ == "__main__":
+    unittest.main()
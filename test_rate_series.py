@@ -0,0 +1,39 @@
+import sys
+import unittest
+import numpy as np
+from rate_series import RateSeries
+
+class TestRateSeries(unittest.TestCase):
+    def setUp(self):
+        self.series = RateSeries.from_nbp([
+            {"no": "001/C/NBP/2025", "effectiveDate": "2025-06-02", "bid": 3.91, "ask": 3.97},
+            {"no": "002/C/NBP/2025", "effectiveDate": "2025-06-03", "bid": 3.92, "ask": None},
+            {"no": "003/C/NBP/2025", "effectiveDate": "2025-06-04", "bid": 3.93, "ask": 3.99},
+        ])
+
+    def test_from_nbp(self):
+        self.assertEqual(len(self.series), 3)
+        self.assertEqual(self.series.dates.dtype, np.dtype("datetime64[D]"))
+        self.assertEqual(sorted(self.series.columns), ["ask", "bid"])
+        self.assertNotIn("mid", self.series)
+        self.assertTrue(np.isnan(self.series["ask"][1]))
+
+    def test_from_ecb(self):
+        series = RateSeries.from_ecb({"2025-06-02": {"USD": 1.08}, "2025-06-03": {"USD": 1.09}}, "USD")
+        self.assertListEqual(list(series.rows()), [("2025-06-02", 1.08), ("2025-06-03", 1.09)])
+
+    def test_slice(self):
+        part = self.series.slice("2025-06-03", "2025-06-10")
+        self.assertListEqual(list(part.rows("bid")), [("2025-06-03", 3.92), ("2025-06-04", 3.93)])
+        self.assertEqual(len(self.series.slice(end_date="2025-06-01")), 0)
+
+    def test_compact_storage(self):
+        """Test rozmiaru - szereg kolumnowy zajmuje wielokrotnie mniej pamięci niż lista słowników."""
+        rates = [{"no": f"{i}/A/NBP", "effectiveDate": f"2000-01-{i % 28 + 1:02d}", "mid": 4.0 + i} for i in range(1000)]
+        series = RateSeries.from_nbp(rates)
+        dict_bytes = sum(sys.getsizeof(rate) + sum(sys.getsizeof(value) for value in rate.values()) for rate in rates)
+        self.assertEqual(series.nbytes, 16000)
+        self.assertLess(series.nbytes * 5, dict_bytes)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout, redirect_stderr
+from unittest.mock import patch, MagicMock
+import numpy as np
+from rates_core import RateClient
+from rates_cli import main
+from rate_store import result_entries, export_series, load_series, export_parquet
+
+def rates_response(url, *args, **kwargs):
+    """Odpowiedź NBP (tabela A lub C) albo frankfurter.app zależnie od adresu URL."""
+    if "frankfurter" in url:
+        return MagicMock(status_code=200, json=lambda: {"rates": {"2025-06-02": {"USD": 1.085}, "2025-06-03": {"USD": 1.09}}})
+    table = url.split("/rates/")[1].split("/")[0]
+    rates = [{"effectiveDate": "2025-06-02", "mid": 3.75}, {"effectiveDate": "2025-06-03", "mid": 3.76}]
+    if table == "C":
+        rates = [{"effectiveDate": "2025-06-02", "bid": 3.7, "ask": 3.8}]
+    return MagicMock(status_code=200, json=lambda: {"rates": rates})
+
+class TestRateStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.client = RateClient(cache_path=":memory:")
+
+    def tearDown(self):
+        self.client.close()
+
+    def export(self, source):
+        with patch('requests.Session.get', side_effect=rates_response):
+            result = self.client.load_rates("USD", source, "2025-06-01", "2025-06-05")
+        return export_series(self.directory, result_entries(result))
+
+    def test_roundtrip_memory_mapped(self):
+        """Test zapisu i odczytu - daty datetime64[D], kursy float64 mapowane z dysku."""
+        self.assertEqual(self.export("NBP"), 2)
+        entries = {entry["table"]: entry for entry in load_series(self.directory)}
+        series = entries["A"]["series"]
+        self.assertIsInstance(series.dates.base, np.memmap)  # widok na plik, bez kopiowania
+        self.assertEqual(series.dates.dtype, np.dtype("datetime64[D]"))
+        np.testing.assert_allclose(series["mid"], [3.75, 3.76])
+        self.assertEqual(entries["C"]["series"]["ask"][0], 3.8)
+        self.assertEqual((entries["A"]["start_date"], entries["A"]["end_date"]), ("2025-06-01", "2025-06-05"))
+
+    def test_manifest_merged(self):
+        """Test kolejnego eksportu do tego samego katalogu - wpisy są dopisywane, a nie nadpisywane."""
+        self.export("NBP")
+        self.export("EBC")
+        keys = sorted((entry["source"], entry["table"]) for entry in load_series(self.directory))
+        self.assertEqual(keys, [("EBC", ""), ("NBP", "A"), ("NBP", "C")])
+
+    def test_import_skips_network(self):
+        """Test ponownego wczytania - zapytania o zapisane zakresy nie wysyłają żadnych zapytań HTTP."""
+        self.export("NBP")
+        self.export("EBC")
+        client = RateClient(cache_path=":memory:")
+        self.addCleanup(client.close)
+        self.assertEqual(client.import_store(self.directory), 3)
+        with patch('requests.Session.get') as mock_get:
+            data, error, _ = client.get_nbp_rates("USD", "C", "2025-06-01", "2025-06-05")
+            self.assertIsNone(error)
+            self.assertEqual(data["rates"][0]["bid"], 3.7)
+            data, error = client.get_ecb_rates("USD", "2025-06-02", "2025-06-04")
+            self.assertIsNone(error)
+            self.assertEqual(data["rates"]["2025-06-03"]["USD"], 1.09)
+            mock_get.assert_not_called()
+
+    def test_cli_export_and_import(self):
+        """Test eksportu z wiersza poleceń i ponownego użycia danych bez sieci."""
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with patch('requests.Session.get', side_effect=rates_response), redirect_stdout(stdout), redirect_stderr(stderr):
+            code = main(["--cache", ":memory:", "--sources", "NBP", "--currencies", "USD", "--tables", "A",
+                         "--range", "2025-06-01:2025-06-05", "--format", "npy", "-o", self.directory])
+        self.assertEqual(code, 0)
+        self.assertTrue(os.path.exists(os.path.join(self.directory, "NBP-A-USD.mid.npy")))
+        with patch('requests.Session.get') as mock_get, redirect_stdout(stdout), redirect_stderr(stderr):
+            code = main(["--cache", ":memory:", "--import-store", self.directory, "--sources", "NBP",
+                         "--currencies", "USD", "--tables", "A", "--range", "2025-06-01:2025-06-05"])
+        self.assertEqual(code, 0)
+        mock_get.assert_not_called()
+        self.assertIn('"mid": 3.76', stdout.getvalue())
+
+    def test_parquet_requires_pyarrow(self):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            with self.assertRaises(RuntimeError):
+                export_parquet(os.path.join(self.directory, "rates.parquet"), [])
+        else:
+            self.skipTest("pyarrow zainstalowany")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout, redirect_stderr
+from datetime import datetime, timedelta
+from unittest.mock import patch, MagicMock
+from rates_cli import main
+from rates_core import RateClient, CURRENCIES
+
+def nbp_response(url, *args, **kwargs):
+    """Odpowiedź NBP dla dowolnej waluty i tabeli z adresu URL."""
+    table = url.split("/rates/")[1].split("/")[0]
+    rate = {"effectiveDate": "2025-06-02", "mid": 3.75} if table == "A" else {"effectiveDate": "2025-06-02", "bid": 3.7, "ask": 3.8}
+    return MagicMock(status_code=200, json=lambda: {"rates": [rate]})
+
+def current_response(url, *args, **kwargs):
+    """Odpowiedź NBP lub EBC z kursem z dnia poprzedniego (tryb aktualny)."""
+    day = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+    if "/rates/" in url:
+        return MagicMock(status_code=200, json=lambda: {"rates": [{"effectiveDate": day, "mid": 3.75, "bid": 3.7, "ask": 3.8}]})
+    currency = url.rsplit("=", 1)[1]
+    return MagicMock(status_code=200, json=lambda: {"date": day, "rates": {currency: 1.1}})
+
+class TestRatesCli(unittest.TestCase):
+    def run_cli(self, *argv):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            code = main(["--cache", ":memory:", *argv])
+        return code, stdout.getvalue(), stderr.getvalue()
+
+    @patch('requests.Session.get', side_effect=nbp_response)
+    def test_jsonl_many_currencies(self, mock_get):
+        code, out, _ = self.run_cli("--sources", "NBP", "--currencies", "USD,EUR", "--range", "2025-06-01:2025-06-05")
+        records = [json.loads(line) for line in out.splitlines()]
+        self.assertEqual(code, 0)
+        self.assertEqual([(r["currency"], r["table"]) for r in records],
+                         [("USD", "A"), ("USD", "C"), ("EUR", "A"), ("EUR", "C")])
+        self.assertEqual(records[1]["ask"], 3.8)
+
+    @patch('requests.Session.get', side_effect=nbp_response)
+    def test_csv_output(self, mock_get):
+        code, out, _ = self.run_cli("--sources", "NBP", "--currencies", "CHF", "--tables", "A",
+                                    "--range", "2025-06-01:2025-06-05", "--format", "csv")
+        rows = list(csv.DictReader(io.StringIO(out)))
+        self.assertEqual(code, 0)
+        self.assertEqual(rows, [{"source": "NBP", "table": "A", "currency": "CHF", "date": "2025-06-02",
+                                 "mid": "3.75", "bid": "", "ask": ""}])
+
+    @patch('requests.Session.get', return_value=MagicMock(status_code=404))
+    def test_errors_reported_on_stderr(self, mock_get):
+        code, out, err = self.run_cli("--sources", "NBP", "--currencies", "USD", "--tables", "A",
+                                      "--range", "2025-06-07:2025-06-08")
+        self.assertEqual(code, 1)
+        self.assertEqual(out, "")
+        self.assertIn("NBP A USD: Brak danych dla podanego zakresu lub waluty.", err)
+
+    @patch('requests.Session.get', side_effect=current_response)
+    def test_default_arguments(self, mock_get):
+        """Test uruchomienia bez argumentów - wszystkie waluty z NBP i EBC, bez zapytania EBC o EUR."""
+        code, out, err = self.run_cli()
+        records = [json.loads(line) for line in out.splitlines()]
+        self.assertEqual((code, err), (0, ""))
+        ecb = [r["currency"] for r in records if r["source"] == "EBC"]
+        self.assertEqual(ecb, [currency for currency in CURRENCIES if currency != "EUR"])
+        self.assertFalse(any("EUR" in call.args[0] for call in mock_get.call_args_list if "frankfurter" in call.args[0]))
+
+    def test_client_closed_when_import_fails(self):
+        """Test błędu przed pobieraniem (brak katalogu --import-store) - klient i tak jest zamykany."""
+        missing = os.path.join(tempfile.gettempdir(), "brak-katalogu-kursow")
+        with patch.object(RateClient, "close") as mock_close, self.assertRaises(OSError):
+            self.run_cli("--import-store", missing)
+        mock_close.assert_called_once()
+
+    def test_invalid_range(self):
+        with redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            main(["--range", "2025-06-05:2025-06-01"])
+
+if __name__ == "__main__":
+    unittest.main()
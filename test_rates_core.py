@@ -0,0 +1,407 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from datetime import datetime, timedelta
+import requests
+from rates_core import RateClient, RateResult, split_range, format_rates, STALE_NOTE
+from resilience import ResiliencePolicy
+
+class TestRateClient(unittest.TestCase):
+    def setUp(self):
+        """Inicjalizacja przed każdym testem - klient bez interfejsu graficznego i z pamięcią podręczną w RAM."""
+        self.client = RateClient(cache_path=":memory:")
+        # Przygotowanie przykładowych danych
+        self.currency = "USD"
+        self.start_date = "2025-06-01"
+        self.end_date = "2025-06-05"
+        self.previous_date = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+        self.lookback_date = (datetime.now() - timedelta(days=5)).strftime("%Y-%m-%d")
+
+    def tearDown(self):
+        self.client.close()
+
+    @patch('requests.Session.get')
+    def test_get_nbp_rates_success_archival(self, mock_get):
+        """Test pobierania danych NBP dla trybu archiwalnego (sukces)."""
+        # Mock odpowiedzi API
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            "table": "A",
+            "currency": "USD",
+            "rates": [
+                {"effectiveDate": "2025-06-01", "mid": 3.9500},
+                {"effectiveDate": "2025-06-02", "mid": 3.9600}
+            ]
+        }
+        mock_get.return_value = mock_response
+
+        # Wywołanie metody
+        data, error, effective_date = self.client.get_nbp_rates(self.currency, "A", self.start_date, self.end_date)
+
+        # Weryfikacja
+        self.assertIsNone(error)
+        self.assertIsNone(effective_date)  # Brak cofania dla trybu archiwalnego
+        self.assertEqual(data["rates"][0]["mid"], 3.9500)
+        mock_get.assert_called_once_with(
+            f"https://api.nbp.pl/api/exchangerates/rates/A/USD/2025-06-01/2025-06-05/?format=json", stream=True
+        )
+
+    @patch('requests.Session.get')
+    def test_get_nbp_rates_archival_served_from_cache(self, mock_get):
+        """Test ponownego zapytania o ten sam zakres - dane z pamięci podręcznej, bez sieci."""
+        mock_response = MagicMock(status_code=200, json=lambda: {
+            "rates": [{"effectiveDate": "2025-06-02", "mid": 3.9600}]
+        })
+        mock_get.return_value = mock_response
+
+        self.client.get_nbp_rates(self.currency, "A", self.start_date, self.end_date)
+        data, error, _ = self.client.get_nbp_rates(self.currency, "A", "2025-06-02", "2025-06-03")
+
+        self.assertIsNone(error)
+        self.assertEqual(data["rates"][0]["mid"], 3.9600)
+        mock_get.assert_called_once()
+        # Pomiary: jedno chybienie i jedno trafienie pamięci podręcznej, czas odpowiedzi NBP w histogramie
+        snapshot = self.client.metrics.snapshot()
+        self.assertEqual(snapshot["counters"], {"cache.hit": 1, "cache.miss": 1})
+        self.assertEqual(snapshot["latency"]["api.nbp.pl"]["count"], 1)
+        self.assertEqual(snapshot["stages"]["decode"]["count"], 1)
+
+    @patch('requests.Session.get')
+    def test_get_nbp_rates_long_range_chunked(self, mock_get):
+        """Test dzielenia długiego zakresu na fragmenty zgodne z limitem API NBP."""
+        def side_effect(url, *args, **kwargs):
+            start = url.split("/")[-3]
+            return MagicMock(status_code=200, json=lambda: {"rates": [{"effectiveDate": start, "mid": 4.0}]})
+        mock_get.side_effect = side_effect
+
+        data, error, _ = self.client.get_nbp_rates(self.currency, "A", "2024-01-01", "2024-12-31")
+
+        self.assertIsNone(error)
+        self.assertEqual(mock_get.call_count, 4)
+        self.assertEqual([rate["effectiveDate"] for rate in data["rates"]],
+                         ["2024-01-01", "2024-04-03", "2024-07-05", "2024-10-06"])
+
+    @patch('requests.Session.get')
+    def test_get_nbp_rates_bulk_single_request(self, mock_get):
+        """Test pobierania wszystkich walut jednym zapytaniem o tabelę zbiorczą NBP."""
+        mock_get.return_value = MagicMock(status_code=200, json=lambda: [
+            {"table": "A", "no": "105/A/NBP/2025", "effectiveDate": "2025-06-02", "rates": [
+                {"currency": "dolar amerykański", "code": "USD", "mid": 3.7500},
+                {"currency": "euro", "code": "EUR", "mid": 4.2700},
+            ]},
+            {"table": "A", "no": "106/A/NBP/2025", "effectiveDate": "2025-06-03", "rates": [
+                {"currency": "dolar amerykański", "code": "USD", "mid": 3.7600},
+                {"currency": "euro", "code": "EUR", "mid": 4.2800},
+            ]},
+        ])
+
+        results = self.client.get_nbp_rates_bulk("A", self.start_date, self.end_date)
+
+        mock_get.assert_called_once_with(
+            "https://api.nbp.pl/api/exchangerates/tables/A/2025-06-01/2025-06-05/?format=json", stream=True
+        )
+        data, error, _ = results["EUR"]
+        self.assertIsNone(error)
+        self.assertEqual([rate["mid"] for rate in data["rates"]], [4.2700, 4.2800])
+        self.assertEqual(results["GBP"][1], "Brak danych dla podanego zakresu lub waluty.")
+        # Pozostałe zapytania o te waluty obsługuje pamięć podręczna
+        data, error, _ = self.client.get_nbp_rates("USD", "A", self.start_date, self.end_date)
+        self.assertEqual(data["rates"][1]["mid"], 3.7600)
+        mock_get.assert_called_once()
+
+    @patch('requests.Session.get')
+    def test_get_nbp_rates_current_skips_today(self, mock_get):
+        """Test pomijania bieżącego dnia i pobierania danych z poprzedniego dnia."""
+        # Mock odpowiedzi API dla zakresu kończącego się poprzednim dniem
+        mock_response = MagicMock(status_code=200, json=lambda: {
+            "table": "A",
+            "currency": "USD",
+            "rates": [{"effectiveDate": self.previous_date, "mid": 3.9400}]
+        })
+        mock_get.return_value = mock_response
+
+        # Wywołanie metody
+        data, error, effective_date = self.client.get_nbp_rates(self.currency, "A")
+
+        # Weryfikacja
+        self.assertIsNone(error)
+        self.assertEqual(effective_date, self.previous_date)
+        self.assertEqual(data["rates"][0]["mid"], 3.9400)
+        mock_get.assert_called_once_with(
+            f"https://api.nbp.pl/api/exchangerates/rates/A/USD/{self.lookback_date}/{self.previous_date}/?format=json", stream=True
+        )
+
+    @patch('requests.Session.get')
+    def test_get_nbp_rates_current_single_range_query(self, mock_get):
+        """Test wyboru ostatniego notowania z jednego zapytania o zakres (bez cofania dzień po dniu)."""
+        # Mock odpowiedzi: brak notowania z poprzedniego dnia, ostatnie notowanie dwa dni wstecz
+        previous_date_2 = (datetime.now() - timedelta(days=2)).strftime("%Y-%m-%d")
+        previous_date_3 = (datetime.now() - timedelta(days=3)).strftime("%Y-%m-%d")
+        mock_get.return_value = MagicMock(status_code=200, json=lambda: {
+            "table": "A",
+            "currency": "USD",
+            "rates": [
+                {"effectiveDate": previous_date_3, "mid": 3.9200},
+                {"effectiveDate": previous_date_2, "mid": 3.9300},
+            ]
+        })
+
+        # Wywołanie metody (dwukrotnie - druga odpowiedź z zapamiętanej daty)
+        self.client.get_nbp_rates(self.currency, "A")
+        data, error, effective_date = self.client.get_nbp_rates(self.currency, "A")
+
+        # Weryfikacja
+        self.assertIsNone(error)
+        self.assertEqual(effective_date, previous_date_2)
+        self.assertEqual(data["rates"], [{"effectiveDate": previous_date_2, "mid": 3.9300}])
+        mock_get.assert_called_once()
+
+    @patch('requests.Session.get')
+    def test_get_nbp_rates_404_after_retries(self, mock_get):
+        """Test braku danych z całego przeszukiwanego okresu."""
+        # Mock 404 dla zakresu
+        mock_response = MagicMock(status_code=404)
+        mock_get.return_value = mock_response
+
+        # Wywołanie metody
+        data, error, effective_date = self.client.get_nbp_rates(self.currency, "A")
+
+        # Weryfikacja
+        self.assertIsNone(data)
+        self.assertIsNone(effective_date)
+        self.assertEqual(error, "Brak danych dla podanego zakresu lub waluty (z ostatnich 5 dni).")
+        mock_get.assert_called_once()  # Jedno zapytanie o zakres od dnia -5 do -1
+
+    @patch('requests.Session.get')
+    def test_get_nbp_rates_network_error(self, mock_get):
+        """Test pobierania danych NBP przy błędzie sieciowym."""
+        # Mock wyjątku sieciowego
+        mock_get.side_effect = requests.RequestException("Błąd sieci")
+
+        # Wywołanie metody
+        data, error, effective_date = self.client.get_nbp_rates(self.currency, "A")
+
+        # Weryfikacja
+        self.assertIsNone(data)
+        self.assertIsNone(effective_date)
+        self.assertTrue(error.startswith("Błąd podczas pobierania danych z NBP:"))
+        mock_get.assert_called_once()
+
+    @patch('requests.Session.get')
+    def test_circuit_open_serves_cached_rates(self, mock_get):
+        """Test podawania kursów z pamięci podręcznej, gdy bezpiecznik NBP jest otwarty."""
+        self.client.close()
+        self.client = RateClient(cache_path=":memory:", resilience=ResiliencePolicy(failure_threshold=1, retries=0))
+        mock_get.return_value = MagicMock(status_code=200, json=lambda: {
+            "rates": [{"effectiveDate": "2025-06-02", "mid": 3.96}]})
+        self.client.get_nbp_rates(self.currency, "A", "2025-06-01", "2025-06-03")
+
+        mock_get.reset_mock()
+        mock_get.return_value = None
+        mock_get.side_effect = requests.ConnectionError("Błąd sieci")
+        data, error, _ = self.client.get_nbp_rates(self.currency, "A", "2025-06-01", "2025-06-10")
+        self.assertIsNone(error)
+        self.assertTrue(data["stale"])
+        self.assertEqual(data["rates"], [{"effectiveDate": "2025-06-02", "mid": 3.96}])
+
+        # Kolejne zapytania nie trafiają do sieci, dopóki obwód jest otwarty
+        data, error, effective_date = self.client.get_nbp_rates(self.currency, "A")
+        self.assertEqual(effective_date, "2025-06-02")
+        self.assertEqual(mock_get.call_count, 1)
+
+        result = RateResult(self.currency, "NBP")
+        result.tables["A"] = (data, error, effective_date)
+        result.tables["C"] = (None, "brak", None)
+        self.assertIn(STALE_NOTE, format_rates(result))
+
+    @patch('requests.Session.get')
+    def test_get_ecb_rates_success(self, mock_get):
+        """Test pobierania danych EBC (frankfurter.app) dla trybu archiwalnego (sukces)."""
+        # Mock odpowiedzi API
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            "rates": {
+                "2025-06-01": {"USD": 1.0800},
+                "2025-06-02": {"USD": 1.0850}
+            }
+        }
+        mock_get.return_value = mock_response
+
+        # Wywołanie metody
+        data, error = self.client.get_ecb_rates(self.currency, self.start_date, self.end_date)
+
+        # Weryfikacja
+        self.assertIsNone(error)
+        self.assertEqual(data["rates"]["2025-06-01"]["USD"], 1.0800)
+        mock_get.assert_called_once_with(
+            f"https://api.frankfurter.app/2025-06-01..2025-06-05?to=USD", stream=True
+        )
+
+    @patch('requests.Session.get')
+    def test_get_ecb_rates_fallback_success(self, mock_get):
+        """Test pobierania danych EBC z zapasowego API (exchangerate.host) po błędzie."""
+        # Mock błędu dla frankfurter.app
+        mock_get.side_effect = [
+            requests.RequestException("Błąd frankfurter"),
+            MagicMock(status_code=200, json=lambda: {
+                "rates": {
+                    "2025-06-01": {"USD": 1.0800},
+                    "2025-06-02": {"USD": 1.0850}
+                }
+            })
+        ]
+
+        # Wywołanie metody
+        data, error = self.client.get_ecb_rates(self.currency, self.start_date, self.end_date)
+
+        # Weryfikacja
+        self.assertIsNone(error)
+        self.assertEqual(data["rates"]["2025-06-01"]["USD"], 1.0800)
+        mock_get.assert_called_with(
+            f"https://api.exchangerate.host/timeseries?start_date=2025-06-01&end_date=2025-06-05&base=EUR&symbols=USD", stream=True
+        )
+
+    @patch('requests.Session.get')
+    def test_get_ecb_rates_both_fail(self, mock_get):
+        """Test pobierania danych EBC przy błędzie obu API."""
+        # Mock błędów dla obu API
+        mock_get.side_effect = [
+            requests.RequestException("Błąd frankfurter"),
+            requests.RequestException("Błąd exchangerate")
+        ]
+
+        # Wywołanie metody
+        data, error = self.client.get_ecb_rates(self.currency)
+
+        # Weryfikacja
+        self.assertIsNone(data)
+        self.assertTrue(error.startswith("Błąd podczas pobierania danych z EBC:"))
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch('requests.Session.get')
+    def test_load_rates_records(self, mock_get):
+        """Test płaskich rekordów wyniku (eksport JSON Lines/CSV)."""
+        mock_get.return_value = MagicMock(status_code=200, json=lambda: {
+            "rates": {"2025-06-02": {"USD": 1.1400}, "2025-06-03": {"USD": 1.1420}}
+        })
+
+        result = self.client.load_rates(self.currency, "EBC", self.start_date, self.end_date)
+
+        self.assertEqual(list(result.records()), [
+            {"source": "EBC", "table": "", "currency": "USD", "date": "2025-06-02", "mid": 1.1400, "bid": None, "ask": None},
+            {"source": "EBC", "table": "", "currency": "USD", "date": "2025-06-03", "mid": 1.1420, "bid": None, "ask": None},
+        ])
+        self.assertEqual(list(result.errors()), [])
+
+    @patch('requests.Session.get')
+    def test_load_rates_keeps_only_series(self, mock_get):
+        """Test wyniku zapytania - kursy tylko jako RateSeries, bez list rekordów z odpowiedzi."""
+        mock_get.return_value = MagicMock(status_code=200, json=lambda: {
+            "rates": [{"effectiveDate": "2025-06-02", "mid": 3.95}]
+        })
+        result = self.client.load_rates(self.currency, "NBP", self.start_date, self.end_date, tables=("A",))
+        data = result.tables["A"][0]
+        self.assertNotIn("rates", data)
+        self.assertIs(result.series("A"), data["series"])
+        self.assertEqual(list(data["series"].rows("mid")), [("2025-06-02", 3.95)])
+        # Tryb aktualny ma tę samą postać
+        mock_get.return_value = MagicMock(status_code=200, json=lambda: {
+            "rates": [{"effectiveDate": self.previous_date, "mid": 3.96}]
+        })
+        data, _, _ = self.client.get_nbp_rates(self.currency, "A", columnar=True)
+        self.assertEqual(set(data), {"table", "code", "series"})
+
+    @patch('requests.Session.get')
+    def test_malformed_streamed_response(self, mock_get):
+        """Test strony HTML lub JSON bez kursów (odpowiedź bez Content-Length) - błąd zamiast wyjątku i pustych danych."""
+        def streamed(body):
+            return MagicMock(status_code=200, headers={}, iter_content=lambda chunk_size: iter([body]))
+        mock_get.side_effect = [streamed(b"<html>Przerwa techniczna</html>"), streamed(b'{"status": "maintenance"}'),
+                                streamed(b"<html></html>")]
+
+        data, error, _ = self.client.get_nbp_rates(self.currency, "A", self.start_date, self.end_date)
+        self.assertIsNone(data)
+        self.assertIn("niepoprawna odpowiedź API", error)
+        data, error, _ = self.client.get_nbp_rates(self.currency, "A", self.start_date, self.end_date)
+        self.assertIn("rates", error)
+        results = self.client.get_nbp_rates_bulk("A", self.start_date, self.end_date, currencies=["USD"])
+        self.assertIn("niepoprawna odpowiedź API", results["USD"][1])
+        # Błędne odpowiedzi nie trafiły do pamięci podręcznej jako "brak kursów"
+        self.assertEqual(self.client.cache.missing_ranges("NBP", "A", "USD", self.start_date, self.end_date),
+                         [(self.start_date, self.end_date)])
+
+    @patch('requests.Session.get')
+    def test_record_without_required_field(self, mock_get):
+        """Test rekordu bez effectiveDate lub code - błąd zapytania zamiast wyjątku KeyError."""
+        mock_get.side_effect = [
+            MagicMock(status_code=200, headers={"Content-Length": "40"}, json=lambda: {"rates": [{"mid": 3.95}]}),
+            MagicMock(status_code=200, headers={"Content-Length": "40"}, json=lambda: [
+                {"no": "1/A/NBP/2025", "effectiveDate": "2025-06-02", "rates": [{"mid": 3.95}]}]),
+        ]
+        data, error, _ = self.client.get_nbp_rates(self.currency, "A", self.start_date, self.end_date)
+        self.assertIsNone(data)
+        self.assertIn("brak pola 'effectiveDate'", error)
+        results = self.client.get_nbp_rates_bulk("A", self.start_date, self.end_date, currencies=["USD"])
+        self.assertIn("brak pola 'code'", results["USD"][1])
+        self.assertEqual(self.client.cache.missing_ranges("NBP", "A", "USD", self.start_date, self.end_date),
+                         [(self.start_date, self.end_date)])
+
+    @patch('requests.Session.get')
+    def test_streamed_ecb_error_body(self, mock_get):
+        """Test błędu EBC bez Content-Length (np. {"success": false}) - zakres nie jest zapisywany jako pusty."""
+        mock_get.side_effect = lambda url, **kwargs: MagicMock(
+            status_code=200, headers={}, iter_content=lambda chunk_size: iter([b'{"success": false, "error": {"code": 104}}']))
+        data, error = self.client.get_ecb_rates(self.currency, self.start_date, self.end_date)
+        self.assertIsNone(data)
+        self.assertIn("brak klucza 'rates'", error)
+        self.assertEqual(self.client.cache.missing_ranges("EBC", "", "USD", self.start_date, self.end_date),
+                         [(self.start_date, self.end_date)])
+
+    def test_close_shuts_down_ecb_executors(self):
+        """Test zamknięcia klienta - pule wątków dostawców EBC też są zamykane."""
+        client = RateClient(cache_path=":memory:")
+        client.close()
+        for executor in client.ecb.executors.values():
+            with self.assertRaises(RuntimeError):
+                executor.submit(print)
+
+class TestFormatRates(unittest.TestCase):
+    def test_format_pending_and_error(self):
+        result = RateResult("USD", "NBP", "2025-06-01", "2025-06-05")
+        result.tables["A"] = (None, "Brak danych dla podanego zakresu lub waluty.", None)
+        self.assertEqual("".join(format_rates(result)), (
+            "Kursy dla waluty USD (źródło: NBP)\n\n"
+            "NBP Tabela A: Brak danych dla podanego zakresu lub waluty.\n"
+            "\nNBP Tabela C: pobieranie danych...\n"
+        ))
+        self.assertEqual(list(result.errors()), [("NBP A", "USD", "Brak danych dla podanego zakresu lub waluty.")])
+
+    def test_series_parsed_once(self):
+        """Test szeregu kolumnowego - odpowiedź jest parsowana raz i współdzielona przez tekst i eksport."""
+        result = RateResult("USD", "NBP", "2025-06-01", "2025-06-05")
+        result.tables["C"] = ({"rates": [{"effectiveDate": "2025-06-02", "bid": 3.91, "ask": 3.97}]}, None, None)
+        series = result.series("C")
+        self.assertIs(result.series("C"), series)
+        self.assertIn("Data: 2025-06-02, Kupno: 3.91 PLN, Sprzedaż: 3.97 PLN\n", format_rates(result))
+        self.assertEqual(list(result.records()), [{"source": "NBP", "table": "C", "currency": "USD", "date": "2025-06-02",
+                                                   "mid": None, "bid": 3.91, "ask": 3.97}])
+        # Nowe dane dla tej samej tabeli (kolejne zapytanie) - szereg jest budowany od nowa
+        result.tables["C"] = ({"rates": []}, None, None)
+        self.assertEqual(len(result.series("C")), 0)
+
+class TestSplitRange(unittest.TestCase):
+    def test_short_range_single_chunk(self):
+        self.assertEqual(split_range("2025-06-01", "2025-06-05", 93), [("2025-06-01", "2025-06-05")])
+
+    def test_long_range_chunks(self):
+        chunks = split_range("2024-01-01", "2024-12-31", 93)
+        self.assertEqual(chunks[0], ("2024-01-01", "2024-04-02"))
+        self.assertEqual(chunks[-1], ("2024-10-06", "2024-12-31"))
+        self.assertEqual(len(chunks), 4)
+
+    def test_no_limit(self):
+        self.assertEqual(split_range("2015-01-01", "2024-12-31"), [("2015-01-01", "2024-12-31")])
+
+if __name__ == "__main__":
+    unittest.main()
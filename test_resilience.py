@@ -0,0 +1,139 @@
+import unittest
+from unittest.mock import MagicMock
+import requests
+from resilience import TokenBucket, RetryPolicy, CircuitBreaker, CircuitOpenError, HostGuard
+
+class FakeClock:
+    """Zegar testowy - sleep przesuwa czas zamiast czekać."""
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_rate_limited(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, capacity=3, clock=clock, sleep=clock.sleep)
+        for _ in range(3):
+            bucket.acquire()
+        self.assertEqual(clock.sleeps, [])
+        bucket.acquire()
+        bucket.acquire()
+        self.assertAlmostEqual(clock.now, 1.0)
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_exponential_backoff_with_cap(self):
+        policy = RetryPolicy(backoff=0.5, max_backoff=4, rng=lambda: 1.0)
+        self.assertEqual([policy.delay(attempt) for attempt in range(5)], [0.5, 1.0, 2.0, 4, 4])
+
+    def test_jitter_and_retry_after(self):
+        policy = RetryPolicy(backoff=1, max_backoff=8, rng=lambda: 0.25)
+        self.assertEqual(policy.delay(2), 1.0)
+        self.assertEqual(policy.delay(0, retry_after=3), 3)
+        self.assertEqual(policy.delay(0, retry_after=60), 8)
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_after_threshold_and_recovers(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        breaker.before_request()
+        breaker.record_failure()
+        self.assertTrue(breaker.is_open())
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request()
+
+        # Po reset_timeout przepuszczane jest jedno zapytanie próbne
+        clock.now = 10
+        breaker.before_request()
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request()
+        breaker.record_success()
+        self.assertFalse(breaker.is_open())
+        breaker.before_request()
+
+    def test_failed_probe_reopens(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5, clock=clock)
+        breaker.record_failure()
+        clock.now = 5
+        breaker.before_request()
+        breaker.record_failure()
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request()
+
+class TestHostGuard(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.guard = HostGuard(
+            TokenBucket(100, 100, clock=self.clock, sleep=self.clock.sleep),
+            RetryPolicy(retries=2, backoff=1, rng=lambda: 1.0),
+            CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=self.clock),
+            sleep=self.clock.sleep,
+        )
+
+    def response(self, status_code, headers=None):
+        return MagicMock(status_code=status_code, headers=headers or {})
+
+    def test_retries_server_errors(self):
+        request = MagicMock(side_effect=[self.response(503), self.response(429, {"Retry-After": "3"}), self.response(200)])
+        response = self.guard.call(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.clock.sleeps, [1, 3.0])
+        self.assertEqual(self.guard.breaker.failures, 0)
+
+    def test_not_found_is_not_retried(self):
+        request = MagicMock(return_value=self.response(404))
+        self.assertEqual(self.guard.call(request).status_code, 404)
+        self.assertEqual(request.call_count, 1)
+
+    def test_circuit_opens_and_fails_fast(self):
+        request = MagicMock(return_value=self.response(500))
+        self.assertEqual(self.guard.call(request).status_code, 500)
+        self.assertEqual(request.call_count, 3)
+        request.side_effect = requests.ConnectionError("brak połączenia")
+        with self.assertRaises(requests.ConnectionError):
+            self.guard.call(request)
+        with self.assertRaises(CircuitOpenError):
+            self.guard.call(request)
+        self.assertEqual(request.call_count, 4)
+
+    def test_failed_probe_not_retried_and_recovers(self):
+        """Test zapytania próbnego z odpowiedzią 503 - bez ponowień, obwód otwarty ponownie i zamknięty po kolejnej próbie."""
+        self.guard.breaker.failure_threshold = 1
+        request = MagicMock(return_value=self.response(503))
+        self.guard.call(request)
+        self.assertTrue(self.guard.breaker.is_open())
+
+        self.clock.now += 30
+        request.reset_mock()
+        self.assertEqual(self.guard.call(request).status_code, 503)
+        self.assertEqual(request.call_count, 1)
+        self.assertEqual(self.guard.breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.guard.call(request)
+
+        self.clock.now += 30
+        request.return_value = self.response(200)
+        self.assertEqual(self.guard.call(request).status_code, 200)
+        self.assertEqual(self.guard.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_unreported_probe_times_out(self):
+        breaker = self.guard.breaker
+        breaker.failure_threshold = 1
+        breaker.record_failure()
+        self.clock.now += 30
+        self.assertTrue(breaker.before_request())
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request()
+        self.clock.now += 30
+        self.assertTrue(breaker.before_request())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+from rates_core import RateClient
+from resilience import ResiliencePolicy
+from stub_server import StubServer, stub_client_options
+from bench_rates import compare
+
+class TestStubServer(unittest.TestCase):
+    def setUp(self):
+        self.servers = [StubServer(seed=0).start() for _ in range(3)]
+        self.client = RateClient(cache_path=":memory:", hedge_delay=0.05, **stub_client_options(*self.servers))
+
+    def tearDown(self):
+        self.client.close()
+        for server in self.servers:
+            server.stop()
+
+    def test_nbp_long_range_in_chunks(self):
+        """Test zakresu dłuższego niż limit NBP - serwer odrzuca zbyt długie zakresy jak prawdziwe API."""
+        data, error, _ = self.client.get_nbp_rates("USD", "C", "2024-01-01", "2024-12-31")
+        self.assertIsNone(error)
+        self.assertEqual(len(data["rates"]), 262)
+        self.assertLess(data["rates"][0]["bid"], data["rates"][0]["ask"])
+        self.assertEqual(self.servers[0].requests, 4)
+
+    def test_nbp_bulk_and_ecb(self):
+        """Test tabel zbiorczych NBP i kursów EBC z serwera zastępczego."""
+        results = self.client.get_nbp_rates_bulk("A", "2024-06-03", "2024-06-07", currencies=["USD", "GBP"])
+        self.assertEqual(len(results["GBP"][0]["rates"]), 5)
+        data, error = self.client.get_ecb_rates("USD", "2024-06-01", "2024-06-09")
+        self.assertIsNone(error)
+        self.assertEqual(len(data["rates"]), 5)
+
+    def test_large_responses_streamed(self):
+        """Test dużych odpowiedzi (powyżej progu dekodowania strumieniowego) - wynik jak przy response.json()."""
+        for server in self.servers:
+            server.payload_size = 2000
+        data, error, _ = self.client.get_nbp_rates("USD", "A", "2024-01-01", "2024-03-31")
+        self.assertIsNone(error)
+        self.assertEqual(len(data["rates"]), 65)
+        self.assertEqual(len(data["rates"][0]["_pad"]), 2000)
+        results = self.client.get_nbp_rates_bulk("C", "2024-01-01", "2024-01-31", currencies=["USD", "GBP"])
+        self.assertEqual(len(results["GBP"][0]["rates"]), 23)
+        data, error = self.client.get_ecb_rates("USD", "2024-01-01", "2024-12-31")
+        self.assertIsNone(error)
+        self.assertEqual(len(data["rates"]), 262)
+
+    def test_errors_are_retried(self):
+        """Test odpowiedzi 503 - po wyczerpaniu prób klient zgłasza błąd."""
+        self.client.close()
+        self.servers[0].error_rate = 1.0
+        policy = ResiliencePolicy(retries=2, backoff=0.001)
+        self.client = RateClient(cache_path=":memory:", resilience=policy, **stub_client_options(*self.servers))
+        data, error, _ = self.client.get_nbp_rates("USD", "A", "2024-06-03", "2024-06-07")
+        self.assertIsNone(data)
+        self.assertIn("503", error)
+        self.assertEqual(self.servers[0].requests, 3)
+
+class TestBenchmarkCompare(unittest.TestCase):
+    def test_regressions(self):
+        baseline = {"single_query": {"median_ms": 10.0}, "memory": {"peak_mb": 5.0, "records": 100}}
+        results = {"single_query": {"median_ms": 13.0}, "memory": {"peak_mb": 5.5, "records": 200}}
+        self.assertEqual(compare(results, baseline, 0.2), ["single_query.median_ms: 10.0 -> 13.0"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+import weather_data
+from weather_data import load_station, parse_csv, DailyIndex, filter_and_group
+
+CSV = """timestamp,low,medium,high
+2023-01-01 00:00:00,1.0,2.0,3.0
+2023-01-01 12:00:00,3.0,4.0,5.0
+2023-01-02 00:00:00,-1.5,0.0,0.5
+"""
+
+class TestLoadStation(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, "stacja.csv")
+        self.cache_dir = os.path.join(self.directory, "cache")
+        self.write(CSV)
+
+    def write(self, text):
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write(text)
+
+    def test_parse(self):
+        data = parse_csv(self.path)
+        self.assertEqual(data.timestamps.dtype, np.dtype("datetime64[s]"))
+        self.assertEqual(str(data.timestamps[1]), "2023-01-01T12:00:00")
+        np.testing.assert_array_equal(data["medium"], [2.0, 4.0, 0.0])
+
+    def test_second_load_memory_mapped(self):
+        """Test ponownego wczytania - tablice mapowane z kopii, bez parsowania CSV."""
+        first = load_station(self.path, self.cache_dir)
+        with patch.object(weather_data, "parse_csv") as mock_parse:
+            second = load_station(self.path, self.cache_dir)
+        mock_parse.assert_not_called()
+        self.assertIsInstance(second.timestamps.base, np.memmap)
+        np.testing.assert_array_equal(second.timestamps, first.timestamps)
+        np.testing.assert_array_equal(second["low"], [1.0, 3.0, -1.5])
+
+    def test_changed_file_reparsed(self):
+        load_station(self.path, self.cache_dir)
+        self.write(CSV.replace("-1.5", "-2.5"))
+        os.utime(self.path, ns=(0, 10 ** 18))
+        self.assertEqual(load_station(self.path, self.cache_dir)["low"][2], -2.5)
+
+    def test_touched_file_reused(self):
+        """Test zmiany samego czasu modyfikacji - zawartość (skrót) bez zmian, kopia pozostaje ważna."""
+        load_station(self.path, self.cache_dir)
+        os.utime(self.path, ns=(0, 10 ** 18))
+        with patch.object(weather_data, "parse_csv") as mock_parse:
+            load_station(self.path, self.cache_dir)
+        mock_parse.assert_not_called()
+
+class TestDailyIndex(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.timestamps = np.arange("2023-01-01T00", "2023-03-01T00", dtype="datetime64[h]").astype("datetime64[s]")
+        self.values = rng.normal(5, 3, len(self.timestamps))
+        self.values[30:60] = np.nan  # dzień 2023-01-02 bez części pomiarów
+        self.index = DailyIndex.build(self.timestamps, self.values)
+
+    def groupby(self, date_from, date_to):
+        df = pd.DataFrame({"date": self.timestamps.astype("datetime64[D]").astype(object), "value": self.values})
+        df = df[(df["date"] >= date_from) & (df["date"] <= date_to)]
+        return df.groupby("date")["value"].mean()
+
+    def test_daily_means_match_groupby(self):
+        days, means = self.index.daily_means(date(2023, 1, 1), date(2023, 1, 31))
+        expected = self.groupby(date(2023, 1, 1), date(2023, 1, 31))
+        self.assertEqual(days.astype(object).tolist(), expected.index.tolist())
+        np.testing.assert_allclose(means, expected.to_numpy())
+
+    def test_range_mean_and_extremes(self):
+        mask = (self.timestamps >= np.datetime64("2023-02-03")) & (self.timestamps < np.datetime64("2023-02-11"))
+        self.assertAlmostEqual(self.index.mean("2023-02-03", "2023-02-10"), np.nanmean(self.values[mask]))
+        self.assertEqual(self.index.extremes("2023-02-03", "2023-02-10"),
+                         (np.nanmin(self.values[mask]), np.nanmax(self.values[mask])))
+
+    def test_empty_range(self):
+        days, means = self.index.daily_means(date(2022, 12, 1), date(2022, 12, 31))
+        self.assertEqual(len(days), 0)
+        self.assertTrue(np.isnan(self.index.mean("2023-03-05", "2023-03-01")))
+
+    def test_unsorted_input(self):
+        order = np.random.default_rng(1).permutation(len(self.timestamps))
+        index = DailyIndex.build(self.timestamps[order], self.values[order])
+        np.testing.assert_array_equal(index.days, self.index.days)
+        np.testing.assert_allclose(index.sums, self.index.sums)
+        np.testing.assert_array_equal(index.maxs, self.index.maxs)
+
+class TestFilterAndGroupSorted(unittest.TestCase):
+    """Ścieżka dla dat datetime64 - wyniki jak ścieżki ogólnej (kolumna obiektów date)."""
+
+    def setUp(self):
+        timestamps = pd.date_range("2023-01-01", periods=24 * 10, freq="h")
+        values = np.random.default_rng(0).normal(size=len(timestamps))
+        self.fast = pd.DataFrame({"date": timestamps, "value": values})
+        self.slow = pd.DataFrame({"date": timestamps.date, "value": values})
+
+    def assertSameResult(self, actual, expected):
+        self.assertEqual(actual["date"].dt.date.tolist(), expected["date"].tolist())
+        np.testing.assert_allclose(actual["value"], expected["value"])
+
+    def test_matches_general_path(self):
+        for date_from, date_to in [(date(2023, 1, 1), date(2023, 1, 10)), (date(2023, 1, 3), date(2023, 1, 3)),
+                                   (date(2022, 12, 25), date(2023, 1, 2)), (date(2023, 1, 9), date(2023, 2, 1))]:
+            self.assertSameResult(filter_and_group(self.fast, date_from, date_to),
+                                  filter_and_group(self.slow, date_from, date_to))
+
+    def test_empty_range(self):
+        self.assertTrue(filter_and_group(self.fast, date(2022, 12, 1), date(2022, 12, 31)).empty)
+        self.assertTrue(filter_and_group(self.fast, date(2023, 1, 5), date(2023, 1, 4)).empty)
+
+    def test_datetime_index_and_unsorted(self):
+        expected = filter_and_group(self.slow, date(2023, 1, 2), date(2023, 1, 4))
+        self.assertSameResult(filter_and_group(self.fast.set_index("date"), date(2023, 1, 2), date(2023, 1, 4)), expected)
+        shuffled = self.fast.sample(frac=1, random_state=0)
+        self.assertSameResult(filter_and_group(shuffled, date(2023, 1, 2), date(2023, 1, 4)), expected)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+import tracemalloc
+import unittest
+import numpy as np
+import pandas as pd
+from weather_data import COLUMNS
+from weather_stream import aggregate_csv, aggregate_chunks, aggregate_files, station_files, daily_frame, monthly_frame, main
+
+class TestWeatherStream(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, "stacja.csv")
+        rng = np.random.default_rng(0)
+        timestamps = pd.date_range("2023-01-30", "2023-03-03 23:00", freq="h")
+        self.df = pd.DataFrame({"timestamp": timestamps.strftime("%Y-%m-%d %H:%M:%S")})
+        for column in COLUMNS:
+            values = rng.normal(5, 3, len(timestamps)).round(2)
+            values[rng.random(len(values)) < 0.05] = np.nan
+            self.df[column] = values
+        self.df.loc[24:47, "high"] = np.nan  # cały dzień bez pomiarów w jednej kolumnie
+        self.df.to_csv(self.path, index=False)
+
+    def expected(self, df, key):
+        df = df.assign(timestamp=pd.to_datetime(df["timestamp"]))
+        keys = df["timestamp"].dt.date if key == "date" else df["timestamp"].dt.to_period("M")
+        return df.groupby(keys.rename(key))[list(COLUMNS)].mean().reset_index()
+
+    def assertFramesEqual(self, actual, expected):
+        self.assertEqual(list(actual.columns), list(expected.columns))
+        self.assertEqual(actual.iloc[:, 0].tolist(), expected.iloc[:, 0].tolist())
+        np.testing.assert_allclose(actual[list(COLUMNS)], expected[list(COLUMNS)], equal_nan=True)
+
+    def test_equal_to_groupby_for_any_chunk_size(self):
+        for chunksize in (5, 97, 100000):
+            aggregates = aggregate_csv(self.path, chunksize=chunksize)
+            self.assertFramesEqual(daily_frame(aggregates), self.expected(self.df, "date"))
+            self.assertFramesEqual(monthly_frame(aggregates), self.expected(self.df, "month"))
+
+    def test_dropna_like_notebook(self):
+        aggregates = aggregate_csv(self.path, chunksize=50, dropna=True)
+        self.assertFramesEqual(monthly_frame(aggregates), self.expected(self.df.dropna(), "month"))
+
+    def test_bounded_memory(self):
+        """Test pamięci - szczyt zależy od rozmiaru fragmentu i liczby dni, a nie liczby wierszy."""
+        def chunks(count, size=10000):
+            for i in range(count):
+                # Wiele stacji z tego samego roku - liczba dni stała, liczba wierszy rośnie
+                timestamps = np.datetime64("2000-01-01T00", "h") + np.arange(i * size, (i + 1) * size) % (24 * 365)
+                yield timestamps.astype("datetime64[s]"), {column: np.ones(size) for column in COLUMNS}
+
+        peaks = []
+        for count in (40, 200):
+            tracemalloc.start()
+            aggregate_chunks(chunks(count))
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        self.assertLess(peaks[1], peaks[0] * 1.2)
+
+    def test_cli_writes_daily_and_monthly(self):
+        daily, monthly = os.path.join(self.directory, "d.csv"), os.path.join(self.directory, "m.csv")
+        self.assertEqual(main([self.path, "--chunksize", "100", "--daily", daily, "--monthly", monthly]), 0)
+        self.assertEqual(pd.read_csv(monthly)["month"].tolist(), ["2023-01", "2023-02", "2023-03"])
+        self.assertEqual(len(pd.read_csv(daily)), 33)
+
+    def test_many_stations_in_processes(self):
+        """Test wielu plików - agregaty z procesów po scaleniu jak groupby na połączonych danych."""
+        stations = os.path.join(self.directory, "stacje")
+        os.makedirs(stations)
+        frames = [self.df, self.df.iloc[::3], self.df.assign(low=self.df["low"] * 2)]
+        for number, frame in enumerate(frames):
+            frame.to_csv(os.path.join(stations, f"stacja{number}.csv"), index=False)
+        paths = station_files([stations, os.path.join(stations, "stacja1*.csv")])
+        self.assertEqual([os.path.basename(path) for path in paths], ["stacja0.csv", "stacja1.csv", "stacja2.csv"])
+        aggregates = aggregate_files(paths, workers=2, chunksize=200)
+        self.assertFramesEqual(monthly_frame(aggregates), self.expected(pd.concat(frames), "month"))
+        self.assertFramesEqual(daily_frame(aggregates), self.expected(pd.concat(frames), "date"))
+        with self.assertRaises(FileNotFoundError):
+            station_files([os.path.join(stations, "*.txt")])
+
+if __name__ == "__main__":
+    unittest.main()
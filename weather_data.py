@@ -0,0 +1,246 @@
+"""Wczytywanie godzinowych danych pogodowych (timestamp,low,medium,high) z kolumnową pamięcią podręczną.
+
+Plik CSV jest parsowany tylko raz - wynik trafia do katalogu z tablicami NumPy (.npy): znaczniki
+czasu (datetime64[s]) i kolumny pomiarów (float64). Kolejne wczytania mapują tablice z dysku
+(mmap_mode="r"), więc trwają milisekundy niezależnie od rozmiaru pliku. Kopia jest unieważniana,
+gdy zmieni się rozmiar lub czas modyfikacji pliku, a zawartość (skrót SHA-1) jest inna.
+"""
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "dane_pogodowe")
+COLUMNS = ("low", "medium", "high")
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+CACHE_VERSION = 1
+META = "meta.json"
+
+
+class StationData:
+    """Pomiary jednej stacji w układzie kolumnowym: znaczniki czasu i kolumny low/medium/high."""
+
+    __slots__ = ("timestamps", "columns")
+
+    def __init__(self, timestamps, columns):
+        self.timestamps = np.asarray(timestamps, dtype="datetime64[s]")
+        self.columns = {name: np.asarray(values, dtype=np.float64) for name, values in columns.items()}
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    def frame(self, value_column=None):
+        """DataFrame z kolumnami timestamp i pomiarami (oraz value = value_column, jeśli podano)."""
+        df = pd.DataFrame({"timestamp": self.timestamps, **self.columns}, copy=False)
+        if value_column is not None:
+            df["value"] = df[value_column]
+        return df
+
+
+def parse_csv(path):
+    """Parsuje plik CSV w całości (bez pamięci podręcznej)."""
+    df = pd.read_csv(path, encoding="utf-8", dtype={column: np.float64 for column in COLUMNS})
+    timestamps = pd.to_datetime(df["timestamp"], format=TIMESTAMP_FORMAT).to_numpy("datetime64[s]")
+    return StationData(timestamps, {column: df[column].to_numpy() for column in COLUMNS})
+
+
+def file_hash(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha1()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_directory(path, cache_dir=DEFAULT_CACHE_DIR):
+    """Katalog pamięci podręcznej dla pliku - nazwa pliku i skrót pełnej ścieżki (różne katalogi się nie mieszają)."""
+    path = os.path.abspath(path)
+    key = hashlib.sha1(path.encode("utf-8")).hexdigest()[:12]
+    return os.path.join(cache_dir, f"{os.path.basename(path)}.{key}")
+
+
+def _read_meta(directory):
+    try:
+        with open(os.path.join(directory, META), encoding="utf-8") as file:
+            meta = json.load(file)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("version") == CACHE_VERSION else None
+
+
+def _write_meta(directory, meta):
+    # Zapis przez plik tymczasowy - meta.json pojawia się dopiero po zapisaniu wszystkich tablic
+    temp_path = os.path.join(directory, META + ".tmp")
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(meta, file, indent=2)
+    os.replace(temp_path, os.path.join(directory, META))
+
+
+def _is_valid(meta, path, stat):
+    """Czy kopia odpowiada plikowi; przy zmienionym czasie modyfikacji (np. po skopiowaniu) porównywany jest skrót."""
+    if meta is None or meta["size"] != stat.st_size:
+        return False
+    if meta["mtime_ns"] == stat.st_mtime_ns:
+        return True
+    return meta["sha1"] == file_hash(path)
+
+
+def load_station(path, cache_dir=DEFAULT_CACHE_DIR, mmap=True):
+    """Wczytuje plik stacji, korzystając z kolumnowej kopii (cache_dir=None - zawsze parsuje CSV)."""
+    if cache_dir is None:
+        return parse_csv(path)
+    directory = cache_directory(path, cache_dir)
+    stat = os.stat(path)
+    meta = _read_meta(directory)
+    if _is_valid(meta, path, stat):
+        if meta["mtime_ns"] != stat.st_mtime_ns:
+            _write_meta(directory, dict(meta, mtime_ns=stat.st_mtime_ns))
+        mode = "r" if mmap else None
+        return StationData(
+            np.load(os.path.join(directory, "timestamp.npy"), mmap_mode=mode),
+            {column: np.load(os.path.join(directory, f"{column}.npy"), mmap_mode=mode) for column in COLUMNS},
+        )
+    data = parse_csv(path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(os.path.join(directory, META)):
+            os.remove(os.path.join(directory, META))
+        np.save(os.path.join(directory, "timestamp.npy"), data.timestamps)
+        for column in COLUMNS:
+            np.save(os.path.join(directory, f"{column}.npy"), data.columns[column])
+        _write_meta(directory, {"version": CACHE_VERSION, "source": os.path.abspath(path), "size": stat.st_size,
+                                "mtime_ns": stat.st_mtime_ns, "sha1": file_hash(path), "rows": len(data)})
+    except OSError:
+        pass  # Brak miejsca lub uprawnień - dane i tak są wczytane, kopia powstanie następnym razem
+    return data
+
+
+class DailyIndex:
+    """Dzienne agregaty jednej kolumny (suma, liczba, minimum, maksimum) z sumami prefiksowymi.
+
+    Zapytania o zakres dat wyszukują binarnie granice w tablicy dni i operują wyłącznie na
+    dniach z zakresu - pomiary godzinowe nie są ponownie przeglądane ani kopiowane. Średnia
+    z całego zakresu wynika z różnicy sum prefiksowych (czas stały po wyszukaniu granic).
+    Wartości NaN są pomijane jak w DataFrame.groupby(...).mean().
+    """
+
+    __slots__ = ("days", "sums", "counts", "mins", "maxs", "prefix_sums", "prefix_counts")
+
+    def __init__(self, days, sums, counts, mins, maxs):
+        self.days = np.asarray(days, dtype="datetime64[D]")
+        self.sums = np.asarray(sums, dtype=np.float64)
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.mins = np.asarray(mins, dtype=np.float64)
+        self.maxs = np.asarray(maxs, dtype=np.float64)
+        self.prefix_sums = np.concatenate(([0.0], np.cumsum(self.sums)))
+        self.prefix_counts = np.concatenate(([0], np.cumsum(self.counts)))
+
+    @classmethod
+    def _reduce(cls, days, sums, counts, mins, maxs):
+        """Łączy wpisy o tych samych dniach (wejście nie musi być posortowane)."""
+        if len(days) and not (days[1:] >= days[:-1]).all():
+            order = np.argsort(days, kind="stable")
+            days, sums, counts, mins, maxs = days[order], sums[order], counts[order], mins[order], maxs[order]
+        if not len(days):
+            return cls(days, [], [], [], [])
+        starts = np.flatnonzero(np.concatenate(([True], days[1:] != days[:-1])))
+        # fmin/fmax pomijają NaN (dzień bez pomiarów daje NaN)
+        return cls(days[starts], np.add.reduceat(sums, starts), np.add.reduceat(counts, starts),
+                   np.fmin.reduceat(mins, starts), np.fmax.reduceat(maxs, starts))
+
+    @classmethod
+    def build(cls, timestamps, values):
+        """Agreguje pomiary do dni; posortowane znaczniki czasu nie wymagają sortowania."""
+        days = np.asarray(timestamps).astype("datetime64[D]")
+        values = np.asarray(values, dtype=np.float64)
+        valid = ~np.isnan(values)
+        return cls._reduce(days, np.where(valid, values, 0.0), valid.astype(np.int64), values, values)
+
+    @classmethod
+    def merge(cls, indexes):
+        """Łączy indeksy częściowe (np. z kolejnych fragmentów pliku lub z wielu plików) - wynik jak dla całości."""
+        indexes = list(indexes)
+        if len(indexes) == 1:
+            return indexes[0]
+        return cls._reduce(*(np.concatenate([getattr(index, name) for index in indexes] or [[]])
+                             for name in ("days", "sums", "counts", "mins", "maxs")))
+
+    def monthly(self):
+        """Agregaty miesięczne w tej samej postaci (dzień = pierwszy dzień miesiąca)."""
+        months = self.days.astype("datetime64[M]").astype("datetime64[D]")
+        return type(self)._reduce(months, self.sums, self.counts, self.mins, self.maxs)
+
+    def __len__(self):
+        return len(self.days)
+
+    def bounds(self, date_from=None, date_to=None):
+        """Indeksy [start, end) dni z zakresu dat (włącznie)."""
+        start = 0 if date_from is None else np.searchsorted(self.days, np.datetime64(date_from, "D"), "left")
+        end = len(self.days) if date_to is None else np.searchsorted(self.days, np.datetime64(date_to, "D"), "right")
+        return start, max(start, end)
+
+    def daily_means(self, date_from=None, date_to=None):
+        """Dni z zakresu i średnie dzienne (jak groupby("date").mean())."""
+        start, end = self.bounds(date_from, date_to)
+        counts = self.counts[start:end]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.days[start:end], self.sums[start:end] / counts
+
+    def mean(self, date_from=None, date_to=None):
+        """Średnia wszystkich pomiarów z zakresu (NaN, gdy brak pomiarów)."""
+        start, end = self.bounds(date_from, date_to)
+        count = self.prefix_counts[end] - self.prefix_counts[start]
+        return (self.prefix_sums[end] - self.prefix_sums[start]) / count if count else float("nan")
+
+    def extremes(self, date_from=None, date_to=None):
+        """Minimum i maksimum z zakresu (NaN, gdy brak pomiarów)."""
+        start, end = self.bounds(date_from, date_to)
+        if not self.counts[start:end].any():
+            return float("nan"), float("nan")
+        return float(np.nanmin(self.mins[start:end])), float(np.nanmax(self.maxs[start:end]))
+
+
+def _sorted_dates(df):
+    """Daty z kolumny "date" (datetime64) lub indeksu DatetimeIndex i wartości "value" w kolejności dat; inaczej None."""
+    if "date" in df.columns:
+        dates = df["date"]
+        if not pd.api.types.is_datetime64_dtype(dates.dtype):
+            return None
+    elif isinstance(df.index, pd.DatetimeIndex):
+        dates = df.index
+    else:
+        return None
+    values = df["value"].to_numpy()
+    if dates.is_monotonic_increasing:
+        return dates.to_numpy(), values
+    order = np.argsort(dates.to_numpy(), kind="stable")
+    return dates.to_numpy()[order], values[order]
+
+
+def _to_day(value):
+    return pd.Timestamp(value).to_datetime64().astype("datetime64[D]")
+
+
+def filter_and_group(df, date_from, date_to):
+    """Średnie dzienne kolumny "value" dla dat z zakresu [date_from, date_to], posortowane według daty.
+
+    Dla kolumny "date" typu datetime64 (lub indeksu DatetimeIndex) granice zakresu są wyszukiwane
+    binarnie, a średnie liczone przez np.add.reduceat na granicach dni - bez masek na całej ramce
+    i bez groupby; nieposortowane daty są najpierw sortowane. Pozostałe ramki (np. kolumna
+    z obiektami date) przechodzą ścieżką ogólną.
+    """
+    sorted_dates = _sorted_dates(df)
+    if sorted_dates is None:
+        df_filtered = df[(df["date"] >= date_from) & (df["date"] <= date_to)]
+        return df_filtered.groupby("date")["value"].mean().reset_index()
+    dates, values = sorted_dates
+    # Koniec zakresu: pierwszy znacznik czasu od początku dnia następującego po date_to
+    start = np.searchsorted(dates, _to_day(date_from), "left")
+    end = max(start, np.searchsorted(dates, _to_day(date_to) + 1, "left"))
+    days, means = DailyIndex.build(dates[start:end], values[start:end]).daily_means()
+    return pd.DataFrame({"date": days, "value": means})
@@ -0,0 +1,151 @@
+"""Strumieniowe liczenie średnich dziennych i miesięcznych dla dużych plików pogodowych.
+
+Plik CSV (timestamp,low,medium,high) jest czytany fragmentami po chunksize wierszy; każdy
+fragment daje częściowe agregaty dzienne (suma, liczba, minimum, maksimum - DailyIndex), które
+są łączone z dotychczasowymi. W pamięci jest jednocześnie tylko jeden fragment pliku oraz
+agregaty (jeden wiersz na dzień), więc rozmiar pliku nie jest ograniczony pamięcią RAM.
+Średnie są równe wynikom groupby na całej ramce (z dokładnością do zaokrągleń sumowania).
+
+Wiele plików (np. katalog z plikami stacji) jest przetwarzanych równolegle w osobnych procesach;
+agregaty częściowe z każdego pliku są scalane w jeden wynik zbiorczy.
+
+Przykład: python weather_stream.py dane_pogodowe.csv --daily dzienne.csv --monthly miesieczne.csv
+          python weather_stream.py stacje/ "archiwum/*.csv" --workers 8 --monthly zbiorcze.csv
+"""
+import argparse
+import glob
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from weather_data import COLUMNS, TIMESTAMP_FORMAT, DailyIndex
+
+DEFAULT_CHUNK_SIZE = 100_000
+# Po tylu fragmentach agregaty częściowe są scalane (ogranicza pamięć przy plikach bez porządku dat)
+MERGE_EVERY = 32
+
+
+def iter_chunks(path, chunksize=DEFAULT_CHUNK_SIZE, columns=COLUMNS):
+    """Zwraca kolejne fragmenty pliku jako pary (znaczniki czasu datetime64[s], {kolumna: float64})."""
+    reader = pd.read_csv(path, encoding="utf-8", usecols=["timestamp", *columns], chunksize=chunksize,
+                         dtype={column: np.float64 for column in columns})
+    with reader:
+        for chunk in reader:
+            timestamps = pd.to_datetime(chunk["timestamp"], format=TIMESTAMP_FORMAT).to_numpy("datetime64[s]")
+            yield timestamps, {column: chunk[column].to_numpy() for column in columns}
+
+
+def aggregate_chunks(chunks, columns=COLUMNS, dropna=False):
+    """Agregaty dzienne {kolumna: DailyIndex} z fragmentów (timestamps, {kolumna: wartości}).
+
+    dropna=True pomija wiersze, w których brakuje którejkolwiek kolumny (jak DataFrame.dropna()
+    w small_task_2.ipynb); domyślnie braki są pomijane osobno w każdej kolumnie.
+    """
+    parts = {column: [] for column in columns}
+    for timestamps, values in chunks:
+        if dropna:
+            keep = ~np.any([np.isnan(values[column]) for column in columns], axis=0)
+            timestamps, values = timestamps[keep], {column: values[column][keep] for column in columns}
+        for column in columns:
+            parts[column].append(DailyIndex.build(timestamps, values[column]))
+            if len(parts[column]) >= MERGE_EVERY:
+                parts[column] = [DailyIndex.merge(parts[column])]
+    return {column: DailyIndex.merge(parts[column]) for column in columns}
+
+
+def aggregate_csv(path, chunksize=DEFAULT_CHUNK_SIZE, columns=COLUMNS, dropna=False):
+    """Czyta plik fragmentami i zwraca agregaty dzienne {kolumna: DailyIndex}."""
+    return aggregate_chunks(iter_chunks(path, chunksize, columns), columns, dropna)
+
+
+def station_files(patterns):
+    """Pliki CSV wskazane jako ścieżki, katalogi (wszystkie *.csv) lub wzorce glob - bez powtórzeń, posortowane."""
+    paths = set()
+    for pattern in patterns:
+        found = glob.glob(os.path.join(pattern, "*.csv")) if os.path.isdir(pattern) else glob.glob(pattern)
+        if not found:
+            raise FileNotFoundError(f"Nie znaleziono plików: {pattern}")
+        paths.update(found)
+    return sorted(paths)
+
+
+def aggregate_files(paths, workers=None, chunksize=DEFAULT_CHUNK_SIZE, columns=COLUMNS, dropna=False):
+    """Agreguje wiele plików równolegle (procesy) i scala wyniki w jedno {kolumna: DailyIndex}.
+
+    workers=1 - przetwarzanie w bieżącym procesie; None - liczba rdzeni (nie więcej niż plików).
+    """
+    paths = list(paths)
+    task = partial(aggregate_csv, chunksize=chunksize, columns=columns, dropna=dropna)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(paths)))
+    if workers == 1:
+        return _merge_partials(map(task, paths), columns)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return _merge_partials(pool.map(task, paths), columns)
+
+
+def _merge_partials(partials, columns):
+    # Scalanie w miarę napływania wyników - w pamięci są tylko agregaty, nie dane z plików
+    merged = {column: DailyIndex(np.array([], dtype="datetime64[D]"), [], [], [], []) for column in columns}
+    for aggregates in partials:
+        merged = {column: DailyIndex.merge([merged[column], aggregates[column]]) for column in columns}
+    return merged
+
+
+def _mean_columns(aggregates):
+    """Wspólne dni wszystkich kolumn i średnie każdej kolumny wyrównane do tych dni (NaN - brak pomiarów)."""
+    days = np.unique(np.concatenate([index.days for index in aggregates.values()] or [[]]).astype("datetime64[D]"))
+    columns = {}
+    for column, index in aggregates.items():
+        means = np.full(len(days), np.nan)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means[np.searchsorted(days, index.days)] = index.sums / index.counts
+        columns[column] = means
+    return days, columns
+
+
+def daily_frame(aggregates):
+    """Średnie dzienne wszystkich kolumn: date (obiekty date, jak .dt.date) i kolumny pomiarów."""
+    days, columns = _mean_columns(aggregates)
+    return pd.DataFrame({"date": days.astype(object), **columns})
+
+
+def monthly_frame(aggregates):
+    """Średnie miesięczne wszystkich kolumn: month (okres, jak .dt.to_period("M")) i kolumny pomiarów."""
+    months, columns = _mean_columns({column: index.monthly() for column, index in aggregates.items()})
+    return pd.DataFrame({"month": pd.DatetimeIndex(months).to_period("M"), **columns})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Średnie dzienne i miesięczne dużych plików pogodowych (odczyt fragmentami).")
+    parser.add_argument("files", nargs="+", help="pliki CSV (timestamp,low,medium,high), katalogi lub wzorce glob")
+    parser.add_argument("--workers", type=int, help="liczba procesów dla wielu plików (domyślnie: liczba rdzeni)")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNK_SIZE, help="liczba wierszy w fragmencie")
+    parser.add_argument("--columns", default=",".join(COLUMNS), help="kolumny do uśrednienia (oddzielone przecinkami)")
+    parser.add_argument("--dropna", action="store_true", help="pomiń wiersze z brakującą wartością w dowolnej kolumnie")
+    parser.add_argument("--daily", help="zapisz średnie dzienne do pliku CSV")
+    parser.add_argument("--monthly", help="zapisz średnie miesięczne do pliku CSV")
+    args = parser.parse_args(argv)
+
+    columns = [column.strip() for column in args.columns.split(",") if column.strip()]
+    try:
+        paths = station_files(args.files)
+    except FileNotFoundError as e:
+        print(e, file=sys.stderr)
+        return 2
+    aggregates = aggregate_files(paths, args.workers, args.chunksize, columns, args.dropna)
+    daily, monthly = daily_frame(aggregates), monthly_frame(aggregates)
+    if args.daily:
+        daily.to_csv(args.daily, index=False)
+    if args.monthly:
+        monthly.to_csv(args.monthly, index=False)
+    if not args.daily and not args.monthly:
+        monthly.to_csv(sys.stdout, index=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())